@@ -0,0 +1,97 @@
+"""
+Benchmark of the event loop latency during validation: a ticker task measures how late its timer
+callbacks fire while large documents are validated inline on the event loop, with validate_async
+on the default thread pool, and with validate_async on a process pool.
+
+Usage: python bench/bench_async.py [--docs N] [--items N] [--interval MS]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.insert(0, SRC_DIR)
+
+from aio import AsyncValidator, process_executor   # pylint: disable=import-error, wrong-import-position
+from schema import Schema   # pylint: disable=import-error, wrong-import-position
+
+SCHEMA_DEF = {
+    'people': {
+        'type': 'list',
+        'item_types': ['person'],
+    },
+    'person': {
+        'type': 'map',
+        'required': False,
+        'items': [
+            {'name': {'type': 'string'}},
+            {'age': {'type': 'int'}},
+            {'height': {'type': 'float', 'required': False}},
+        ],
+    },
+}
+
+
+def large_doc(items):
+    return {'people': [{'person': {'name': 'p{0}'.format(i), 'age': i, 'height': 1.5}}
+                       for i in range(items)]}
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def ticker(interval, lags, stop):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def run(validate, docs, interval):
+    lags = []
+    stop = asyncio.Event()
+    task = asyncio.ensure_future(ticker(interval, lags, stop))
+    await asyncio.sleep(interval * 2)
+    start = time.perf_counter()
+    for doc in docs:
+        await validate(doc)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await task
+    return elapsed, lags
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--docs', type=int, default=20, help='number of large documents')
+    parser.add_argument('--items', type=int, default=20000, help='list items per document')
+    parser.add_argument('--interval', type=float, default=1.0, help='ticker interval in ms')
+    args = parser.parse_args()
+
+    schema = Schema(SCHEMA_DEF)
+    schema.compile()
+    docs = [large_doc(args.items)] * args.docs
+    interval = args.interval / 1000
+
+    async def inline(doc):
+        schema.compile().validate(doc)
+
+    with process_executor(schema) as executor:
+        variants = [('inline', inline),
+                    ('validate_async (threads)', schema.validate_async),
+                    ('validate_async (processes)', AsyncValidator(schema, executor=executor).validate)]
+        print('{0:<28} {1:>10} {2:>12} {3:>12}'.format('variant', 'total s', 'p50 lag ms',
+                                                       'p99 lag ms'))
+        for name, validate in variants:
+            elapsed, lags = asyncio.run(run(validate, docs, interval))
+            print('{0:<28} {1:>10.3f} {2:>12.3f} {3:>12.3f}'.format(
+                name, elapsed, percentile(lags, 0.5) * 1000, percentile(lags, 0.99) * 1000))
+
+
+if __name__ == '__main__':
+    main()
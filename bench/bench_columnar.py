@@ -0,0 +1,72 @@
+"""
+Benchmark of columnar validation: validates a batch of records as NumPy arrays, as a pyarrow
+RecordBatch and as plain lists with Schema.validate_columns, and the same records as a list of maps
+with the list descriptor. NumPy and pyarrow are needed for their rows.
+
+Usage: python bench/bench_columnar.py [--rows N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.insert(0, SRC_DIR)
+
+from schema import Schema   # pylint: disable=import-error, wrong-import-position
+from timing import best_of   # pylint: disable=import-error, wrong-import-position
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+SCHEMA = {'event': {'type': 'map', 'required': False,
+                    'items': [{'id': {'type': 'int'}},
+                              {'name': {'type': 'string'}},
+                              {'value': {'type': 'float', 'required': False}},
+                              {'flag': {'type': 'bool', 'required': False}}]},
+          'events': {'type': 'list', 'item_types': ['event']}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000, help='number of rows in the batch')
+    parser.add_argument('--repeat', type=int, default=3, help='number of repetitions')
+    args = parser.parse_args()
+
+    schema = Schema(SCHEMA)
+    ids = list(range(args.rows))
+    names = ['name{0}'.format(i % 1000) for i in range(args.rows)]
+    values = [None if i % 10 == 0 else i * 0.5 for i in range(args.rows)]
+    flags = [i % 2 == 0 for i in range(args.rows)]
+    results = {}
+    results['lists'] = best_of(args.repeat, lambda: schema.validate_columns(
+        'event', {'id': ids, 'name': names, 'value': values, 'flag': flags}))
+    if numpy is not None:
+        arrays = {'id': numpy.arange(args.rows), 'name': numpy.array(names),
+                  'value': numpy.ma.masked_invalid(numpy.array(values, dtype=float)),
+                  'flag': numpy.array(flags)}
+        results['numpy'] = best_of(args.repeat, lambda: schema.validate_columns('event', arrays))
+    if pyarrow is not None:
+        batch = pyarrow.RecordBatch.from_pydict({'id': ids, 'name': names, 'value': values,
+                                                 'flag': flags})
+        results['arrow'] = best_of(args.repeat, lambda: schema.validate_columns('event', batch))
+    rows = [{'event': {'id': ids[i], 'name': names[i], 'flag': flags[i]}} for i in range(args.rows)]
+    for i in range(args.rows):
+        if values[i] is not None:
+            rows[i]['event']['value'] = values[i]
+    results['rows'] = best_of(args.repeat, lambda: schema.descriptors['events'].validate(rows, []))
+
+    print('{0} rows, best of {1}'.format(args.rows, args.repeat))
+    for name, elapsed in results.items():
+        print('{0:>8}: {1:10.2f} ms'.format(name, elapsed * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark of the validation engines on deep documents: validates linked-list shaped trees of the
+tree example with the recursive and the iterative engine. The recursive engine is only measured up
+to the depth the recursion limit allows.
+
+Usage: python bench/bench_deep.py [--depth N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.insert(0, SRC_DIR)
+
+from schema import Schema   # pylint: disable=import-error, wrong-import-position
+from timing import best_of   # pylint: disable=import-error, wrong-import-position
+
+EXAMPLES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../examples'))
+
+
+def deep_tree(depth):
+    tree = {'data': 0}
+    for i in range(depth):
+        tree = {'data': i, 'left': tree}
+    return {'tree': tree}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--depth', type=int, default=100000, help='depth of the deepest tree')
+    parser.add_argument('--repeat', type=int, default=5, help='number of repetitions')
+    args = parser.parse_args()
+
+    schema = Schema.from_file(os.path.join(EXAMPLES_DIR, 'tree/tree_schema.yml'), use_cache=False)
+    print('{0:>8} {1:>14} {2:>14}'.format('depth', 'recursive', 'iterative'))
+    depth = 10
+    while depth <= args.depth:
+        doc = deep_tree(depth)
+        row = ['{0:>8}'.format(depth)]
+        for engine in ('recursive', 'iterative'):
+            if engine == 'recursive' and depth * 2 >= sys.getrecursionlimit():
+                row.append('{0:>14}'.format('-'))
+                continue
+            calls = max(1, 100000 // depth)
+            elapsed = best_of(args.repeat, lambda: [schema.validate(doc, engine=engine)  # pylint: disable=cell-var-from-loop
+                                                   for _ in range(calls)])
+            row.append('{0:>11.2f} us'.format(elapsed / calls * 1e6))
+        print(' '.join(row))
+        depth *= 10
+
+
+if __name__ == '__main__':
+    main()
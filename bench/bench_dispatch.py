@@ -0,0 +1,68 @@
+"""
+Benchmark of the routing of heterogeneous streams: validates a stream of records of many kinds by
+trying the schemas of the kinds in turn until one passes, and with a Dispatcher that selects the
+schema of each record by its discriminator.
+
+Usage: python bench/bench_dispatch.py [--kinds N] [--records N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.insert(0, SRC_DIR)
+
+from dispatch import Dispatcher     # pylint: disable=import-error, wrong-import-position
+from error import ValidationError   # pylint: disable=no-name-in-module, wrong-import-position
+from schema import Schema           # pylint: disable=import-error, wrong-import-position
+from timing import best_of          # pylint: disable=import-error, wrong-import-position
+
+
+def kind_schema(index):
+    return Schema({'kind': {'type': 'string'},
+                   'k{0}'.format(index): {'type': 'map', 'items': [
+                       {'id': {'type': 'int'}}, {'name': {'type': 'string'}},
+                       {'score': {'type': 'float', 'required': False}}]}})
+
+
+def record(index, kinds):
+    kind = 'k{0}'.format(index % kinds)
+    return {'kind': kind, kind: {'id': index, 'name': 'n{0}'.format(index), 'score': 0.5}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--kinds', type=int, default=30, help='number of record kinds')
+    parser.add_argument('--records', type=int, default=30000, help='number of records')
+    parser.add_argument('--repeat', type=int, default=3, help='number of measurements')
+    args = parser.parse_args()
+
+    schemas = {'k{0}'.format(i): kind_schema(i) for i in range(args.kinds)}
+    validators = [schema.compile().validate for schema in schemas.values()]
+    dispatcher = Dispatcher(schemas, key='kind')
+    records = [record(i, args.kinds) for i in range(args.records)]
+
+    def in_turn():
+        for rec in records:
+            for validator in validators:
+                try:
+                    validator(rec)
+                    break
+                except ValidationError:
+                    pass
+
+    def dispatched():
+        for rec in records:
+            dispatcher.validate(rec)
+
+    in_turn_time = best_of(args.repeat, in_turn)
+    dispatched_time = best_of(args.repeat, dispatched)
+    print('{0} records of {1} kinds'.format(args.records, args.kinds))
+    print('in turn:    {0:8.1f} ms'.format(in_turn_time * 1000))
+    print('dispatched: {0:8.1f} ms ({1:.1f}x)'.format(dispatched_time * 1000,
+                                                      in_turn_time / dispatched_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark of the loading of documents into objects: compares validating a library and converting
+it into the generated classes in a second pass with Schema.load, which does both in one traversal,
+and compares the memory of the parsed document with the memory of the loaded objects.
+
+Usage: python bench/bench_load.py [--books N] [--repeat N]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.insert(0, SRC_DIR)
+
+from schema import Schema   # pylint: disable=import-error, wrong-import-position
+from timing import best_of   # pylint: disable=import-error, wrong-import-position
+
+EXAMPLES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../examples'))
+
+
+def library(size):
+    return {'library': [{'book': {'author': 'a{0}'.format(i), 'title': 't{0}'.format(i),
+                                  'year': 1900 + i % 100}}
+                        for i in range(size)]}
+
+
+def allocated(func):
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--books', type=int, default=200000, help='number of books')
+    parser.add_argument('--repeat', type=int, default=3, help='number of measurements')
+    args = parser.parse_args()
+
+    schema = Schema.from_file(os.path.join(EXAMPLES_DIR, 'library/library_schema.yml'),
+                              use_cache=False)
+    document_class = schema.model_class('__schema__')
+    book_class = schema.model_class('book')
+    doc, doc_size = allocated(lambda: library(args.books))
+
+    def two_passes():
+        schema.validate(doc)
+        return document_class(library=[book_class(**item['book']) for item in doc['library']])
+
+    two_passes_time = best_of(args.repeat, two_passes)
+    load_time = best_of(args.repeat, lambda: schema.load(doc))
+    _, objects_size = allocated(lambda: schema.load(doc))
+    print('{0} books'.format(args.books))
+    print('validate + convert: {0:8.1f} ms'.format(two_passes_time * 1000))
+    print('load:               {0:8.1f} ms'.format(load_time * 1000))
+    print('document: {0:.1f} MB, loaded objects: {1:.1f} MB (values shared with the document)'
+          .format(doc_size / 1e6, objects_size / 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark of the loaders: scales up the data of the examples (the library by repeating its books,
+the tree by nesting it) and measures the time of loading the JSON and YAML files with every
+registered loader, next to the time of validating the loaded document.
+
+Usage: python bench/bench_loaders.py [--scale N] [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+import yaml
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.insert(0, SRC_DIR)
+
+from loader import LOADERS, load_file   # pylint: disable=import-error, wrong-import-position
+from schema import Schema               # pylint: disable=import-error, wrong-import-position
+from timing import best_of              # pylint: disable=import-error, wrong-import-position
+
+EXAMPLES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../examples'))
+
+
+def example_data(name):
+    with open(os.path.join(EXAMPLES_DIR, name, name + '.json')) as data_file:
+        return json.load(data_file)
+
+
+def scaled_library(scale):
+    return {'library': example_data('library')['library'] * scale}
+
+
+def scaled_tree(scale):
+    trees = [example_data('tree')['tree']] * scale
+    while len(trees) > 1:
+        trees = [{'data': i, 'left': trees[i], 'right': trees[i + 1]}
+                 for i in range(0, len(trees) - 1, 2)] + trees[len(trees) - len(trees) % 2:]
+    return {'tree': trees[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=int, default=5000, help='scale factor of the examples')
+    parser.add_argument('--repeat', type=int, default=3, help='number of repetitions')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        for name, doc in (('library', scaled_library(args.scale)),
+                          ('tree', scaled_tree(args.scale))):
+            schema = Schema.from_file(os.path.join(EXAMPLES_DIR, name, name + '_schema.yml'),
+                                      use_cache=False)
+            json_name = os.path.join(work_dir, name + '.json')
+            yaml_name = os.path.join(work_dir, name + '.yml')
+            with open(json_name, 'w') as json_file:
+                json.dump(doc, json_file)
+            with open(yaml_name, 'w') as yaml_file:
+                yaml.safe_dump(json.loads(json.dumps(doc)), yaml_file, default_flow_style=False)
+            print('{0}: {1:.1f} kB JSON, {2:.1f} kB YAML, validation {3:.2f} ms'.format(
+                name, os.path.getsize(json_name) / 1000, os.path.getsize(yaml_name) / 1000,
+                best_of(args.repeat, lambda: schema.validate(doc)) * 1000))  # pylint: disable=cell-var-from-loop
+            for loader_name, (file_format, _) in sorted(LOADERS.items()):
+                file_name = json_name if file_format == 'json' else yaml_name
+                elapsed = best_of(args.repeat, lambda: load_file(file_name, loader_name))  # pylint: disable=cell-var-from-loop
+                print('{0:>12}: {1:10.2f} ms'.format(loader_name, elapsed * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark of the memory of large schemas: builds a synthetic schema with many map types, reports the
+memory allocated by building it and before and after Schema.freeze, and measures how much of it
+forked worker processes copy (their private dirty memory) after validating documents and running a
+full garbage collection, with and without freezing the schema before forking.
+
+Usage: python bench/bench_memory.py [--types N] [--workers N] [--docs N]
+"""
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.insert(0, SRC_DIR)
+
+from schema import Schema   # pylint: disable=import-error, wrong-import-position
+
+
+def schema_definition(types):
+    schema_def = {}
+    for i in range(types):
+        items = [{'f{0}'.format(j): {'type': 'int' if j % 3 == 0 else 'string'}} for j in range(8)]
+        items.append({'nested': {'type': 'map', 'required': False, 'items': [
+            {'x': {'type': 'int'}},
+            {'y': {'type': 't{0}'.format((i + 1) % types), 'required': False}}]}})
+        items.append({'seq': {'type': 'list', 'required': False,
+                              'item_types': ['int', 't{0}'.format((i + 2) % types)]}})
+        schema_def['t{0}'.format(i)] = {'type': 'map', 'required': False, 'items': items}
+    return schema_def
+
+
+def document(index):
+    return {'t{0}'.format(index): {'f{0}'.format(j): j if j % 3 == 0 else 's' for j in range(8)}}
+
+
+def private_dirty_kb():
+    with open('/proc/self/smaps_rollup') as smaps:
+        for line in smaps:
+            if line.startswith('Private_Dirty:'):
+                return int(line.split()[1])
+    return 0
+
+
+def measure_workers(types, workers, docs, freeze):
+    schema = Schema(schema_definition(types))
+    if freeze:
+        schema.freeze()
+    else:
+        schema.compile()
+        gc.collect()
+    results = []
+    for _ in range(workers):
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_end)
+            before = private_dirty_kb()
+            validate = schema.compile().validate
+            for index in range(docs):
+                validate(document(index % types))
+            gc.collect()
+            os.write(write_end, str(private_dirty_kb() - before).encode('utf-8'))
+            os._exit(0)   # pylint: disable=protected-access
+        os.close(write_end)
+        with os.fdopen(read_end) as result:
+            results.append(int(result.read()))
+        os.waitpid(pid, 0)
+    return sum(results) / len(results)
+
+
+def measure_build(types):
+    schema_def = schema_definition(types)
+    gc.collect()
+    tracemalloc.start()
+    schema = Schema(schema_def)
+    built = tracemalloc.get_traced_memory()[0]
+    schema.freeze(gc_freeze=False)
+    gc.collect()
+    frozen = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return len(schema.descriptors), built, frozen
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--types', type=int, default=3000, help='number of map types')
+    parser.add_argument('--workers', type=int, default=4, help='number of forked workers')
+    parser.add_argument('--docs', type=int, default=20000, help='documents per worker')
+    parser.add_argument('--measure-workers', choices=['plain', 'frozen'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure_workers:
+        print(json.dumps(measure_workers(args.types, args.workers, args.docs,
+                                         args.measure_workers == 'frozen')))
+        return
+
+    descriptors, built, frozen = measure_build(args.types)
+    print('{0} descriptors: {1:.2f} MB built, {2:.2f} MB after freeze (with the compiled '
+          'validators)'.format(descriptors, built / 1e6, frozen / 1e6))
+    for mode in ('plain', 'frozen'):
+        output = subprocess.run([sys.executable, __file__, '--types', str(args.types),
+                                 '--workers', str(args.workers), '--docs', str(args.docs),
+                                 '--measure-workers', mode],
+                                check=True, stdout=subprocess.PIPE).stdout
+        print('{0:<8} private dirty memory per worker: {1:.0f} KB'.format(mode, json.loads(output)))
+
+
+if __name__ == '__main__':
+    main()
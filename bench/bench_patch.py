@@ -0,0 +1,63 @@
+"""
+Benchmark of the incremental revalidation: applies a small JSON Patch to libraries of growing size
+and compares the full validation of the patched document with Schema.revalidate, which applies
+the patch and validates its edits.
+
+Usage: python bench/bench_patch.py [--sizes N,N,...] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.insert(0, SRC_DIR)
+
+from schema import Schema   # pylint: disable=import-error, wrong-import-position
+from timing import best_of   # pylint: disable=import-error, wrong-import-position
+
+EXAMPLES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../examples'))
+
+
+def library(size):
+    return {'library': [{'book': {'author': 'a{0}'.format(i), 'title': 't{0}'.format(i),
+                                  'year': 1900 + i % 100}}
+                        for i in range(size)]}
+
+
+def edit(size, step):
+    return [{'op': 'replace', 'path': '/library/{0}/book/title'.format(step % size),
+             'value': 'edited {0}'.format(step)},
+            {'op': 'add', 'path': '/library/{0}'.format(size // 2),
+             'value': {'book': {'author': 'x', 'title': 'y', 'year': step}}},
+            {'op': 'remove', 'path': '/library/{0}'.format(size // 2)}]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='100,10000,100000', help='numbers of books')
+    parser.add_argument('--repeat', type=int, default=5, help='number of measurements')
+    args = parser.parse_args()
+
+    schema = Schema.from_file(os.path.join(EXAMPLES_DIR, 'library/library_schema.yml'),
+                              use_cache=False)
+    print('{0:>10} {1:>14} {2:>14} {3:>10}'.format('books', 'validate ms', 'revalidate ms',
+                                                   'speedup'))
+    for size in [int(size) for size in args.sizes.split(',')]:
+        doc = library(size)
+        steps = iter(range(1000000))
+
+        def full():
+            schema.validate(doc)
+
+        def incremental():
+            schema.revalidate(doc, edit(size, next(steps)))
+
+        full_time = best_of(args.repeat, full)
+        incremental_time = best_of(args.repeat, incremental)
+        print('{0:>10} {1:>14.3f} {2:>14.3f} {3:>9.0f}x'.format(
+            size, full_time * 1000, incremental_time * 1000, full_time / incremental_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark of the schema snapshot cache: compares loading a schema file without the cache, with a
+cold cache (build and write the snapshot) and with a warm cache (read the snapshot), both in-process
+and for a whole jysp.py invocation.
+
+Usage: python bench/bench_schema_cache.py [--types N] [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.insert(0, SRC_DIR)
+
+from schema import Schema   # pylint: disable=import-error, wrong-import-position
+from timing import best_of   # pylint: disable=import-error, wrong-import-position
+
+
+def synthetic_schema(type_cnt):
+    schema_def = {}
+    for i in range(type_cnt):
+        schema_def['type{0}'.format(i)] = {
+            'type': 'map',
+            'required': False,
+            'items': [
+                {'name': {'type': 'string'}},
+                {'count': {'type': 'int', 'required': False}},
+                {'next': {'type': 'type{0}'.format(max(i - 1, 0)), 'required': False}},
+                {'children': {'type': 'list', 'required': False,
+                              'item_types': ['type{0}'.format(max(i - 7, 0))]}},
+            ],
+        }
+    return schema_def
+
+
+def cold_load(schema_name):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        Schema.from_file(schema_name, cache_dir=cache_dir)
+
+
+def cli_run(schema_name, data_name, cache_dir, *flags):
+    env = dict(os.environ, JYSP_CACHE_DIR=cache_dir)
+    subprocess.run([sys.executable, os.path.join(SRC_DIR, 'jysp.py'), schema_name, data_name]
+                   + list(flags), env=env, check=True, stdout=subprocess.DEVNULL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--types', type=int, default=2000, help='number of types in the schema')
+    parser.add_argument('--repeat', type=int, default=5, help='number of repetitions')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        schema_name = os.path.join(work_dir, 'schema.json')
+        data_name = os.path.join(work_dir, 'data.json')
+        with open(schema_name, 'w') as schema_file:
+            json.dump(synthetic_schema(args.types), schema_file)
+        with open(data_name, 'w') as data_file:
+            json.dump({'type0': {'name': 'root', 'next': {'name': 'next'}}}, data_file)
+        cache_dir = os.path.join(work_dir, 'cache')
+        Schema.from_file(schema_name, cache_dir=cache_dir)
+
+        results = {
+            'no_cache': best_of(args.repeat, lambda: Schema.from_file(schema_name, False)),
+            'cold_cache': best_of(args.repeat, lambda: cold_load(schema_name)),
+            'warm_cache': best_of(args.repeat, lambda: Schema.from_file(schema_name,
+                                                                        cache_dir=cache_dir)),
+            'cli_no_cache': best_of(args.repeat, lambda: cli_run(schema_name, data_name, cache_dir,
+                                                                 '--no-schema-cache')),
+            'cli_warm_cache': best_of(args.repeat, lambda: cli_run(schema_name, data_name,
+                                                                   cache_dir)),
+        }
+
+    print('schema with {0} types, best of {1}'.format(args.types, args.repeat))
+    for name, elapsed in results.items():
+        print('{0:>16}: {1:8.2f} ms'.format(name, elapsed * 1000))
+
+
+if __name__ == '__main__':
+    main()
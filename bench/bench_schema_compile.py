@@ -0,0 +1,61 @@
+"""
+Benchmark of building Schema instances from synthetic schema definitions of increasing size. The
+named types reference each other forward and backward, in pairs of mutually recursive types and
+through lists, so the build time per type shows whether building is linear in the schema size.
+
+Usage: python bench/bench_schema_compile.py [--sizes N,N,...] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.insert(0, SRC_DIR)
+
+from schema import Schema   # pylint: disable=import-error, wrong-import-position
+from timing import best_of   # pylint: disable=import-error, wrong-import-position
+
+
+def synthetic_schema(type_cnt):
+    schema_def = {}
+    for i in range(type_cnt):
+        partner = i + 1 if i % 2 == 0 else i - 1
+        schema_def['type{0}'.format(i)] = {
+            'type': 'map',
+            'required': False,
+            'items': [
+                {'name': {'type': 'string'}},
+                {'count': {'type': 'int', 'required': False}},
+                {'partner': {'type': 'type{0}'.format(min(partner, type_cnt - 1)),
+                             'required': False}},
+                {'next': {'type': 'type{0}'.format((i + 1) % type_cnt), 'required': False}},
+                {'children': {'type': 'list', 'required': False,
+                              'item_types': ['type{0}'.format((i * 7 + 3) % type_cnt)]}},
+                {'meta': {'type': 'map', 'required': False,
+                          'items': [{'owner': {'type': 'type{0}'.format(type_cnt - 1 - i)}}]}},
+            ],
+        }
+    for i in range(0, type_cnt, 10):
+        schema_def['alias{0}'.format(i)] = {'type': 'type{0}'.format(type_cnt - 1 - i),
+                                            'required': False}
+    return schema_def
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,2000,5000,10000,20000',
+                        help='comma separated numbers of types in the schemas')
+    parser.add_argument('--repeat', type=int, default=3, help='number of repetitions')
+    args = parser.parse_args()
+
+    print('{0:>8} {1:>12} {2:>14}'.format('types', 'build', 'per type'))
+    for type_cnt in [int(size) for size in args.sizes.split(',')]:
+        schema_def = synthetic_schema(type_cnt)
+        elapsed = best_of(args.repeat, lambda: Schema(schema_def))  # pylint: disable=cell-var-from-loop
+        print('{0:>8} {1:>9.1f} ms {2:>11.2f} us'.format(type_cnt, elapsed * 1000,
+                                                         elapsed / type_cnt * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark of the validation server: validates the library example by starting the CLI once per
+document and by sending requests to a server on one keep-alive connection, over TCP and over a
+Unix socket.
+
+Usage: python bench/bench_server.py [--runs N] [--requests N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.insert(0, SRC_DIR)
+
+from loader import load_file   # pylint: disable=import-error, wrong-import-position
+from schema import Schema   # pylint: disable=import-error, wrong-import-position
+from server import ValidationClient, ValidationService, create_server   # pylint: disable=import-error, wrong-import-position
+
+EXAMPLES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../examples'))
+SCHEMA_FILE = os.path.join(EXAMPLES_DIR, 'library/library_schema.yml')
+DATA_FILE = os.path.join(EXAMPLES_DIR, 'library/library.json')
+
+
+def run_cli(runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        subprocess.run([sys.executable, os.path.join(SRC_DIR, 'jysp.py'), SCHEMA_FILE, DATA_FILE],
+                       check=True, stdout=subprocess.DEVNULL)
+    return (time.perf_counter() - start) / runs
+
+
+def run_client(client, body, requests):
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        client.validate('library_schema', body)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return latencies[len(latencies) // 2], latencies[min(len(latencies) - 1,
+                                                         int(len(latencies) * 0.99))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10, help='number of CLI runs')
+    parser.add_argument('--requests', type=int, default=2000, help='number of server requests')
+    args = parser.parse_args()
+
+    with open(DATA_FILE, 'rb') as data_file:
+        body = data_file.read()
+    service = ValidationService({'library_schema': Schema(load_file(SCHEMA_FILE))})
+    print('{0:<12} {1:>12} {2:>12}'.format('transport', 'p50 ms', 'p99 ms'))
+    cli = run_cli(args.runs) * 1000
+    print('{0:<12} {1:>12.3f} {2:>12}'.format('cli', cli, '-'))
+    socket_path = os.path.join(tempfile.mkdtemp(), 'jysp.sock')
+    for name, server in [('tcp', create_server(service, port=0)),
+                         ('unix', create_server(service, socket_path=socket_path))]:
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        if name == 'tcp':
+            client = ValidationClient(port=server.server_address[1])
+        else:
+            client = ValidationClient(socket_path=socket_path)
+        p50, p99 = run_client(client, body, args.requests)
+        client.close()
+        server.shutdown()
+        thread.join()
+        server.server_close()
+        print('{0:<12} {1:>12.3f} {2:>12.3f}'.format(name, p50 * 1000, p99 * 1000))
+
+
+if __name__ == '__main__':
+    main()
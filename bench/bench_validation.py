@@ -0,0 +1,211 @@
+"""
+Benchmark suite of document validation: generates synthetic valid and invalid documents for a set of
+scenarios (the examples, wide maps, long lists, deep trees, many list item types) and measures the
+schema build and compile time, and the throughput (docs/s, MB/s) and peak memory of every validation
+engine. The results are written as JSON, and can be compared with the results of an earlier run.
+
+Usage: python bench/bench_validation.py [--scenarios NAME,...] [--docs N] [--repeat N]
+                                        [--output FILE] [--compare FILE] [--threshold RATIO]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tracemalloc
+
+import yaml
+
+BENCH_DIR = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+from generator import DocumentGenerator   # pylint: disable=import-error, wrong-import-position
+from compiler import compile_schema       # pylint: disable=import-error, wrong-import-position
+from error import ValidationError         # pylint: disable=import-error, wrong-import-position
+from schema import Schema                 # pylint: disable=import-error, wrong-import-position
+from timing import best_of                # pylint: disable=import-error, wrong-import-position
+
+EXAMPLES_DIR = os.path.abspath(os.path.join(BENCH_DIR, '../examples'))
+ENGINES = ['recursive', 'iterative', 'compiled']
+
+
+def example_schema(name):
+    with open(os.path.join(EXAMPLES_DIR, name, name + '_schema.yml')) as schema_file:
+        return yaml.safe_load(schema_file)
+
+
+def wide_map_schema(item_cnt=200):
+    types = ['int', 'string', 'float', 'bool']
+    return {'record': {'type': 'map',
+                       'items': [{'field{0}'.format(i): {'type': types[i % len(types)],
+                                                         'required': i % 3 != 0}}
+                                 for i in range(item_cnt)]}}
+
+
+def long_list_schema():
+    return {'point': {'type': 'map', 'required': False,
+                      'items': [{'x': {'type': 'float'}}, {'y': {'type': 'float'}}]},
+            'series': {'type': 'list', 'min': 5000, 'max': 10000,
+                       'item_types': ['int', 'point']}}
+
+
+def many_item_types_schema(type_cnt=50):
+    schema_def = {}
+    for i in range(type_cnt):
+        schema_def['kind{0}'.format(i)] = {'type': 'map', 'required': False,
+                                           'items': [{'id': {'type': 'int'}},
+                                                     {'label{0}'.format(i): {'type': 'string'}}]}
+    schema_def['events'] = {'type': 'list', 'max': 100,
+                            'item_types': ['kind{0}'.format(i) for i in range(type_cnt)]}
+    return schema_def
+
+
+def deep_tree_documents(generator, count, depth=400):
+    docs = []
+    for _ in range(count):
+        tree = {'data': generator.random.randint(0, 100)}
+        for i in range(depth):
+            tree = {'data': i, 'left': tree} if i % 2 else {'data': i, 'right': tree}
+        docs.append({'tree': tree})
+    return docs
+
+
+SCENARIOS = {
+    'library': (lambda: example_schema('library'), {}),
+    'person': (lambda: example_schema('person'), {}),
+    'tree': (lambda: example_schema('tree'), {'max_depth': 12, 'optional_rate': 0.6}),
+    'deep_tree': (lambda: example_schema('tree'), {'documents': deep_tree_documents}),
+    'wide_map': (wide_map_schema, {}),
+    'long_list': (long_list_schema, {}),
+    'many_item_types': (many_item_types_schema, {'list_length': (20, 100)}),
+}
+
+
+def validator(schema, engine):
+    if engine == 'compiled':
+        return schema.compile().validate
+    return lambda doc: schema.validate(doc, engine=engine)
+
+
+def validate_docs(validate, docs):
+    for doc in docs:
+        try:
+            validate(doc)
+        except (ValidationError, TypeError):
+            pass
+
+
+def peak_memory(validate, docs):
+    tracemalloc.start()
+    try:
+        validate_docs(validate, docs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def throughput(repeat, validate, docs, size):
+    elapsed = best_of(repeat, lambda: validate_docs(validate, docs))
+    return {'docs_per_s': len(docs) / elapsed, 'mb_per_s': size / elapsed / 1e6}
+
+
+def run_scenario(name, doc_cnt, repeat):
+    schema_factory, options = SCENARIOS[name]
+    options = dict(options)
+    documents = options.pop('documents', None)
+    schema_def = schema_factory()
+    build = best_of(repeat, lambda: Schema(schema_def))
+    schema = Schema(schema_def)
+    compile_time = best_of(repeat, lambda: compile_schema(schema.schema, schema.descriptors))
+    generator = DocumentGenerator(schema, seed=1, **options)
+    if documents is not None:
+        valid = documents(generator, doc_cnt)
+        invalid = [dict(doc, unexpected=0) for doc in documents(generator, doc_cnt)]
+    else:
+        valid = generator.documents(doc_cnt)
+        invalid = generator.documents(doc_cnt, invalid_rate=1.0)
+    valid_size = sum(len(json.dumps(doc)) for doc in valid)
+    invalid_size = sum(len(json.dumps(doc)) for doc in invalid)
+    result = {'schema_build_ms': build * 1000, 'compile_ms': compile_time * 1000,
+              'docs': doc_cnt, 'valid_bytes': valid_size, 'invalid_bytes': invalid_size,
+              'engines': {}}
+    for engine in ENGINES:
+        validate = validator(schema, engine)
+        result['engines'][engine] = {
+            'valid': throughput(repeat, validate, valid, valid_size),
+            'invalid': throughput(repeat, validate, invalid, invalid_size),
+            'peak_memory_kib': peak_memory(validate, valid) / 1024,
+        }
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=BENCH_DIR, check=True,
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                              universal_newlines=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, base, threshold):
+    regressions = 0
+    for name, result in results['results'].items():
+        if name not in base['results']:
+            continue
+        for engine, metrics in result['engines'].items():
+            base_metrics = base['results'][name]['engines'].get(engine)
+            if base_metrics is None:
+                continue
+            for kind in ('valid', 'invalid'):
+                ratio = metrics[kind]['docs_per_s'] / base_metrics[kind]['docs_per_s']
+                flag = ''
+                if ratio < 1 - threshold:
+                    flag = '  REGRESSION'
+                    regressions += 1
+                print('{0:>16} {1:>10} {2:>8}: {3:6.2f}x{4}'.format(name, engine, kind, ratio, flag))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help='comma separated names of the scenarios to run')
+    parser.add_argument('--docs', type=int, default=200, help='number of documents per scenario')
+    parser.add_argument('--repeat', type=int, default=3, help='number of repetitions')
+    parser.add_argument('--output', help='file the JSON results are written to (default: stdout)')
+    parser.add_argument('--compare', metavar='FILE', help='JSON results of an earlier run')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='slowdown ratio reported as a regression by --compare')
+    args = parser.parse_args()
+
+    results = {
+        'meta': {'commit': git_commit(), 'python': platform.python_version(),
+                 'platform': platform.platform(),
+                 'time': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                 'docs': args.docs, 'repeat': args.repeat},
+        'results': {},
+    }
+    for name in args.scenarios.split(','):
+        if name not in SCENARIOS:
+            parser.error('unknown scenario: {0}'.format(name))
+        results['results'][name] = run_scenario(name, args.docs, args.repeat)
+
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(output + '\n')
+    else:
+        print(output)
+    if args.compare:
+        with open(args.compare) as base_file:
+            base = json.load(base_file)
+        if compare(results, base, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+"""
+This module generates synthetic documents from a Schema: valid documents that follow the descriptors
+of the schema, and invalid documents made by breaking a valid one at a random component. The
+generation is driven by a seeded random number generator, so the same arguments always generate the
+same documents.
+"""
+
+import random
+import string
+import sys
+import os
+from typing import Any, List, Optional, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from descriptor import Descriptor, BoolDescriptor, IntDescriptor, FloatDescriptor, \
+    StringDescriptor, MapDescriptor, ListDescriptor   # pylint: disable=import-error, wrong-import-position, line-too-long
+from error import ValidationError   # pylint: disable=no-name-in-module, wrong-import-position
+from schema import Schema           # pylint: disable=import-error, wrong-import-position
+
+MUTATIONS = ['wrong_type', 'missing_item', 'unexpected_item', 'too_many_items']
+
+
+class DocumentGenerator:
+    """
+    This class generates valid and invalid documents for a schema.
+    """
+    def __init__(self,
+                 schema: Schema,
+                 seed: int = 0,
+                 max_depth: int = 6,
+                 list_length: Tuple[int, int] = (1, 5),
+                 optional_rate: float = 0.5,
+                 string_length: Tuple[int, int] = (3, 12)):
+        """
+        Constructor for the DocumentGenerator class.
+
+        :param schema: The schema of the generated documents.
+        :param seed: The seed of the random number generator.
+        :param max_depth: The depth below which optional items are not generated any more, so the
+            documents of recursive types stay finite.
+        :param list_length: The range of the length of the lists without min/max attributes.
+        :param optional_rate: The probability of generating an optional item.
+        :param string_length: The range of the length of the generated strings.
+        """
+        self.schema = schema
+        self.random = random.Random(seed)
+        self.max_depth = max_depth
+        self.list_length = list_length
+        self.optional_rate = optional_rate
+        self.string_length = string_length
+
+    def valid(self) -> Any:
+        """
+        Generates a valid document.
+
+        :return: The document.
+        """
+        return self.generate(self.schema.schema, 0)
+
+    def invalid(self,
+                mutation: Optional[str] = None,
+                attempts: int = 20)\
+            -> Any:
+        """
+        Generates an invalid document by generating a valid one and breaking one of its components.
+
+        :param mutation: The kind of the error (one of MUTATIONS), a random one if it is None.
+        :param attempts: The number of documents to try if the mutation is not possible in a
+            document (e.g. there are no lists to make too long).
+        :return: The document, which fails validation.
+        """
+        for _ in range(attempts):
+            doc = self.valid()
+            kind = mutation if mutation is not None else self.random.choice(MUTATIONS)
+            if self.mutate(doc, kind):
+                try:
+                    self.schema.validate(doc)
+                except (ValidationError, TypeError):
+                    return doc
+        raise ValueError('cannot generate an invalid document with mutation: {0}'.format(mutation))
+
+    def documents(self,
+                  count: int,
+                  invalid_rate: float = 0.0)\
+            -> List[Any]:
+        """
+        Generates a list of documents.
+
+        :param count: The number of documents.
+        :param invalid_rate: The fraction of invalid documents.
+        :return: The documents.
+        """
+        return [self.invalid() if self.random.random() < invalid_rate else self.valid()
+                for _ in range(count)]
+
+    def generate(self,
+                 descriptor: Descriptor,
+                 depth: int)\
+            -> Any:
+        """
+        Generates a valid component for a descriptor.
+
+        :param descriptor: The descriptor of the component.
+        :param depth: The depth of the component in the document.
+        :return: The component.
+        """
+        if isinstance(descriptor, BoolDescriptor):
+            return self.random.random() < 0.5
+        if isinstance(descriptor, IntDescriptor):
+            return self.random.randint(-10 ** 6, 10 ** 6)
+        if isinstance(descriptor, FloatDescriptor):
+            return self.random.uniform(-10 ** 6, 10 ** 6)
+        if isinstance(descriptor, StringDescriptor):
+            return ''.join(self.random.choice(string.ascii_letters)
+                           for _ in range(self.random.randint(*self.string_length)))
+        if isinstance(descriptor, MapDescriptor):
+            component = {}
+            for name, item in descriptor.items.items():
+                if item.required or (depth < self.max_depth and
+                                     self.random.random() < self.optional_rate):
+                    component[name] = self.generate(descriptor.descriptors[item.item_type],
+                                                    depth + 1)
+            return component
+        if isinstance(descriptor, ListDescriptor):
+            low = descriptor.min_items or 0
+            high = descriptor.max_items or max(low, self.list_length[1])
+            if depth >= self.max_depth:
+                high = low
+            item_types = list(descriptor.item_types)
+            items = []
+            for _ in range(self.random.randint(max(low, min(self.list_length[0], high)), high)):
+                item_type = self.random.choice(item_types)
+                items.append({item_type: self.generate(descriptor.descriptors[item_type],
+                                                       depth + 1)})
+            return items
+        raise ValueError('cannot generate a component for {0}'.format(descriptor))
+
+    def mutate(self,
+               doc: Any,
+               mutation: str)\
+            -> bool:
+        """
+        Breaks a random component of a valid document in place.
+
+        :param doc: The valid document.
+        :param mutation: The kind of the error (one of MUTATIONS).
+        :return: True if the document has been changed.
+        """
+        maps: List[Tuple[dict, MapDescriptor]] = []
+        lists: List[Tuple[list, ListDescriptor]] = []
+        self.containers(doc, self.schema.schema, maps, lists)
+        if mutation == 'wrong_type':
+            candidates = [(component, name) for component, _ in maps for name in component]
+            if not candidates:
+                return False
+            component, name = self.random.choice(candidates)
+            component[name] = [] if not isinstance(component[name], list) else 'not a list'
+            return True
+        if mutation == 'missing_item':
+            candidates = [(component, name) for component, descriptor in maps
+                          for name in component if descriptor.items[name].required]
+            if not candidates:
+                return False
+            component, name = self.random.choice(candidates)
+            del component[name]
+            return True
+        if mutation == 'unexpected_item':
+            if not maps:
+                return False
+            component, _ = self.random.choice(maps)
+            component['__unexpected__'] = 0
+            return True
+        if mutation == 'too_many_items':
+            candidates = [(component, descriptor) for component, descriptor in lists
+                          if descriptor.max_items and component]
+            if not candidates:
+                return False
+            component, descriptor = self.random.choice(candidates)
+            component.extend(component[-1:] * (descriptor.max_items + 1 - len(component)))
+            return True
+        raise ValueError('unknown mutation: {0}'.format(mutation))
+
+    def containers(self,
+                   component: Any,
+                   descriptor: Descriptor,
+                   maps: List[Tuple[dict, MapDescriptor]],
+                   lists: List[Tuple[list, ListDescriptor]])\
+            -> None:
+        """
+        Collects the maps and lists of a valid document with their descriptors.
+
+        :param component: A component of the document.
+        :param descriptor: The descriptor of the component.
+        :param maps: The list the maps are appended to.
+        :param lists: The list the lists are appended to.
+        """
+        stack = [(component, descriptor)]
+        while stack:
+            component, descriptor = stack.pop()
+            if isinstance(descriptor, MapDescriptor) and isinstance(component, dict):
+                maps.append((component, descriptor))
+                for name in component:
+                    stack.append((component[name],
+                                  descriptor.descriptors[descriptor.items[name].item_type]))
+            elif isinstance(descriptor, ListDescriptor) and isinstance(component, list):
+                lists.append((component, descriptor))
+                for item in component:
+                    for item_type in item:
+                        stack.append((item[item_type], descriptor.descriptors[item_type]))
@@ -0,0 +1,25 @@
+"""
+This module holds the timing helper shared by the benchmark scripts.
+"""
+
+import time
+from typing import Any, Callable
+
+
+def best_of(repeat: int,
+            func: Callable[[], Any])\
+        -> float:
+    """
+    Runs a function several times and returns its fastest run, which is the least disturbed by the
+    rest of the machine.
+
+    :param repeat: the number of runs.
+    :param func: the function to time, called without arguments.
+    :return: the duration of the fastest run in seconds.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
@@ -0,0 +1,223 @@
+"""
+This module contains the asyncio API of the validation. Validating a document is CPU bound, so it
+blocks the event loop for as long as it runs. Small documents are validated inline, where the cost
+of a context switch would exceed the cost of the validation, and documents above a size threshold
+are offloaded to an executor with a bounded number of concurrent validations, so a large document
+does not stall the other tasks of the event loop.
+
+The default executor of the event loop is a thread pool, which keeps the event loop responsive
+because the interpreter switches between threads while a document is validated. For CPU bound
+services a process pool created by process_executor runs the validation outside the interpreter
+of the event loop.
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, AsyncIterable, AsyncIterator, Deque, Optional, Tuple
+
+from batch import init_worker, validate_chunk   # pylint: disable=import-error, wrong-import-position
+from error import ValidationError   # pylint: disable=no-name-in-module, wrong-import-position
+
+# The number of document nodes above which a document is offloaded to the executor.
+DEFAULT_THRESHOLD = 2000
+
+# The default maximum number of documents validated in the executor at the same time.
+DEFAULT_CONCURRENCY = 4
+
+# The number of documents validated inline by validate_stream before it yields to the event loop.
+INLINE_BATCH = 64
+
+
+def document_size(doc: Any,
+                  limit: int)\
+        -> int:
+    """
+    Counts the nodes (maps, lists and scalars) of a document, stopping once the count exceeds the
+    limit, so the cost of sizing a large document is bounded.
+
+    :param doc: The document.
+    :param limit: The count after which the counting stops.
+    :return: The number of nodes of the document, or a number larger than the limit.
+    """
+    size = 0
+    stack = [doc]
+    while stack:
+        node = stack.pop()
+        size += 1
+        if size > limit:
+            break
+        if isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return size
+
+
+def process_executor(schema: Any,
+                     workers: Optional[int] = None)\
+        -> ProcessPoolExecutor:
+    """
+    Creates a process pool for AsyncValidator that compiles the schema once in every worker.
+
+    :param schema: The Schema instance the documents are validated against.
+    :param workers: The number of worker processes, defaults to the number of CPUs.
+    :return: The executor, which is shut down by the caller.
+    """
+    return ProcessPoolExecutor(workers, initializer=init_worker, initargs=(schema,))
+
+
+class AsyncValidator:
+    """
+    This class validates documents on an event loop, offloading the documents above a size threshold
+    to an executor. An instance can be shared by the tasks of an event loop, the limit of concurrent
+    offloaded validations applies to all of them.
+    """
+    def __init__(self,
+                 schema: Any,
+                 threshold: int = DEFAULT_THRESHOLD,
+                 executor: Optional[Executor] = None,
+                 concurrency: int = DEFAULT_CONCURRENCY):
+        """
+        Constructor for the AsyncValidator class.
+
+        :param schema: The Schema instance the documents are validated against.
+        :param threshold: The number of nodes above which a document is offloaded to the executor,
+            0 offloads every document.
+        :param executor: The executor of the large documents, defaults to the default executor of
+            the event loop. A ProcessPoolExecutor has to be created by process_executor.
+        :param concurrency: The maximum number of documents validated in the executor at the same
+            time.
+        """
+        if threshold < 0:
+            raise ValueError('The threshold must not be negative')
+        if concurrency < 1:
+            raise ValueError('The concurrency must be positive')
+        self.validate_doc = schema.compile().validate
+        self.threshold = threshold
+        self.executor = executor
+        self.concurrency = concurrency
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.semaphore: Optional[asyncio.Semaphore] = None
+
+    def is_large(self,
+                 doc: Any)\
+            -> bool:
+        """
+        Decides whether a document is offloaded to the executor.
+
+        :param doc: The document.
+        :return: True if the document has more nodes than the threshold.
+        """
+        return document_size(doc, self.threshold) > self.threshold
+
+    def check_inline(self,
+                     doc: Any)\
+            -> Optional[ValidationError]:
+        """
+        Validates a document in the calling thread.
+
+        :param doc: The document.
+        :return: None if the document is valid, otherwise its ValidationError.
+        """
+        try:
+            self.validate_doc(doc)
+        except ValidationError as error:
+            return error
+        return None
+
+    async def offload(self,
+                      doc: Any)\
+            -> Optional[ValidationError]:
+        """
+        Validates a document in the executor once fewer than concurrency documents are validated
+        there.
+
+        :param doc: The document.
+        :return: None if the document is valid, otherwise its ValidationError.
+        """
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            self.loop = loop
+            self.semaphore = asyncio.Semaphore(self.concurrency)
+        async with self.semaphore:   # type: ignore
+            if isinstance(self.executor, ProcessPoolExecutor):
+                results = await loop.run_in_executor(self.executor, validate_chunk, [doc])
+                return results[0]
+            return await loop.run_in_executor(self.executor, self.check_inline, doc)
+
+    async def check(self,
+                    doc: Any)\
+            -> Optional[ValidationError]:
+        """
+        Validates a document, inline or in the executor depending on its size.
+
+        :param doc: The document.
+        :return: None if the document is valid, otherwise its ValidationError.
+        """
+        if self.is_large(doc):
+            return await self.offload(doc)
+        return self.check_inline(doc)
+
+    async def validate(self,
+                       doc: Any)\
+            -> bool:
+        """
+        Validates a document, inline or in the executor depending on its size.
+
+        :param doc: The document.
+        :return: True if the document is valid otherwise the method will throw a ValidationError.
+        """
+        error = await self.check(doc)
+        if error is not None:
+            raise error
+        return True
+
+    async def validate_stream(self,
+                              docs: AsyncIterable[Any])\
+            -> AsyncIterator[Tuple[Any, Optional[ValidationError]]]:
+        """
+        Validates the documents of an async iterator and yields the results in input order. Large
+        documents are validated in the executor while the following documents are read and the small
+        ones validated inline, with at most concurrency large documents in flight and a bounded
+        number of results waiting for them.
+
+        :param docs: The documents.
+        :return: An async iterator over (document, error) pairs, where error is None for valid
+            documents.
+        """
+        pending: Deque[Tuple[Any, Any]] = deque()
+        buffer_size = self.concurrency * INLINE_BATCH
+        offloaded = 0
+        inline_cnt = 0
+        try:
+            async for doc in docs:
+                if self.is_large(doc):
+                    pending.append((doc, asyncio.ensure_future(self.offload(doc))))
+                    offloaded += 1
+                else:
+                    result = self.check_inline(doc)
+                    inline_cnt += 1
+                    if not pending:
+                        yield doc, result
+                    else:
+                        pending.append((doc, result))
+                    if inline_cnt % INLINE_BATCH == 0:
+                        await asyncio.sleep(0)
+                while pending and (offloaded >= self.concurrency or len(pending) >= buffer_size
+                                   or not isinstance(pending[0][1], asyncio.Future)
+                                   or pending[0][1].done()):
+                    doc, result = pending.popleft()
+                    if isinstance(result, asyncio.Future):
+                        offloaded -= 1
+                        result = await result
+                    yield doc, result
+            while pending:
+                doc, result = pending.popleft()
+                if isinstance(result, asyncio.Future):
+                    result = await result
+                yield doc, result
+        finally:
+            for _, result in pending:
+                if isinstance(result, asyncio.Future):
+                    result.cancel()
@@ -0,0 +1,292 @@
+"""
+This module contains the batch validation logic that validates many documents against one schema on
+a pool of worker processes. The schema is shipped to every worker once by the pool initializer and
+each worker compiles it before validating the chunks of documents it receives.
+
+Large JSON Lines files are validated without shipping documents between processes: the file is
+memory-mapped and split into byte ranges aligned to line boundaries, and every worker maps the file
+itself and parses and validates the lines of the ranges it receives.
+"""
+
+import mmap
+import multiprocessing
+import os
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+from error import ValidationError   # pylint: disable=no-name-in-module, wrong-import-position
+from loader import get_loader   # pylint: disable=import-error, wrong-import-position
+
+# The default number of documents sent to a worker in one task if the number of documents is
+# unknown.
+DEFAULT_CHUNKSIZE = 1000
+
+# The number of byte ranges per worker a JSON Lines file is split into at least, so faster workers
+# can take over the ranges of slower ones.
+RANGES_PER_WORKER = 4
+
+# The maximum size of a byte range of a JSON Lines file, which bounds the size of the results of a
+# range.
+MAX_RANGE_SIZE = 64 * 1024 * 1024
+
+# The validate method of the compiled schema of the current worker process.
+WORKER_VALIDATE = None
+
+# The RangeValidator of the current worker process.
+WORKER_RANGES = None
+
+# A line of a JSON Lines file that is not written to the valid output: its line number, the byte
+# range of the line and its error, or None for empty lines.
+LineFailure = Tuple[int, int, int, Optional[ValidationError]]
+
+
+def init_worker(schema: Any) -> None:
+    """
+    Pool initializer that compiles the schema once in every worker process.
+
+    :param schema: The Schema instance the documents are validated against.
+    """
+    global WORKER_VALIDATE   # pylint: disable=global-statement
+    WORKER_VALIDATE = schema.compile().validate
+
+
+def validate_chunk(docs: List[Any]) -> List[Optional[ValidationError]]:
+    """
+    Validates a chunk of documents in a worker process.
+
+    :param docs: The documents to be validated.
+    :return: The result of every document in order, None for valid documents and the
+        ValidationError for invalid ones.
+    """
+    results: List[Optional[ValidationError]] = []
+    for doc in docs:
+        try:
+            WORKER_VALIDATE(doc)   # type: ignore
+            results.append(None)
+        except ValidationError as error:
+            results.append(error)
+    return results
+
+
+def chunks(docs: Iterable[Any],
+           chunksize: int)\
+        -> Iterator[List[Any]]:
+    """
+    Splits the documents into lists of the given size.
+
+    :param docs: The documents to be split.
+    :param chunksize: The number of documents in a chunk.
+    :return: An iterator over the chunks.
+    """
+    iterator = iter(docs)
+    chunk = list(islice(iterator, chunksize))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, chunksize))
+
+
+def validate_many(schema: Any,
+                  docs: Iterable[Any],
+                  workers: Optional[int] = None,
+                  chunksize: Optional[int] = None)\
+        -> List[Optional[ValidationError]]:
+    """
+    Validates the documents against the schema on a pool of worker processes.
+
+    :param schema: The Schema instance the documents are validated against.
+    :param docs: The documents to be validated.
+    :param workers: The number of worker processes, defaults to the number of CPUs. With a single
+        worker the documents are validated in the calling process.
+    :param chunksize: The number of documents sent to a worker in one task.
+    :return: The result of every document in input order, None for valid documents and the
+        ValidationError for invalid ones.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError('The number of workers must be positive')
+    if chunksize is None:
+        if isinstance(docs, (list, tuple)):
+            chunksize = max(1, min(DEFAULT_CHUNKSIZE, len(docs) // (workers * 4)))
+        else:
+            chunksize = DEFAULT_CHUNKSIZE
+    if chunksize < 1:
+        raise ValueError('The chunk size must be positive')
+
+    results: List[Optional[ValidationError]] = []
+    if workers == 1:
+        validate = schema.compile().validate
+        for doc in docs:
+            try:
+                validate(doc)
+                results.append(None)
+            except ValidationError as error:
+                results.append(error)
+        return results
+
+    with multiprocessing.Pool(workers, initializer=init_worker, initargs=(schema,)) as pool:
+        for chunk_results in pool.imap(validate_chunk, chunks(docs, chunksize)):
+            results.extend(chunk_results)
+    return results
+
+
+def newline_ranges(data: Any,
+                   parts: int)\
+        -> List[Tuple[int, int]]:
+    """
+    Splits data into byte ranges of about the same size that start at the beginning of a line.
+
+    :param data: The data (bytes or a memory map).
+    :param parts: The number of ranges.
+    :return: The (start, end) pairs of the non-empty ranges in order.
+    """
+    size = len(data)
+    bounds = [0]
+    for part in range(1, parts):
+        target = size * part // parts
+        if target <= bounds[-1]:
+            continue
+        newline = data.find(b'\n', target - 1)
+        bound = size if newline == -1 else newline + 1
+        if bound > bounds[-1]:
+            bounds.append(bound)
+    if bounds[-1] < size:
+        bounds.append(size)
+    return [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1)]
+
+
+class RangeValidator:
+    """
+    This class validates the lines of byte ranges of a memory-mapped JSON Lines file.
+    """
+    def __init__(self,
+                 schema: Any,
+                 file_name: str,
+                 loader: str = 'auto'):
+        """
+        Constructor for the RangeValidator class, which compiles the schema and maps the file.
+
+        :param schema: The Schema instance the documents are validated against.
+        :param file_name: The name of the JSON Lines file.
+        :param loader: The name of the JSON loader, see loader.get_loader.
+        """
+        self.validate = schema.compile().validate
+        self.loads = get_loader('json', loader)
+        with open(file_name, 'rb') as data_file:
+            self.data = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def validate_range(self,
+                       bounds: Tuple[int, int])\
+            -> Tuple[int, List[LineFailure]]:
+        """
+        Parses and validates the lines of a byte range.
+
+        :param bounds: The start and the end of the range.
+        :return: The number of lines in the range and the failures of the range, with line numbers
+            counted from 1 at the start of the range.
+        """
+        data = self.data
+        start, end = bounds
+        failures: List[LineFailure] = []
+        line = 0
+        while start < end:
+            newline = data.find(b'\n', start, end)
+            stop = end if newline == -1 else newline + 1
+            line += 1
+            raw = data[start:stop]
+            if not raw.strip():
+                failures.append((line, start, stop, None))
+            else:
+                try:
+                    doc = self.loads(raw)
+                except ValueError as error:
+                    failures.append((line, start, stop,
+                                     ValidationError('', 'Invalid JSON: {0}'.format(error))))
+                else:
+                    try:
+                        self.validate(doc)
+                    except ValidationError as error:
+                        failures.append((line, start, stop, error))
+            start = stop
+        return line, failures
+
+    def close(self) -> None:
+        """
+        Unmaps the file.
+        """
+        self.data.close()
+
+
+def init_range_worker(schema: Any,
+                      file_name: str,
+                      loader: str)\
+        -> None:
+    """
+    Pool initializer that compiles the schema and maps the file once in every worker process.
+
+    :param schema: The Schema instance the documents are validated against.
+    :param file_name: The name of the JSON Lines file.
+    :param loader: The name of the JSON loader.
+    """
+    global WORKER_RANGES   # pylint: disable=global-statement
+    WORKER_RANGES = RangeValidator(schema, file_name, loader)
+
+
+def validate_range(bounds: Tuple[int, int]) -> Tuple[int, List[LineFailure]]:
+    """
+    Validates a byte range of the file in a worker process.
+
+    :param bounds: The start and the end of the range.
+    :return: The number of lines and the failures of the range, see RangeValidator.validate_range.
+    """
+    return WORKER_RANGES.validate_range(bounds)   # type: ignore
+
+
+def validate_json_lines_file(schema: Any,
+                             file_name: str,
+                             workers: Optional[int] = None,
+                             loader: str = 'auto')\
+        -> Iterator[Tuple[int, int, int, List[LineFailure]]]:
+    """
+    Validates a JSON Lines file on a pool of worker processes. The file is split into byte ranges
+    aligned to line boundaries and every worker parses and validates whole ranges, so only the
+    failures are sent back to the calling process.
+
+    :param schema: The Schema instance the documents are validated against.
+    :param file_name: The name of the JSON Lines file.
+    :param workers: The number of worker processes, defaults to the number of CPUs. With a single
+        worker the file is validated in the calling process.
+    :param loader: The name of the JSON loader, see loader.get_loader.
+    :return: An iterator over the ranges of the file in order, as (start, end, number of lines,
+        failures) tuples where the failures carry the line numbers of the whole file.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError('The number of workers must be positive')
+    size = os.path.getsize(file_name)
+    if size == 0:
+        return
+    parts = max(workers * RANGES_PER_WORKER if workers > 1 else 1, -(-size // MAX_RANGE_SIZE))
+    with open(file_name, 'rb') as data_file:
+        with mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            ranges = newline_ranges(data, parts)
+    line_offset = 0
+    if workers == 1:
+        validator = RangeValidator(schema, file_name, loader)
+        try:
+            for bounds in ranges:
+                line_cnt, failures = validator.validate_range(bounds)
+                yield bounds[0], bounds[1], line_cnt, [(line + line_offset, start, stop, error)
+                                             for line, start, stop, error in failures]
+                line_offset += line_cnt
+        finally:
+            validator.close()
+        return
+
+    with multiprocessing.Pool(workers, initializer=init_range_worker,
+                              initargs=(schema, file_name, loader)) as pool:
+        for bounds, (line_cnt, failures) in zip(ranges, pool.imap(validate_range, ranges)):
+            yield bounds[0], bounds[1], line_cnt, [(line + line_offset, start, stop, error)
+                                         for line, start, stop, error in failures]
+            line_offset += line_cnt
@@ -0,0 +1,293 @@
+"""
+This module contains the columnar validation of record batches against map types. A batch is a set
+of equally long columns (a pyarrow RecordBatch or Table, a dict of NumPy arrays or a dict of plain
+sequences), and row i of the batch stands for the map made of the non-null values of row i. The
+presence of required columns and the types of primitive columns are checked once per column, and
+only the rows found by these checks are turned into maps and validated by the map descriptor, in
+ascending order until one of them fails, so the errors are the same as the ones of validating the
+rows one by one as a list.
+
+NumPy and pyarrow are optional and never imported by this module: a batch can only hold NumPy
+arrays or pyarrow data if the caller has imported the library, so their columns are recognized by
+the modules already loaded, and importing jysp does not pay for importing them.
+"""
+
+import heapq
+import sys
+from typing import Any, Dict, List, Optional
+
+from descriptor import MapDescriptor   # pylint: disable=import-error, wrong-import-position
+from iterative import PRIMITIVE_CHECKS   # pylint: disable=import-error, wrong-import-position
+
+NUMPY_KINDS: Dict[type, str] = {int: 'iub', float: 'f', bool: 'b', str: 'U'}
+
+
+def arrow_type_matches(arrow_type: Any,
+                       python_type: type)\
+        -> bool:
+    """
+    Decides whether the values of an arrow type are instances of a python type.
+
+    :param arrow_type: The pyarrow data type of a column.
+    :param python_type: The python type expected by a primitive descriptor.
+    :return: True if every non-null value of the column has the python type.
+    """
+    types = sys.modules['pyarrow'].types
+    if types.is_dictionary(arrow_type):
+        return arrow_type_matches(arrow_type.value_type, python_type)
+    if python_type is int:
+        return types.is_integer(arrow_type) or types.is_boolean(arrow_type)
+    if python_type is float:
+        return types.is_floating(arrow_type)
+    if python_type is bool:
+        return types.is_boolean(arrow_type)
+    is_string_view = getattr(types, 'is_string_view', None)
+    return types.is_string(arrow_type) or types.is_large_string(arrow_type) or \
+        (is_string_view is not None and is_string_view(arrow_type))
+
+
+class Column:
+    """
+    A column of a batch with the backend specific access to its null mask, its values and its type.
+    """
+    def __init__(self,
+                 name: Any,
+                 values: Any):
+        """
+        Constructor for the Column class.
+
+        :param name: The name of the column.
+        :param values: A pyarrow Array or ChunkedArray, a NumPy array (a masked array for nulls) or
+            a sequence with None for nulls.
+        """
+        self.name = name
+        self.values = values
+        self.mask: Any = None
+        pyarrow = sys.modules.get('pyarrow')
+        numpy = sys.modules.get('numpy')
+        if pyarrow is not None and isinstance(values, (pyarrow.Array, pyarrow.ChunkedArray)):
+            self.backend = 'arrow'
+            if values.null_count:
+                import numpy as numpy_module   # pylint: disable=import-outside-toplevel
+                self.mask = numpy_module.asarray(values.is_null())
+        elif numpy is not None and isinstance(values, numpy.ndarray):
+            self.backend = 'numpy'
+            if isinstance(values, numpy.ma.MaskedArray) and values.mask is not numpy.ma.nomask:
+                self.mask = numpy.ma.getmaskarray(values)
+                if not self.mask.any():
+                    self.mask = None
+        else:
+            self.backend = 'sequence'
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def is_null(self,
+                index: int)\
+            -> bool:
+        """
+        Decides whether a value of the column is null.
+
+        :param index: The row of the value.
+        :return: True if the value is null.
+        """
+        if self.backend == 'sequence':
+            return self.values[index] is None
+        return self.mask is not None and bool(self.mask[index])
+
+    def value(self,
+              index: int)\
+            -> Any:
+        """
+        Returns a value of the column as a python object.
+
+        :param index: The row of the value.
+        :return: The value.
+        """
+        if self.backend == 'arrow':
+            return self.values[index].as_py()
+        if self.backend == 'numpy':
+            value = self.values.data[index] if self.mask is not None else self.values[index]
+            return value.item() if isinstance(value, sys.modules['numpy'].generic) else value
+        return self.values[index]
+
+    def first_null(self,
+                   start: int = 0)\
+            -> Optional[int]:
+        """
+        Finds the first null value of the column.
+
+        :param start: The first row searched.
+        :return: The row of the first null value or None if there are no null values.
+        """
+        if self.backend == 'sequence':
+            for index in range(start, len(self)):
+                if self.values[index] is None:
+                    return index
+            return None
+        if self.mask is None or start >= len(self):
+            return None
+        index = start + int(self.mask[start:].argmax())
+        return index if self.mask[index] else None
+
+    def first_value(self,
+                    start: int = 0)\
+            -> Optional[int]:
+        """
+        Finds the first non-null value of the column.
+
+        :param start: The first row searched.
+        :return: The row of the first non-null value or None if every value is null.
+        """
+        if self.backend == 'sequence':
+            for index in range(start, len(self)):
+                if self.values[index] is not None:
+                    return index
+            return None
+        if start >= len(self):
+            return None
+        if self.mask is None:
+            return start
+        index = start + int(self.mask[start:].argmin())
+        return None if self.mask[index] else index
+
+    def first_mismatch(self,
+                       python_type: type,
+                       start: int = 0)\
+            -> Optional[int]:
+        """
+        Finds the first non-null value of the column that may not be an instance of a python type.
+        Arrow columns and NumPy columns of non-object dtypes are checked by their type (every value
+        of a column of another type is a candidate), other columns value by value.
+
+        :param python_type: The python type expected by a primitive descriptor.
+        :param start: The first row searched.
+        :return: The row of the first mismatching value or None if every value matches.
+        """
+        if self.backend == 'arrow':
+            if arrow_type_matches(self.values.type, python_type):
+                return None
+            return self.first_value(start)
+        if self.backend == 'numpy' and self.values.dtype.kind != 'O':
+            if self.values.dtype.kind in NUMPY_KINDS[python_type]:
+                return None
+            return self.first_value(start)
+        for index in range(start, len(self)):
+            if not self.is_null(index):
+                value = self.value(index)
+                if not isinstance(value, python_type):
+                    return index
+        return None
+
+
+def batch_columns(batch: Any) -> List[Column]:
+    """
+    Returns the columns of a batch.
+
+    :param batch: A pyarrow RecordBatch or Table, or a dict from column names to columns.
+    :return: The columns in the order of the batch.
+    """
+    pyarrow = sys.modules.get('pyarrow')
+    if pyarrow is not None and isinstance(batch, (pyarrow.RecordBatch, pyarrow.Table)):
+        return [Column(name, batch.column(index))
+                for index, name in enumerate(batch.schema.names)]
+    return [Column(name, batch[name]) for name in batch]
+
+
+class ColumnarValidator:
+    """
+    This class validates record batches against a map descriptor.
+    """
+    def __init__(self,
+                 descriptor: MapDescriptor):
+        """
+        Constructor for the ColumnarValidator class.
+
+        :param descriptor: The map descriptor of the rows.
+        """
+        self.descriptor = descriptor
+
+    def first_failure(self,
+                      column: Column,
+                      start: int = 0)\
+            -> Optional[int]:
+        """
+        Finds the first row whose value in a column may make the row invalid.
+
+        :param column: The column.
+        :param start: The first row searched.
+        :return: The row of the first invalid value or None if every value of the column is valid.
+        """
+        items = self.descriptor.items
+        if column.name not in items:
+            return column.first_value(start)
+        item = items[column.name]
+        child = self.descriptor.descriptors[item.item_type]
+        check = PRIMITIVE_CHECKS.get(type(child))
+        rows: List[Optional[int]] = [column.first_null(start) if item.required else None]
+        if check is not None:
+            rows.append(column.first_mismatch(check[0], start))
+        else:
+            for index in range(start, len(column)):
+                if not column.is_null(index) and not self.is_valid(child, column.value(index)):
+                    rows.append(index)
+                    break
+        return min((row for row in rows if row is not None), default=None)
+
+    @staticmethod
+    def is_valid(descriptor: Any,
+                 component: Any)\
+            -> bool:
+        """
+        Decides whether a component of a non-primitive column is valid.
+
+        :param descriptor: The descriptor of the column.
+        :param component: The component.
+        :return: True if the component is valid.
+        """
+        try:
+            return descriptor.validate(component, [])
+        except Exception:  # pylint: disable=broad-except
+            return False
+
+    def validate(self,
+                 batch: Any,
+                 path: Optional[List[str]] = None)\
+            -> bool:
+        """
+        Validates a batch. The rows are validated as the items of a list, so the path of an error in
+        row i starts with items[i].
+
+        :param batch: A pyarrow RecordBatch or Table, or a dict from column names to NumPy arrays or
+            sequences.
+        :param path: The path of the batch.
+        :return: True if the batch is valid otherwise the method will throw a ValidationError.
+        """
+        columns = batch_columns(batch)
+        row_cnt = len(columns[0]) if columns else 0
+        for column in columns:
+            if len(column) != row_cnt:
+                raise ValueError('The columns of the batch have different lengths')
+        candidates = []
+        for index, column in enumerate(columns):
+            row = self.first_failure(column)
+            if row is not None:
+                candidates.append((row, index))
+        names = set(column.name for column in columns)
+        if row_cnt and any(self.descriptor.items[name].required
+                           for name in self.descriptor.items if name not in names):
+            candidates.append((0, -1))
+        heapq.heapify(candidates)
+        while candidates:
+            row = candidates[0][0]
+            component = {column.name: column.value(row) for column in columns
+                         if not column.is_null(row)}
+            row_path = list(path or [])
+            row_path.append('items[{0}]'.format(row))
+            self.descriptor.validate(component, row_path)
+            while candidates and candidates[0][0] == row:
+                index = heapq.heappop(candidates)[1]
+                next_row = self.first_failure(columns[index], row + 1)
+                if next_row is not None:
+                    heapq.heappush(candidates, (next_row, index))
+        return True
@@ -0,0 +1,372 @@
+"""
+This module contains the schema compiler which turns the descriptor graph of a schema into
+specialized Python validator functions. Every map and list descriptor becomes one generated function
+with its known keys, required items, list bounds and item types inlined, so validation no longer
+goes through the shared descriptors dict or the generic descriptor methods. The generated validators
+raise exactly the same ValidationErrors as the descriptors they were compiled from.
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from descriptor import Descriptor, IncompleteTypeDescriptor, BoolDescriptor, IntDescriptor,\
+    FloatDescriptor, StringDescriptor, MapDescriptor, ListDescriptor   # pylint: disable=import-error, wrong-import-position, line-too-long
+from error import ValidationError   # pylint: disable=no-name-in-module, wrong-import-position
+
+# Maps with more items than this dispatch on their keys through a dict instead of an if/elif chain.
+MAX_INLINE_MAP_ITEMS = 8
+
+PRIMITIVE_TYPES = {
+    BoolDescriptor: ('bool', 'bool'),
+    StringDescriptor: ('str', 'string'),
+    IntDescriptor: ('int', 'int'),
+    FloatDescriptor: ('float', 'float'),
+}
+
+
+class CompiledFailure(Exception):
+    """
+    Internal exception of the generated validators. The path of the failing component is collected
+    in reverse order while the exception propagates and it is only joined when the failure is
+    converted to a ValidationError.
+    """
+    def __init__(self,
+                 msg: str,
+                 segment: Optional[str] = None):
+        super().__init__()
+        self.msg = msg
+        self.parts: List[str] = []
+        if segment:
+            self.parts.append(segment)
+
+    def to_validation_error(self) -> ValidationError:
+        """
+        Converts the failure to the ValidationError the descriptors would have raised.
+
+        :return: The ValidationError describing the failure.
+        """
+        return ValidationError('.'.join(reversed(self.parts)), self.msg)
+
+
+class CompiledSchema:
+    """
+    This class holds the validator functions generated from the descriptor graph of a schema.
+    """
+    def __init__(self,
+                 source: str,
+                 namespace: Dict[str, Any],
+                 function_names: Dict[str, str]):
+        """
+        Constructor for the CompiledSchema class.
+
+        :param source: The generated Python source code.
+        :param namespace: The namespace the source code was executed in.
+        :param function_names: The names of the generated functions by type name.
+        """
+        self.source = source
+        self.function_names = function_names
+        self.validators: Dict[str, Callable[[Any], bool]] = {
+            type_name: namespace[function_name]
+            for type_name, function_name in function_names.items()}
+        self.root = self.validators['__schema__']
+
+    def validate(self,
+                 doc: Any)\
+            -> bool:
+        """
+        This method validates the provided document with the generated root validator.
+
+        :param doc: The document to be validated.
+        :return: True if the document is valid or raises a ValidationError if not.
+        """
+        try:
+            return self.root(doc)
+        except CompiledFailure as failure:
+            raise failure.to_validation_error() from None
+
+    def validate_type(self,
+                      type_name: str,
+                      component: Any)\
+            -> bool:
+        """
+        This method validates a component against one of the compiled map or list types.
+
+        :param type_name: The name of the type (e.g. "book" or "city.library").
+        :param component: The component to be validated.
+        :return: True if the component is valid or raises a ValidationError if not.
+        """
+        try:
+            return self.validators[type_name](component)
+        except CompiledFailure as failure:
+            raise failure.to_validation_error() from None
+
+
+class SchemaCompiler:
+    """
+    This class generates the source code of the validator functions for a descriptor graph.
+    """
+    def __init__(self,
+                 root: MapDescriptor,
+                 descriptors: Dict[str, Descriptor]):
+        """
+        Constructor for the SchemaCompiler class.
+
+        :param root: The descriptor of the whole document.
+        :param descriptors: The descriptors of the schema by type name.
+        """
+        self.root = root
+        self.descriptors = descriptors
+        self.function_names: Dict[int, str] = {}
+        self.type_names: Dict[str, str] = {}
+        self.namespace: Dict[str, Any] = {'CompiledFailure': CompiledFailure}
+        self.lines: List[str] = []
+        self.helper_lines: List[str] = []
+
+    def compile(self) -> CompiledSchema:
+        """
+        Generates, executes and returns the validator functions of the whole descriptor graph.
+
+        :return: A CompiledSchema instance holding the generated validators.
+        """
+        self.assign_function_name('__schema__', self.root)
+        for type_name, descriptor in self.descriptors.items():
+            if isinstance(descriptor, (MapDescriptor, ListDescriptor)):
+                self.assign_function_name(type_name, descriptor)
+        generated = set()
+        for type_name, function_name in self.type_names.items():
+            if function_name in generated:
+                continue
+            generated.add(function_name)
+            descriptor = self.root if type_name == '__schema__' else self.descriptors[type_name]
+            if isinstance(descriptor, MapDescriptor):
+                self.generate_map_function(type_name, function_name, descriptor)
+            else:
+                self.generate_list_function(type_name, function_name, descriptor)
+        source = '\n'.join(self.helper_lines + self.lines) + '\n'
+        exec(compile(source, '<jysp compiled schema>', 'exec'),   # pylint: disable=exec-used
+             self.namespace)
+        return CompiledSchema(source, self.namespace, dict(self.type_names))
+
+    def assign_function_name(self,
+                             type_name: str,
+                             descriptor: Descriptor)\
+            -> None:
+        """
+        Assigns a generated function name to a map or list descriptor. Type aliases share the
+        function of the descriptor they refer to.
+
+        :param type_name: The name of the type.
+        :param descriptor: The descriptor of the type.
+        """
+        if id(descriptor) not in self.function_names:
+            function_name = '_validate_' + re.sub(r'\W', '_', type_name.strip('_'))
+            while function_name in self.namespace:
+                function_name += '_'
+            self.namespace[function_name] = None
+            self.function_names[id(descriptor)] = function_name
+        self.type_names[type_name] = self.function_names[id(descriptor)]
+
+    def constant(self,
+                 prefix: str,
+                 value: Any)\
+            -> str:
+        """
+        Stores a value in the namespace of the generated code.
+
+        :param prefix: The prefix of the name of the value.
+        :param value: The value to be stored.
+        :return: The name under which the value can be referenced from the generated code.
+        """
+        name = '_{0}_{1}'.format(prefix, len(self.namespace))
+        self.namespace[name] = value
+        return name
+
+    def emit_check(self,
+                   type_name: str,
+                   value: str,
+                   segment: str,
+                   indent: str)\
+            -> None:
+        """
+        Emits the code validating a value against the named type. Primitive type checks are
+        inlined, maps and lists are validated by calling their generated function.
+
+        :param type_name: The name of the type the value has to conform to.
+        :param value: The expression of the value to be validated.
+        :param segment: The expression of the path segment of the value.
+        :param indent: The indentation of the emitted code.
+        """
+        descriptor = self.descriptors.get(type_name)
+        if descriptor is None:
+            self.lines.append('{0}raise KeyError({1!r})'.format(indent, type_name))
+        elif type(descriptor) in PRIMITIVE_TYPES:   # pylint: disable=unidiomatic-typecheck
+            python_type, jysp_type = PRIMITIVE_TYPES[type(descriptor)]
+            self.lines.append('{0}if not isinstance({1}, {2}):'.format(indent, value, python_type))
+            self.lines.append('{0}    raise CompiledFailure({1!r}, {2})'.format(
+                indent, 'Expected type: ' + jysp_type, segment))
+        elif isinstance(descriptor, IncompleteTypeDescriptor):
+            self.lines.append('{0}raise CompiledFailure({1!r}, {2})'.format(
+                indent, 'Incomplete component definition', segment))
+        elif isinstance(descriptor, (MapDescriptor, ListDescriptor)):
+            self.lines.append('{0}try:'.format(indent))
+            self.lines.append('{0}    {1}({2})'.format(
+                indent, self.function_names[id(descriptor)], value))
+            self.lines.append('{0}except CompiledFailure as failure:'.format(indent))
+            self.lines.append('{0}    failure.parts.append({1})'.format(indent, segment))
+            self.lines.append('{0}    raise'.format(indent))
+        else:
+            self.emit_fallback_check(descriptor, value, segment, indent)
+
+    def emit_fallback_check(self,
+                            descriptor: Descriptor,
+                            value: str,
+                            segment: str,
+                            indent: str)\
+            -> None:
+        """
+        Emits the code validating a value with a descriptor type the compiler does not know about
+        by calling the validate method of the descriptor itself.
+
+        :param descriptor: The descriptor of the value.
+        :param value: The expression of the value to be validated.
+        :param segment: The expression of the path segment of the value.
+        :param indent: The indentation of the emitted code.
+        """
+        name = self.constant('descriptor', descriptor)
+        self.namespace['ValidationError'] = ValidationError
+        self.lines.append('{0}try:'.format(indent))
+        self.lines.append('{0}    {1}.validate({2}, [])'.format(indent, name, value))
+        self.lines.append('{0}except ValidationError as error:'.format(indent))
+        self.lines.append('{0}    failure = CompiledFailure(error.msg, error.path)'.format(indent))
+        self.lines.append('{0}    failure.parts.append({1})'.format(indent, segment))
+        self.lines.append('{0}    raise failure from None'.format(indent))
+
+    def generate_map_function(self,
+                              type_name: str,
+                              function_name: str,
+                              descriptor: MapDescriptor)\
+            -> None:
+        """
+        Generates the validator function of a map type.
+
+        :param type_name: The name of the map type.
+        :param function_name: The name of the generated function.
+        :param descriptor: The descriptor of the map type.
+        """
+        items = list(descriptor.items.values())
+        required = [item.name for item in items if item.required]
+        self.lines.append('def {0}(component):  # map: {1}'.format(function_name, type_name))
+        self.lines.append('    if component is None:')
+        if required:
+            self.lines.append("        raise CompiledFailure('No components found')")
+        else:
+            self.lines.append('        return True')
+        self.lines.append('    if not isinstance(component, dict):')
+        self.lines.append("        raise CompiledFailure('Expected type: map')")
+        self.lines.append('    for key, value in component.items():')
+        if len(items) <= MAX_INLINE_MAP_ITEMS:
+            for index, item in enumerate(items):
+                self.lines.append('        {0} key == {1!r}:'.format('elif' if index else 'if',
+                                                                      item.name))
+                self.emit_check(item.item_type, 'value', 'key', '            ')
+            self.lines.append('        else:')
+            self.lines.append("            raise CompiledFailure("
+                              "'Unexpected item: \"{0}\"'.format(key))")
+        else:
+            checkers = [(item.name, self.generate_item_checker(item.item_type)) for item in items]
+            table = self.constant('items', None)
+            self.helper_lines.append('{0} = {{'.format(table))
+            for name, checker in checkers:
+                self.helper_lines.append('    {0!r}: {1},'.format(name, checker))
+            self.helper_lines.append('}')
+            self.helper_lines.append('')
+            self.lines.append('        checker = {0}.get(key)'.format(table))
+            self.lines.append('        if checker is None:')
+            self.lines.append("            raise CompiledFailure("
+                              "'Unexpected item: \"{0}\"'.format(key))")
+            self.lines.append('        checker(value, key)')
+        for name in required:
+            self.lines.append('    if {0!r} not in component:'.format(name))
+            self.lines.append('        raise CompiledFailure({0!r})'.format(
+                'Missing required item: "{0}"'.format(name)))
+        self.lines.append('    return True')
+        self.lines.append('')
+
+    def generate_item_checker(self,
+                              type_name: str)\
+            -> str:
+        """
+        Generates a small function checking one value against the named type. These are used as the
+        values of the key dispatch table of wide maps.
+
+        :param type_name: The name of the type the value has to conform to.
+        :return: The name of the generated function.
+        """
+        function_name = self.constant('check', None)
+        lines, self.lines = self.lines, []
+        self.lines.append('def {0}(value, segment):  # item: {1}'.format(function_name, type_name))
+        self.emit_check(type_name, 'value', 'segment', '    ')
+        self.lines.append('')
+        self.helper_lines.extend(self.lines)
+        self.lines = lines
+        return function_name
+
+    def generate_list_function(self,
+                               type_name: str,
+                               function_name: str,
+                               descriptor: ListDescriptor)\
+            -> None:
+        """
+        Generates the validator function of a list type.
+
+        :param type_name: The name of the list type.
+        :param function_name: The name of the generated function.
+        :param descriptor: The descriptor of the list type.
+        """
+        self.lines.append('def {0}(component):  # list: {1}'.format(function_name, type_name))
+        self.lines.append('    if component is None:')
+        if descriptor.min_items:
+            self.lines.append('        raise CompiledFailure({0!r})'.format(
+                'Too few list items: min={0}'.format(descriptor.min_items)))
+        else:
+            self.lines.append('        return True')
+        self.lines.append('    if not isinstance(component, list):')
+        self.lines.append("        raise CompiledFailure('Expected type: list')")
+        self.lines.append('    item_cnt = 0')
+        self.lines.append('    for item in component:')
+        self.lines.append('        if not isinstance(item, dict):')
+        self.lines.append("            raise CompiledFailure('Expected type: map', "
+                          "'items[{0}]'.format(item_cnt))")
+        self.lines.append('        for key in item:')
+        for index, item_type in enumerate(dict.fromkeys(descriptor.item_types)):
+            self.lines.append('            {0} key == {1!r}:'.format('elif' if index else 'if',
+                                                                      item_type))
+            self.emit_check(item_type, 'item[key]', "'items[{0}]'.format(item_cnt)",
+                            '                ')
+        self.lines.append('            else:')
+        self.lines.append("                raise CompiledFailure("
+                          "'Unexpected type: \"{0}\"'.format(key))")
+        self.lines.append('        item_cnt += 1')
+        if descriptor.max_items:
+            self.lines.append('        if item_cnt > {0!r}:'.format(descriptor.max_items))
+            self.lines.append('            raise CompiledFailure({0!r})'.format(
+                'Too many list items: max={0}'.format(descriptor.max_items)))
+        if descriptor.min_items:
+            self.lines.append('    if item_cnt < {0!r}:'.format(descriptor.min_items))
+            self.lines.append('        raise CompiledFailure({0!r})'.format(
+                'Too few list items: min={0}'.format(descriptor.min_items)))
+        self.lines.append('    return True')
+        self.lines.append('')
+
+
+def compile_schema(root: MapDescriptor,
+                   descriptors: Dict[str, Descriptor])\
+        -> CompiledSchema:
+    """
+    Compiles the descriptor graph of a schema into specialized validator functions.
+
+    :param root: The descriptor of the whole document.
+    :param descriptors: The descriptors of the schema by type name.
+    :return: A CompiledSchema instance holding the generated validators.
+    """
+    return SchemaCompiler(root, descriptors).compile()
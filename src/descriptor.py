@@ -4,16 +4,224 @@ inherit from an abstract base class called Descriptor and implement the differen
 specific validation logic that is needed for the schema loading and validation.
 """
 
+import math
+import random
+import sys
 from abc import ABC
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
-from error import ValidationError   # pylint: disable=no-name-in-module
+from error import ErrorCollector, ErrorPath, ValidationError   # pylint: disable=no-name-in-module
 
 
 class Descriptor(ABC):  # pylint: disable=too-few-public-methods
     """
-    Base class or all the descriptor classes.
+    Base class or all the descriptor classes. The descriptors define __slots__, so they are small
+    and have no __dict__, which keeps large schemas compact.
     """
+    __slots__ = ()
+
+    def check_structure(self,   # pylint: disable=no-self-use, unused-argument
+                        component: Any,
+                        path: List[str],
+                        depth: int)\
+            -> bool:
+        """
+        Structural validation method, see MapDescriptor.check_structure. Components that are neither
+        maps nor lists have no structure, their types are only checked by the validation.
+
+        :param component: The component to be checked.
+        :param path: The path of the component to be checked.
+        :param depth: The number of levels checked, starting with the component.
+        :return: True.
+        """
+        return True
+
+
+def intern_name(name: Any) -> Any:
+    """
+    Interns a type or item name, so the names repeated across the descriptors of a schema are
+    stored once.
+
+    :param name: The name.
+    :return: The interned name, or the name itself if it is not a str.
+    """
+    return sys.intern(name) if type(name) is str else name   # pylint: disable=unidiomatic-typecheck
+
+
+class LazyDescriptors(dict):
+    """
+    The descriptors of a lazily built schema by type name. A type that is looked up before it has
+    been built is built by the builder function of the schema, so only the types reached by the
+    validated documents are ever built. Membership tests do not build types.
+    """
+    def __init__(self,
+                 builder: Callable[[str], Descriptor]):
+        """
+        Constructor for the LazyDescriptors class.
+
+        :param builder: The function building, registering and returning the descriptor of a type,
+            raising a KeyError for unknown types.
+        """
+        super().__init__()
+        self.builder = builder
+
+    def __missing__(self, key: str) -> Descriptor:
+        return self.builder(key)
+
+    def get(self,   # type: ignore
+            key: str,
+            default: Any = None)\
+            -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+class SamplingPolicy:
+    """
+    This class selects the items of a list that are validated when the lists of a type are sampled:
+    the first N items, every k-th item starting with the first one, or a random fraction of the
+    items chosen with a fixed seed, so repeated validations of a document check the same items.
+    """
+    __slots__ = ('first', 'every', 'fraction', 'seed')
+
+    def __init__(self,
+                 first: Optional[int] = None,
+                 every: Optional[int] = None,
+                 fraction: Optional[float] = None,
+                 seed: int = 0):
+        """
+        Constructor for the SamplingPolicy class. Exactly one of first, every and fraction must be
+        given.
+
+        :param first: The number of items validated at the start of the lists.
+        :param every: The distance of the validated items.
+        :param fraction: The fraction of the items validated, greater than 0 and at most 1.
+        :param seed: The seed of the random choice of the items for fraction.
+        """
+        if [first, every, fraction].count(None) != 2:
+            raise ValueError('Exactly one of first, every and fraction must be given')
+        if first is not None and first < 0:
+            raise ValueError('The number of first items must not be negative')
+        if every is not None and every < 1:
+            raise ValueError('The distance of the items must be positive')
+        if fraction is not None and not 0 < fraction <= 1:
+            raise ValueError('The fraction of the items must be in (0, 1]')
+        self.first = first
+        self.every = every
+        self.fraction = fraction
+        self.seed = seed
+
+    def indices(self, length: int) -> Iterable[int]:
+        """
+        Returns the positions of the validated items of a list in increasing order.
+
+        :param length: The length of the list.
+        :return: The positions of the validated items.
+        """
+        if self.first is not None:
+            return range(min(self.first, length))
+        if self.every is not None:
+            return range(0, length, self.every)
+        count = min(length, math.ceil(length * self.fraction))   # type: ignore
+        return sorted(random.Random(self.seed).sample(range(length), count))
+
+
+class ValidationContext:
+    """
+    This class holds the state of the validation of one document: the maps and lists that have
+    already been validated against a descriptor and the number of visited document nodes. A YAML
+    alias makes the same object appear at many places of a document, so the validation of a map or
+    a list is remembered by the identities of the object and the descriptor, and a shared subtree is
+    validated only once per type. A context must not be reused for another document, because the
+    identities of its objects may be reused.
+
+    The context also holds the sampling policies of list types, see sample, and the coverage of the
+    sampled lists: the number of validated items and the number of items per list type.
+    """
+    __slots__ = ('validated', 'nodes', 'max_nodes', 'sampling', 'coverage')
+
+    def __init__(self,
+                 max_nodes: Optional[int] = None):
+        """
+        Constructor for the ValidationContext class.
+
+        :param max_nodes: The number of document nodes after which the validation fails, None for
+            no limit. Shared subtrees are only counted the first time they are validated.
+        """
+        if max_nodes is not None and max_nodes < 1:
+            raise ValueError('The maximum number of nodes must be positive')
+        self.validated: Set[Tuple[int, int]] = set()
+        self.nodes = 1
+        self.max_nodes = max_nodes
+        self.sampling: Optional[Dict[int, Tuple[str, SamplingPolicy]]] = None
+        self.coverage: Dict[str, Tuple[int, int]] = {}
+
+    def visit(self,
+              component: Any,
+              descriptor: Descriptor,
+              path: List[str])\
+            -> bool:
+        """
+        Starts the validation of a map or a list, counting its items as visited nodes (the document
+        itself is the first node).
+
+        :param component: The map or list.
+        :param descriptor: The descriptor it is validated against.
+        :param path: The path of the component.
+        :return: True if the component has already been validated against the descriptor. Raises a
+            ValidationError if the number of visited nodes exceeds the maximum.
+        """
+        if (id(component), id(descriptor)) in self.validated:
+            return True
+        self.nodes += len(component)
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise ValidationError('.'.join(path), 'Too many nodes: max={0}'.format(self.max_nodes))
+        return False
+
+    def add(self,
+            component: Any,
+            descriptor: Descriptor)\
+            -> None:
+        """
+        Remembers that a map or a list is valid against a descriptor.
+
+        :param component: The map or list.
+        :param descriptor: The descriptor.
+        """
+        self.validated.add((id(component), id(descriptor)))
+
+    def sample(self,
+               descriptor: Descriptor,
+               type_name: str,
+               policy: SamplingPolicy)\
+            -> None:
+        """
+        Makes the validation check only the items of the lists of a type selected by a policy.
+
+        :param descriptor: The list descriptor of the type.
+        :param type_name: The name of the type, under which its coverage is reported.
+        :param policy: The SamplingPolicy.
+        """
+        if self.sampling is None:
+            self.sampling = {}
+        self.sampling[id(descriptor)] = (type_name, policy)
+
+    def cover(self,
+              type_name: str,
+              checked: int,
+              total: int)\
+            -> None:
+        """
+        Adds a sampled list to the coverage of its type.
+
+        :param type_name: The name of the list type.
+        :param checked: The number of validated items.
+        :param total: The number of items.
+        """
+        previous_checked, previous_total = self.coverage.get(type_name, (0, 0))
+        self.coverage[type_name] = (previous_checked + checked, previous_total + total)
 
 
 class IncompleteTypeDescriptor(Descriptor):
@@ -21,10 +229,12 @@ class IncompleteTypeDescriptor(Descriptor):
     Descriptor class for incomplete descriptors.
     This descriptor is never valid.
     """
+    __slots__ = ()
 
     @staticmethod
     def validate(component: Descriptor,
-                 path: List[str])\
+                 path: List[str],
+                 context: Optional[ValidationContext] = None)\
             -> bool:
         """
         This validation method always throws a ValidationError because an incomplete descriptor can
@@ -32,11 +242,37 @@ class IncompleteTypeDescriptor(Descriptor):
 
         :param component: The component to be validated.
         :param path: The path of the component to be validated.
+        :param context: The state of the validation of the document, see ValidationContext.
         :return: IncompleteTypedescriptors are never valid, calling the validate method will raise
             an exception.
         """
         raise ValidationError('.'.join(path), 'Incomplete component definition')
 
+    @staticmethod
+    def is_valid(component: Any) -> bool:   # pylint: disable=unused-argument
+        """
+        Validation method that returns whether the provided component is valid, see
+        MapDescriptor.is_valid. Incomplete descriptors are never valid.
+
+        :param component: The component to be validated.
+        :return: False.
+        """
+        return False
+
+    @staticmethod
+    def collect(component: Descriptor,   # pylint: disable=unused-argument
+                path: ErrorPath,
+                errors: ErrorCollector)\
+            -> None:
+        """
+        Validation method that collects the errors of the component instead of raising the first.
+
+        :param component: The component to be validated.
+        :param path: The path of the component to be validated.
+        :param errors: The collector of the validation errors.
+        """
+        errors.add(path, 'Incomplete component definition')
+
     def __str__(self) -> str:
         return 'IncompleteTypeDescriptor'
 
@@ -45,21 +281,51 @@ class BoolDescriptor(Descriptor):
     """
     Descriptor for boolean components.
     """
+    __slots__ = ()
+
     @staticmethod
     def validate(component: Descriptor,
-                 path: List[str])\
+                 path: List[str],
+                 context: Optional[ValidationContext] = None)\
             -> bool:
         """
         Validation method that decides whether the provided component is a valid boolean descriptor.
 
         :param component: The component to be validated.
         :param path: The path of the component to be validated.
+        :param context: The state of the validation of the document, see ValidationContext.
         :return: True if the component is valid otherwise the method will throw a ValidationError.
         """
         if component is None or not isinstance(component, bool):
             raise ValidationError('.'.join(path), 'Expected type: bool')
         return True
 
+    @staticmethod
+    def is_valid(component: Any) -> bool:
+        """
+        Validation method that returns whether the provided component is valid, see
+        MapDescriptor.is_valid.
+
+        :param component: The component to be validated.
+        :return: True if the component is valid.
+        """
+        return isinstance(component, bool)
+
+    @staticmethod
+    def collect(component: Descriptor,
+                path: ErrorPath,
+                errors: ErrorCollector)\
+            -> None:
+        """
+        Validation method that collects the errors of the component instead of raising the first.
+
+        :param component: The component to be validated.
+        :param path: The path of the component to be validated.
+        :param errors: The collector of the validation errors.
+        """
+        if component is None or not isinstance(component, bool):
+            errors.add(path, 'Expected type: bool')
+
     def __str__(self) -> str:
         return 'BoolDescriptor'
 
@@ -68,21 +334,51 @@ class StringDescriptor(Descriptor):
     """
     Descriptor for string components.
     """
+    __slots__ = ()
+
     @staticmethod
     def validate(component: Descriptor,
-                 path: List[str])\
+                 path: List[str],
+                 context: Optional[ValidationContext] = None)\
             -> bool:
         """
         Validation method that decides whether the provided component is a valid boolean descriptor.
 
         :param component: The component to be validated.
         :param path: The path of the component to be validated.
+        :param context: The state of the validation of the document, see ValidationContext.
         :return: True if the component is valid otherwise the method will throw a ValidationError.
         """
         if component is None or not isinstance(component, str):
             raise ValidationError('.'.join(path), 'Expected type: string')
         return True
 
+    @staticmethod
+    def is_valid(component: Any) -> bool:
+        """
+        Validation method that returns whether the provided component is valid, see
+        MapDescriptor.is_valid.
+
+        :param component: The component to be validated.
+        :return: True if the component is valid.
+        """
+        return isinstance(component, str)
+
+    @staticmethod
+    def collect(component: Descriptor,
+                path: ErrorPath,
+                errors: ErrorCollector)\
+            -> None:
+        """
+        Validation method that collects the errors of the component instead of raising the first.
+
+        :param component: The component to be validated.
+        :param path: The path of the component to be validated.
+        :param errors: The collector of the validation errors.
+        """
+        if component is None or not isinstance(component, str):
+            errors.add(path, 'Expected type: string')
+
     def __str__(self) -> str:
         return 'StringDescriptor'
 
@@ -91,21 +387,51 @@ class IntDescriptor(Descriptor):
     """
     Descriptor for integer components.
     """
+    __slots__ = ()
+
     @staticmethod
     def validate(component: Descriptor,
-                 path: List[str])\
+                 path: List[str],
+                 context: Optional[ValidationContext] = None)\
             -> bool:
         """
         Validation method that decides whether the provided component is a valid integer descriptor.
 
         :param component: The component to be validated.
         :param path: The path of the component to be validated.
+        :param context: The state of the validation of the document, see ValidationContext.
         :return: True if the component is valid otherwise the method will throw a ValidationError.
         """
         if component is None or not isinstance(component, int):
             raise ValidationError('.'.join(path), 'Expected type: int')
         return True
 
+    @staticmethod
+    def is_valid(component: Any) -> bool:
+        """
+        Validation method that returns whether the provided component is valid, see
+        MapDescriptor.is_valid.
+
+        :param component: The component to be validated.
+        :return: True if the component is valid.
+        """
+        return isinstance(component, int)
+
+    @staticmethod
+    def collect(component: Descriptor,
+                path: ErrorPath,
+                errors: ErrorCollector)\
+            -> None:
+        """
+        Validation method that collects the errors of the component instead of raising the first.
+
+        :param component: The component to be validated.
+        :param path: The path of the component to be validated.
+        :param errors: The collector of the validation errors.
+        """
+        if component is None or not isinstance(component, int):
+            errors.add(path, 'Expected type: int')
+
     def __str__(self) -> str:
         return 'IntDescriptor'
 
@@ -114,21 +440,51 @@ class FloatDescriptor(Descriptor):
     """
     Descriptor for floating point components.
     """
+    __slots__ = ()
+
     @staticmethod
     def validate(component: Descriptor,
-                 path: List[str])\
+                 path: List[str],
+                 context: Optional[ValidationContext] = None)\
             -> bool:
         """
         Validation method that decides whether the provided component is a valid float descriptor.
 
         :param component: The component to be validated.
         :param path: The path of the component to be validated.
+        :param context: The state of the validation of the document, see ValidationContext.
         :return: True if the component is valid otherwise the method will throw a ValidationError.
         """
         if component is None or not isinstance(component, float):
             raise ValidationError('.'.join(path), 'Expected type: float')
         return True
 
+    @staticmethod
+    def is_valid(component: Any) -> bool:
+        """
+        Validation method that returns whether the provided component is valid, see
+        MapDescriptor.is_valid.
+
+        :param component: The component to be validated.
+        :return: True if the component is valid.
+        """
+        return isinstance(component, float)
+
+    @staticmethod
+    def collect(component: Descriptor,
+                path: ErrorPath,
+                errors: ErrorCollector)\
+            -> None:
+        """
+        Validation method that collects the errors of the component instead of raising the first.
+
+        :param component: The component to be validated.
+        :param path: The path of the component to be validated.
+        :param errors: The collector of the validation errors.
+        """
+        if component is None or not isinstance(component, float):
+            errors.add(path, 'Expected type: float')
+
     def __str__(self) -> str:
         return 'FloatDescriptor'
 
@@ -137,12 +493,14 @@ class MapItem:  # pylint: disable=too-few-public-methods
     """
     Item type for the MapDescriptor.
     """
+    __slots__ = ('name', 'item_type', 'required')
+
     def __init__(self,
                  name: str,
                  item_type: str,
                  required: bool):
-        self.name = name
-        self.item_type = item_type
+        self.name = intern_name(name)
+        self.item_type = intern_name(item_type)
         self.required = required
 
     def __str__(self) -> str:
@@ -154,6 +512,8 @@ class MapDescriptor(Descriptor):
     """
     Descriptor for map type (i.e. collection of key-value pair) components.
     """
+    __slots__ = ('items', 'descriptors', 'allowed_names', 'required_names')
+
     def __init__(self,
                  items: List[MapItem],
                  descriptors: Dict[str, Descriptor]):
@@ -165,16 +525,20 @@ class MapDescriptor(Descriptor):
         """
         self.items = {item.name: item for item in items}
         self.descriptors = descriptors
+        self.allowed_names = frozenset(self.items)
+        self.required_names = frozenset(name for name in self.items if self.items[name].required)
 
     def validate(self,
                  component: Descriptor,
-                 path: List[str])\
+                 path: List[str],
+                 context: Optional[ValidationContext] = None)\
             -> bool:
         """
         Validation method that decides whether the provided component is a valid map descriptor.
 
         :param component: The component to be validated.
         :param path: The path of the component to be validated.
+        :param context: The state of the validation of the document, see ValidationContext.
         :return: True if the component is valid otherwise the method will throw a ValidationError.
         """
         required_items: Dict[str, bool] = {key: False for key in self.items
@@ -186,20 +550,119 @@ class MapDescriptor(Descriptor):
 
         if not isinstance(component, dict):
             raise ValidationError('.'.join(path), 'Expected type: map')
+        if context is not None and context.visit(component, self, path):
+            return True
 
         for key in component:
             if key not in self.items:
                 raise ValidationError('.'.join(path), 'Unexpected item: "{0}"'.format(key))
             path.append(key)
             required_items[key] = self.descriptors[
-                self.items[key].item_type].validate(component[key], path)
+                self.items[key].item_type].validate(component[key], path, context)
             path.pop()
 
         for key in required_items:
             if not required_items[key]:
                 raise ValidationError('.'.join(path), 'Missing required item: "{0}"'.format(key))
+        if context is not None:
+            context.add(component, self)
         return True
 
+    def is_valid(self, component: Any) -> bool:
+        """
+        Validation method that returns whether the provided component is a valid map, without
+        keeping track of the path of the components and without raising errors. It is equivalent to
+        validate for documents that are valid and much cheaper for the ones that are not.
+
+        :param component: The component to be validated.
+        :return: True if the component is valid.
+        """
+        if component is None:
+            return not self.required_names
+        if not isinstance(component, dict):
+            return False
+        items = self.items
+        descriptors = self.descriptors
+        for key in component:
+            item = items.get(key)
+            if item is None or not descriptors[item.item_type].is_valid(component[key]):
+                return False
+        return component.keys() >= self.required_names
+
+    def check_structure(self,
+                        component: Any,
+                        path: List[str],
+                        depth: int)\
+            -> bool:
+        """
+        Structural validation method that checks the keys of the map against the precomputed sets
+        of the allowed and the required item names and, below the first level, the structure of its
+        items, without checking the types of their primitive values. It raises the same errors as
+        validate, but it may find a structural error of the map before an error of an earlier item.
+
+        :param component: The component to be checked.
+        :param path: The path of the component to be checked.
+        :param depth: The number of levels checked, starting with the map.
+        :return: True if the structure is valid otherwise the method will throw a ValidationError.
+        """
+        if component is None:
+            if not self.required_names:
+                return True
+            raise ValidationError('.'.join(path), 'No components found')
+        if not isinstance(component, dict):
+            raise ValidationError('.'.join(path), 'Expected type: map')
+        keys = component.keys()
+        if not keys <= self.allowed_names:
+            for key in component:
+                if key not in self.items:
+                    raise ValidationError('.'.join(path), 'Unexpected item: "{0}"'.format(key))
+        if not keys >= self.required_names:
+            for key in self.items:
+                if key in self.required_names and key not in component:
+                    raise ValidationError('.'.join(path),
+                                          'Missing required item: "{0}"'.format(key))
+        if depth > 1:
+            for key in component:
+                path.append(key)
+                self.descriptors[self.items[key].item_type].check_structure(component[key], path,
+                                                                            depth - 1)
+                path.pop()
+        return True
+
+    def collect(self,
+                component: Descriptor,
+                path: ErrorPath,
+                errors: ErrorCollector)\
+            -> None:
+        """
+        Validation method that collects the errors of the map and its items instead of raising the
+        first. Unexpected items are reported and skipped, the other items are validated.
+
+        :param component: The component to be validated.
+        :param path: The path of the component to be validated.
+        :param errors: The collector of the validation errors.
+        """
+        required_items = [key for key in self.items if self.items[key].required]
+        if component is None:
+            if required_items:
+                errors.add(path, 'No components found')
+            return
+
+        if not isinstance(component, dict):
+            errors.add(path, 'Expected type: map')
+            return
+
+        for key in component:
+            if key not in self.items:
+                errors.add(path, 'Unexpected item: "{0}"'.format(key))
+                continue
+            self.descriptors[self.items[key].item_type].collect(component[key], path.child(key),
+                                                                errors)
+
+        for key in required_items:
+            if key not in component:
+                errors.add(path, 'Missing required item: "{0}"'.format(key))
+
     def __str__(self) -> str:
         ret = 'MapDescriptor('
         ret += ','.join([str(self.items[item]) for item in self.items])
@@ -211,6 +674,8 @@ class ListDescriptor(Descriptor):
     """
     Descriptor class for list type components.
     """
+    __slots__ = ('item_types', 'descriptors', 'min_items', 'max_items')
+
     def __init__(self,
                  item_types: List[str],
                  min_items: Optional[int],
@@ -224,20 +689,22 @@ class ListDescriptor(Descriptor):
         :param max_items: Number of maximum occurrences.
         :param descriptors: Descriptors for the list items.
         """
-        self.item_types: List[str] = [t for t in item_types]
+        self.item_types: Tuple[str, ...] = tuple(intern_name(t) for t in item_types)
         self.descriptors: Dict[str, Descriptor] = descriptors
         self.min_items = min_items
         self.max_items = max_items
 
     def validate(self,
                  component: Descriptor,
-                 path: List[str])\
+                 path: List[str],
+                 context: Optional[ValidationContext] = None)\
             -> bool:
         """
         Validation method that decides whether the provided component is a valid list descriptor.
 
         :param component: The component to be validated.
         :param path: The path of the component to be validated.
+        :param context: The state of the validation of the document, see ValidationContext.
         :return: True if the component is valid otherwise the method will throw a ValidationError.
         """
         if component is None:
@@ -247,15 +714,15 @@ class ListDescriptor(Descriptor):
                                                   'items: min={0}'.format(self.min_items))
         if not isinstance(component, list):
             raise ValidationError('.'.join(path), 'Expected type: list')
+        if context is not None and context.visit(component, self, path):
+            return True
+        if context is not None and context.sampling and id(self) in context.sampling:
+            self.validate_sample(component, path, context)
+            context.add(component, self)
+            return True
         item_cnt = 0
         for item in component:
-            for key in item:
-                if key not in self.item_types:
-                    raise ValidationError('.'.join(path),
-                                          'Unexpected type: "{0}"'.format(key))
-                path.append('items[{0}]'.format(item_cnt))
-                self.descriptors[key].validate(item[key], path)
-                path.pop()
+            self.validate_item(item, item_cnt, path, context)
             item_cnt += 1
             if self.max_items and item_cnt > self.max_items:
                 raise ValidationError('.'.join(path), 'Too many list '
@@ -263,8 +730,174 @@ class ListDescriptor(Descriptor):
         if self.min_items and item_cnt < self.min_items:
             raise ValidationError('.'.join(path), 'Too few list '
                                   'items: min={0}'.format(self.min_items))
+        if context is not None:
+            context.add(component, self)
+        return True
+
+    def validate_sample(self,
+                        component: List[Any],
+                        path: List[str],
+                        context: ValidationContext)\
+            -> bool:
+        """
+        Validation method that checks the number of items of a list exactly but validates only the
+        items selected by the sampling policy of the list type in the context. The length is checked
+        first, so a list with too many or too few items fails before its items are validated.
+
+        :param component: The list to be validated.
+        :param path: The path of the list.
+        :param context: The state of the validation of the document, see ValidationContext.
+        :return: True if the sampled items are valid otherwise the method will throw a
+            ValidationError.
+        """
+        type_name, policy = context.sampling[id(self)]   # type: ignore
+        length = len(component)
+        if self.max_items and length > self.max_items:
+            raise ValidationError('.'.join(path), 'Too many list '
+                                  'items: max={0}'.format(self.max_items))
+        if self.min_items and length < self.min_items:
+            raise ValidationError('.'.join(path), 'Too few list '
+                                  'items: min={0}'.format(self.min_items))
+        checked = 0
+        for index in policy.indices(length):
+            self.validate_item(component[index], index, path, context)
+            checked += 1
+        context.cover(type_name, checked, length)
+        return True
+
+    def validate_item(self,
+                      item: Descriptor,
+                      index: int,
+                      path: List[str],
+                      context: Optional[ValidationContext] = None)\
+            -> bool:
+        """
+        Validation method that decides whether the provided component is a valid item of the list.
+        A list item is a map whose single key names the type of its value, any other item fails
+        at its own path.
+
+        :param item: The list item to be validated.
+        :param index: The position of the item in the list.
+        :param path: The path of the list.
+        :param context: The state of the validation of the document, see ValidationContext.
+        :return: True if the item is valid otherwise the method will throw a ValidationError.
+        """
+        if not isinstance(item, dict):
+            path.append('items[{0}]'.format(index))
+            raise ValidationError('.'.join(path), 'Expected type: map')
+        for key in item:
+            if key not in self.item_types:
+                raise ValidationError('.'.join(path),
+                                      'Unexpected type: "{0}"'.format(key))
+            path.append('items[{0}]'.format(index))
+            self.descriptors[key].validate(item[key], path, context)
+            path.pop()
+        return True
+
+    def is_valid(self, component: Any) -> bool:
+        """
+        Validation method that returns whether the provided component is a valid list, see
+        MapDescriptor.is_valid.
+
+        :param component: The component to be validated.
+        :return: True if the component is valid.
+        """
+        if component is None:
+            return not self.min_items
+        if not isinstance(component, list):
+            return False
+        if self.max_items and len(component) > self.max_items:
+            return False
+        if self.min_items and len(component) < self.min_items:
+            return False
+        item_types = self.item_types
+        descriptors = self.descriptors
+        for item in component:
+            if not isinstance(item, dict):
+                return False
+            for key in item:
+                if key not in item_types or not descriptors[key].is_valid(item[key]):
+                    return False
         return True
 
+    def check_structure(self,
+                        component: Any,
+                        path: List[str],
+                        depth: int)\
+            -> bool:
+        """
+        Structural validation method that checks the length of the list against the min and max
+        attributes and the types of its items and, below the first level, the structure of the
+        items, without checking the types of their primitive values. See
+        MapDescriptor.check_structure.
+
+        :param component: The component to be checked.
+        :param path: The path of the component to be checked.
+        :param depth: The number of levels checked, starting with the list.
+        :return: True if the structure is valid otherwise the method will throw a ValidationError.
+        """
+        if component is None:
+            if not self.min_items:
+                return True
+            raise ValidationError('.'.join(path), 'Too few list '
+                                                  'items: min={0}'.format(self.min_items))
+        if not isinstance(component, list):
+            raise ValidationError('.'.join(path), 'Expected type: list')
+        if self.max_items and len(component) > self.max_items:
+            raise ValidationError('.'.join(path), 'Too many list '
+                                  'items: max={0}'.format(self.max_items))
+        if self.min_items and len(component) < self.min_items:
+            raise ValidationError('.'.join(path), 'Too few list '
+                                  'items: min={0}'.format(self.min_items))
+        for index, item in enumerate(component):
+            if not isinstance(item, dict):
+                path.append('items[{0}]'.format(index))
+                raise ValidationError('.'.join(path), 'Expected type: map')
+            for key in item:
+                if key not in self.item_types:
+                    raise ValidationError('.'.join(path), 'Unexpected type: "{0}"'.format(key))
+                if depth > 1:
+                    path.append('items[{0}]'.format(index))
+                    self.descriptors[key].check_structure(item[key], path, depth - 1)
+                    path.pop()
+        return True
+
+    def collect(self,
+                component: Descriptor,
+                path: ErrorPath,
+                errors: ErrorCollector)\
+            -> None:
+        """
+        Validation method that collects the errors of the list and its items instead of raising the
+        first. Too many items are reported once and the remaining items are still validated.
+
+        :param component: The component to be validated.
+        :param path: The path of the component to be validated.
+        :param errors: The collector of the validation errors.
+        """
+        if component is None:
+            if self.min_items:
+                errors.add(path, 'Too few list items: min={0}'.format(self.min_items))
+            return
+        if not isinstance(component, list):
+            errors.add(path, 'Expected type: list')
+            return
+        item_cnt = 0
+        for item in component:
+            if not isinstance(item, dict):
+                errors.add(path.item(item_cnt), 'Expected type: map')
+            else:
+                for key in item:
+                    if key not in self.item_types:
+                        errors.add(path, 'Unexpected type: "{0}"'.format(key))
+                        continue
+                    self.descriptors[key].collect(item[key], path.item(item_cnt), errors)
+            item_cnt += 1
+            if self.max_items and item_cnt == self.max_items + 1:
+                errors.add(path, 'Too many list items: max={0}'.format(self.max_items))
+        if self.min_items and item_cnt < self.min_items:
+            errors.add(path, 'Too few list items: min={0}'.format(self.min_items))
+
     def __str__(self) -> str:
         ret = 'ListDescriptor('
         ret += ','.join(self.item_types)
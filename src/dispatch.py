@@ -0,0 +1,105 @@
+"""
+This module contains the routing of the records of heterogeneous streams to the schemas of their
+kinds. A Dispatcher reads the discriminator of a record, looks its schema up in an index built in
+advance and validates the record against that schema only, instead of trying the candidate schemas
+in turn and paying for every failed attempt.
+"""
+
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from error import ValidationError   # pylint: disable=no-name-in-module, wrong-import-position
+
+
+class Dispatcher:
+    """
+    This class validates each record against the schema selected by its discriminator, which is
+    either the value of a top-level key of the records or, without a discriminator key, the name of
+    the first top-level component of the record: like the items of a list are tagged by their single
+    key, every top-level component of a schema selects that schema. The schemas are compiled, lazy
+    schemas are validated by their recursive engine.
+    """
+    def __init__(self,
+                 schemas: Dict[Any, Any],
+                 key: Optional[str] = None):
+        """
+        Constructor for the Dispatcher class, which indexes the schemas by their discriminators.
+
+        :param schemas: A dict from the discriminator values to the Schema instances if a key is
+            given, otherwise from the names of the schemas to the Schema instances.
+        :param key: The top-level key holding the discriminator of the records, None to select the
+            schemas by the names of their top-level components, which must not be shared.
+        """
+        self.key = key
+        self.index: Dict[Any, Tuple[Any, Callable[[Any], bool]]] = {}
+        for name, schema in schemas.items():
+            validator = schema.validate if getattr(schema, 'lazy', False) \
+                else schema.compile().validate
+            if key is not None:
+                self.index[name] = (name, validator)
+                continue
+            for component_name in schema.schema.items:
+                if component_name in self.index:
+                    raise ValueError('component "{0}" is defined by schemas "{1}" and "{2}"'.format(
+                        component_name, self.index[component_name][0], name))
+                self.index[component_name] = (name, validator)
+
+    def route(self,
+              record: Any)\
+            -> Tuple[Any, Callable[[Any], bool]]:
+        """
+        Finds the schema of a record.
+
+        :param record: The record.
+        :return: The discriminator value or the name of the schema, and the validator function of
+            the schema. Raises a ValidationError if the record has no known discriminator.
+        """
+        if not isinstance(record, dict):
+            raise ValidationError('', 'Expected type: map')
+        if self.key is None:
+            if not record:
+                raise ValidationError('', 'No components found')
+            discriminator = next(iter(record))
+        elif self.key in record:
+            discriminator = record[self.key]
+        else:
+            raise ValidationError('', 'Missing discriminator: "{0}"'.format(self.key))
+        try:
+            return self.index[discriminator]
+        except (KeyError, TypeError):
+            if self.key is None:
+                raise ValidationError('', 'Unexpected item: "{0}"'.format(discriminator))
+            raise ValidationError(self.key, 'Unknown discriminator: "{0}"'.format(discriminator))
+
+    def validate(self,
+                 record: Any)\
+            -> Any:
+        """
+        Validates a record against the schema selected by its discriminator.
+
+        :param record: The record.
+        :return: The discriminator value or the name of the schema the record is valid against.
+            Raises a ValidationError if the record is invalid or has no known discriminator.
+        """
+        name, validator = self.route(record)
+        validator(record)
+        return name
+
+    def check(self,
+              record: Any)\
+            -> Tuple[Any, Optional[ValidationError]]:
+        """
+        Validates a record like validate does, returning the error instead of raising it.
+
+        :param record: The record.
+        :return: The discriminator value or the name of the schema of the record (None if it has no
+            known discriminator), and the ValidationError of the record or None if it is valid.
+        """
+        try:
+            name, validator = self.route(record)
+        except ValidationError as error:
+            return None, error
+        try:
+            validator(record)
+        except ValidationError as error:
+            return name, error
+        return name, None
@@ -2,6 +2,8 @@
 This module contains the error types for both schema processing and validation.
 """
 
+from typing import Any, List, Optional, Union
+
 
 class SchemaError(Exception):
     """
@@ -14,20 +16,132 @@ class SchemaError(Exception):
         self.path = path
         self.msg = msg
 
+    def __reduce__(self):
+        return self.__class__, (self.path, self.msg)
+
     def __str__(self):
         return 'SchemaError - Path: {0} - {1}'.format(self.path, self.msg)
 
 
+class ErrorPath:
+    """
+    This class represents the path of a component as an immutable linked list of path segments.
+    Extending a path is cheap and the path is only joined into its string form (e.g.
+    'library.items[3].title') when it is rendered.
+    """
+    __slots__ = ('parent', 'segment', 'is_item')
+
+    def __init__(self,
+                 parent: Optional['ErrorPath'] = None,
+                 segment: Any = None,
+                 is_item: bool = False):
+        self.parent = parent
+        self.segment = segment
+        self.is_item = is_item
+
+    def child(self,
+              key: Any)\
+            -> 'ErrorPath':
+        """
+        Returns the path of an item of the map at this path.
+
+        :param key: The key of the item.
+        :return: The path of the item.
+        """
+        return ErrorPath(self, key)
+
+    def item(self,
+             index: int)\
+            -> 'ErrorPath':
+        """
+        Returns the path of an item of the list at this path.
+
+        :param index: The position of the item.
+        :return: The path of the item.
+        """
+        return ErrorPath(self, index, True)
+
+    def segments(self) -> List[str]:
+        """
+        Returns the segments of the path in the form the descriptors use them.
+
+        :return: The list of the path segments from the root.
+        """
+        segments = []
+        node: Optional[ErrorPath] = self
+        while node is not None and node.parent is not None:
+            if node.is_item:
+                segments.append('items[{0}]'.format(node.segment))
+            else:
+                segments.append(node.segment)
+            node = node.parent
+        segments.reverse()
+        return segments
+
+    def __str__(self) -> str:
+        return '.'.join(self.segments())
+
+
 class ValidationError(Exception):
     """
-    This class represents validation errors.
+    This class represents validation errors. The path can be given as an ErrorPath, in which case it
+    is converted to a string when it is first accessed.
     """
     def __init__(self,
-                 path: str,
+                 path: Union[str, ErrorPath],
                  msg: str):
         super().__init__()
-        self.path = path
+        self.raw_path = path
         self.msg = msg
 
+    @property
+    def path(self) -> str:
+        """
+        The path of the invalid component.
+        """
+        if not isinstance(self.raw_path, str):
+            self.raw_path = str(self.raw_path)
+        return self.raw_path
+
+    def __reduce__(self):
+        return self.__class__, (self.path, self.msg)
+
     def __str__(self):
         return 'ValidationError - Path: {0} - {1}'.format(self.path, self.msg)
+
+
+class ErrorLimitReached(Exception):
+    """
+    This exception is raised by an ErrorCollector when it has collected the allowed number of
+    errors.
+    """
+
+
+class ErrorCollector:
+    """
+    This class collects the validation errors of a document.
+    """
+    def __init__(self,
+                 max_errors: Optional[int] = None):
+        """
+        Constructor for the ErrorCollector class.
+
+        :param max_errors: The number of errors after which the validation stops.
+        """
+        self.errors: List[ValidationError] = []
+        self.max_errors = max_errors
+
+    def add(self,
+            path: ErrorPath,
+            msg: str)\
+            -> None:
+        """
+        Adds a validation error. Raises ErrorLimitReached when the maximum number of errors has been
+        collected.
+
+        :param path: The path of the invalid component.
+        :param msg: The description of the error.
+        """
+        self.errors.append(ValidationError(path, msg))
+        if self.max_errors is not None and len(self.errors) >= self.max_errors:
+            raise ErrorLimitReached()
@@ -0,0 +1,653 @@
+"""
+This module contains the event-driven validator that validates a document while it is being parsed.
+The validator consumes parser events (start and end of maps and lists, scalars) and drives the map
+and list descriptors of the schema as a state machine, so the document tree is never materialized
+and validation stops at the first violation without parsing the rest of the input. Event sources are
+provided for PyYAML's event API and for an incremental JSON tokenizer.
+
+The number of nodes of a document can be limited like with a ValidationContext. Aliased YAML nodes
+are replayed as events at every alias, so their nodes are counted at every alias too, which stops an
+alias bomb before it is expanded.
+
+Documents whose meaning depends on keys that have not been parsed yet are refused with a ValueError
+instead of being validated differently than their parsed form: maps with duplicate keys, whose
+parsed form keeps only the last value, and YAML merge keys (<<), whose merged items are overridden
+by the items of the map wherever they appear.
+"""
+
+import json
+import re
+from json.decoder import scanstring   # type: ignore
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple
+
+import yaml
+
+from descriptor import Descriptor, IncompleteTypeDescriptor, BoolDescriptor, IntDescriptor,\
+    FloatDescriptor, StringDescriptor, MapDescriptor, ListDescriptor   # pylint: disable=import-error, wrong-import-position, line-too-long
+from error import ValidationError   # pylint: disable=no-name-in-module, wrong-import-position
+
+START_MAP = 'start_map'
+END_MAP = 'end_map'
+START_LIST = 'start_list'
+END_LIST = 'end_list'
+SCALAR = 'scalar'
+
+MERGE_TAG = 'tag:yaml.org,2002:merge'
+YAML_EVENT_KINDS = {yaml.MappingStartEvent: START_MAP, yaml.MappingEndEvent: END_MAP,
+                    yaml.SequenceStartEvent: START_LIST, yaml.SequenceEndEvent: END_LIST}
+
+Event = Tuple[str, Any]
+
+# Descriptors whose validation never looks into a map or a list, so they can reject one immediately.
+SHALLOW_DESCRIPTORS = (IncompleteTypeDescriptor, BoolDescriptor, IntDescriptor, FloatDescriptor,
+                       StringDescriptor)
+
+
+class ValueBuilder:
+    """
+    This class builds a Python value from events. It is used for the few parts of a document that
+    have to be materialized, i.e. anchored YAML nodes and the values of descriptors that need the
+    whole value.
+    """
+    def __init__(self) -> None:
+        self.stack: List[Any] = []
+        self.keys: List[Any] = []
+        self.value: Any = None
+        self.done = False
+
+    def add(self,
+            value: Any)\
+            -> None:
+        """
+        Adds a completed value to the innermost container or finishes the build.
+
+        :param value: The completed value.
+        """
+        if not self.stack:
+            self.value = value
+            self.done = True
+        elif isinstance(self.stack[-1], list):
+            self.stack[-1].append(value)
+        elif self.keys[-1] is ValueBuilder:
+            self.keys[-1] = value
+        else:
+            self.stack[-1][self.keys[-1]] = value
+            self.keys[-1] = ValueBuilder
+
+    def event(self,
+              kind: str,
+              value: Any = None)\
+            -> bool:
+        """
+        Processes one event.
+
+        :param kind: The kind of the event.
+        :param value: The value of scalar events.
+        :return: True if the value is complete.
+        """
+        if kind == START_MAP:
+            self.stack.append({})
+            self.keys.append(ValueBuilder)
+        elif kind == START_LIST:
+            self.stack.append([])
+            self.keys.append(None)
+        elif kind in (END_MAP, END_LIST):
+            self.keys.pop()
+            self.add(self.stack.pop())
+        else:
+            self.add(value)
+        return self.done
+
+
+class Frame:  # pylint: disable=too-few-public-methods
+    """
+    A map, list or list item that is being validated by the EventValidator.
+    """
+    def __init__(self,
+                 kind: str,
+                 descriptor: Descriptor):
+        self.kind = kind
+        self.descriptor = descriptor
+        self.key: Any = None
+        self.in_value = False
+        self.seen: Dict[Any, bool] = {}
+        self.item_cnt = 0
+
+
+class EventValidator:   # pylint: disable=too-many-instance-attributes
+    """
+    This class validates a document from its parser events against the descriptors of a schema.
+    The validation errors are identical to the ones raised by validating the parsed document, except
+    for the ones of the node limit: the nodes are counted as they are parsed, so a document can fail
+    at a later node than its parsed form with a ValidationContext.
+    """
+    def __init__(self,
+                 root: Descriptor,
+                 max_nodes: Optional[int] = None):
+        """
+        Constructor for the EventValidator class.
+
+        :param root: The descriptor of the whole document.
+        :param max_nodes: The number of document nodes after which the validation fails, None for
+            no limit. The nodes are counted like ValidationContext counts them, the document itself
+            is the first node and every item of a map or a list is one more.
+        """
+        if max_nodes is not None and max_nodes < 1:
+            raise ValueError('The maximum number of nodes must be positive')
+        self.root = root
+        self.nodes = 1
+        self.max_nodes = max_nodes
+        self.path: List[str] = []
+        self.stack: List[Frame] = []
+        self.builder: Optional[ValueBuilder] = None
+        self.builder_descriptor: Optional[Descriptor] = None
+        self.started = False
+        self.done = False
+
+    def expected(self) -> Tuple[Optional[Descriptor], Optional[Frame]]:
+        """
+        Returns what the next value has to conform to.
+
+        :return: A two-tuple consisting of the descriptor of the next value and, if the next value
+            is a list item, the frame of the list.
+        """
+        if not self.stack:
+            return self.root, None
+        frame = self.stack[-1]
+        if frame.kind == 'list':
+            return None, frame
+        descriptor = frame.descriptor
+        if frame.kind == 'map':
+            return descriptor.descriptors[descriptor.items[frame.key].item_type], None  # type: ignore
+        return descriptor.descriptors[frame.key], None  # type: ignore
+
+    def event(self,
+              kind: str,
+              value: Any = None)\
+            -> None:
+        """
+        Processes one parser event. Raises a ValidationError as soon as the document is known to be
+        invalid.
+
+        :param kind: The kind of the event.
+        :param value: The value of scalar events.
+        """
+        if self.builder is not None:
+            if self.builder.event(kind, value):
+                self.built(self.builder.value)
+            return
+        if self.done:
+            raise ValueError('Unexpected event after the end of the document: {0}'.format(kind))
+        self.started = True
+        if self.stack and not self.stack[-1].in_value and self.stack[-1].kind != 'list':
+            self.key_event(kind, value)
+        elif kind in (END_MAP, END_LIST):
+            self.end_event()
+        else:
+            self.value_event(kind, value)
+
+    def key_event(self,
+                  kind: str,
+                  value: Any)\
+            -> None:
+        """
+        Processes an event in the key position of a map.
+
+        :param kind: The kind of the event.
+        :param value: The value of scalar events.
+        """
+        frame = self.stack[-1]
+        if kind == END_MAP:
+            self.end_event()
+            return
+        if kind != SCALAR:
+            raise ValueError('Unsupported map key: {0}'.format(kind))
+        if value in frame.seen:
+            raise ValueError('Duplicate key "{0}" at "{1}": documents with duplicate keys are not '
+                             'supported in events mode'.format(value, '.'.join(self.path)))
+        if frame.kind == 'map':
+            self.count()
+            if value not in frame.descriptor.items:  # type: ignore
+                raise ValidationError('.'.join(self.path), 'Unexpected item: "{0}"'.format(value))
+            self.path.append(value)
+        else:
+            if value not in frame.descriptor.item_types:  # type: ignore
+                raise ValidationError('.'.join(self.path), 'Unexpected type: "{0}"'.format(value))
+            self.path.append('items[{0}]'.format(frame.item_cnt))
+        frame.key = value
+        frame.in_value = True
+
+    def value_event(self,
+                    kind: str,
+                    value: Any)\
+            -> None:
+        """
+        Processes an event that starts a value.
+
+        :param kind: The kind of the event.
+        :param value: The value of scalar events.
+        """
+        descriptor, list_frame = self.expected()
+        if list_frame is not None:
+            self.count()
+            if kind != START_MAP:
+                self.path.append('items[{0}]'.format(list_frame.item_cnt))
+                raise ValidationError('.'.join(self.path), 'Expected type: map')
+            item_frame = Frame('item', list_frame.descriptor)
+            item_frame.item_cnt = list_frame.item_cnt
+            self.stack.append(item_frame)
+        elif isinstance(descriptor, MapDescriptor) and kind == START_MAP:
+            self.stack.append(Frame('map', descriptor))
+        elif isinstance(descriptor, ListDescriptor) and kind == START_LIST:
+            self.stack.append(Frame('list', descriptor))
+        elif kind == SCALAR:
+            descriptor.validate(value, self.path)  # type: ignore
+            self.value_done()
+        elif isinstance(descriptor, (MapDescriptor, ListDescriptor) + SHALLOW_DESCRIPTORS):
+            descriptor.validate({} if kind == START_MAP else [], self.path)  # type: ignore
+        else:
+            self.build(kind, value, descriptor)
+
+    def end_event(self) -> None:
+        """
+        Processes the end of a map or a list.
+        """
+        frame = self.stack.pop()
+        if frame.kind == 'map':
+            for key in frame.descriptor.items:  # type: ignore
+                if frame.descriptor.items[key].required and key not in frame.seen:  # type: ignore
+                    raise ValidationError('.'.join(self.path),
+                                          'Missing required item: "{0}"'.format(key))
+        elif frame.kind == 'list':
+            if frame.descriptor.min_items and \
+                    frame.item_cnt < frame.descriptor.min_items:  # type: ignore
+                raise ValidationError('.'.join(self.path), 'Too few list '
+                                      'items: min={0}'.format(frame.descriptor.min_items))  # type: ignore
+        self.value_done()
+
+    def build(self,
+              kind: str,
+              value: Any,
+              descriptor: Descriptor)\
+            -> None:
+        """
+        Starts materializing the next value because its descriptor needs the whole value.
+
+        :param kind: The kind of the event starting the value.
+        :param value: The value of scalar events.
+        :param descriptor: The descriptor the value will be validated with.
+        """
+        builder = ValueBuilder()
+        self.builder_descriptor = descriptor
+        if builder.event(kind, value):
+            self.built(builder.value)
+        else:
+            self.builder = builder
+
+    def built(self,
+              value: Any)\
+            -> None:
+        """
+        Validates a materialized value.
+
+        :param value: The value.
+        """
+        self.builder = None
+        self.builder_descriptor.validate(value, self.path)  # type: ignore
+        self.value_done()
+
+    def count(self) -> None:
+        """
+        Counts the next item of the current map or list as a visited node. Raises a ValidationError
+        if the number of visited nodes exceeds the maximum.
+        """
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise ValidationError('.'.join(self.path),
+                                  'Too many nodes: max={0}'.format(self.max_nodes))
+
+    def value_done(self) -> None:
+        """
+        Updates the state machine after a value has been completely validated.
+        """
+        if not self.stack:
+            self.done = True
+            return
+        frame = self.stack[-1]
+        if frame.kind == 'list':
+            self.item_done(frame)
+            return
+        self.path.pop()
+        frame.in_value = False
+        frame.seen[frame.key] = True
+
+    def item_done(self,
+                  frame: Frame)\
+            -> None:
+        """
+        Updates a list frame after one of its items has been validated.
+
+        :param frame: The frame of the list.
+        """
+        frame.item_cnt += 1
+        max_items = frame.descriptor.max_items  # type: ignore
+        if max_items and frame.item_cnt > max_items:
+            raise ValidationError('.'.join(self.path), 'Too many list '
+                                  'items: max={0}'.format(max_items))
+
+    def finish(self) -> bool:
+        """
+        Finishes the validation after the last event.
+
+        :return: True if the document is valid otherwise the method will throw a ValidationError.
+        """
+        if not self.started:
+            return self.root.validate(None, self.path)  # type: ignore
+        if not self.done:
+            raise ValueError('Incomplete document')
+        return True
+
+
+def yaml_events(stream: IO[str]) -> Iterator[Event]:
+    """
+    Parses a YAML document into events with PyYAML's event API. Scalars are resolved and constructed
+    like the safe loader does. Anchored nodes are materialized so that their aliases can be
+    replayed. Merge keys (<<) are not supported and raise a ValueError.
+
+    :param stream: The text stream to be parsed.
+    :return: An iterator over the events of the document.
+    """
+    loader = yaml.SafeLoader(stream)
+    anchors: Dict[str, Any] = {}
+    recording: List[Tuple[str, ValueBuilder]] = []
+    documents = 0
+    try:
+        while loader.check_event():
+            event = loader.get_event()
+            if isinstance(event, yaml.DocumentStartEvent):
+                documents += 1
+                if documents > 1:
+                    raise ValueError('Expected a single document in the stream')
+                continue
+            replayed = yaml_event_values(loader, event, anchors)
+            if replayed is None:
+                continue
+            anchor = getattr(event, 'anchor', None)
+            if anchor is not None and not isinstance(event, yaml.AliasEvent):
+                recording.append((anchor, ValueBuilder()))
+            for kind, value in replayed:
+                for name, builder in list(recording):
+                    if builder.event(kind, value):
+                        anchors[name] = builder.value
+                        recording.remove((name, builder))
+                yield kind, value
+    finally:
+        loader.dispose()
+
+
+def yaml_event_values(loader: yaml.SafeLoader,
+                      event: yaml.Event,
+                      anchors: Dict[str, Any])\
+        -> Optional[Iterator[Event]]:
+    """
+    Returns the events of the validator for a YAML event: the events of the anchored value for an
+    alias, one event for the other nodes.
+
+    :param loader: The loader parsing the document.
+    :param event: The YAML event.
+    :param anchors: The materialized anchored values by anchor name.
+    :return: An iterator over the events or None for the events that are not part of the value.
+    """
+    if isinstance(event, yaml.AliasEvent):
+        if event.anchor not in anchors:
+            raise ValueError('Found undefined alias: {0}'.format(event.anchor))
+        return value_events(anchors[event.anchor])
+    if isinstance(event, yaml.ScalarEvent):
+        return iter([(SCALAR, yaml_scalar(loader, event))])
+    if type(event) in YAML_EVENT_KINDS:
+        return iter([(YAML_EVENT_KINDS[type(event)], None)])
+    return None
+
+
+def yaml_scalar(loader: yaml.SafeLoader,
+                event: yaml.ScalarEvent)\
+        -> Any:
+    """
+    Resolves and constructs the value of a YAML scalar event like the safe loader does. Merge keys
+    (<<) are not supported and raise a ValueError.
+
+    :param loader: The loader parsing the document.
+    :param event: The scalar event.
+    :return: The value of the scalar.
+    """
+    tag = event.tag
+    if tag is None or tag == '!':
+        tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+    if tag == MERGE_TAG:
+        raise ValueError('YAML merge keys (<<) are not supported in events mode: '
+                         'line {0}'.format(event.start_mark.line + 1))
+    node = yaml.ScalarNode(tag, event.value, event.start_mark, event.end_mark, style=event.style)
+    constructor = loader.yaml_constructors.get(tag, loader.yaml_constructors[None])
+    return constructor(loader, node)
+
+
+def value_events(value: Any) -> Iterator[Event]:
+    """
+    Generates the events of an already materialized value.
+
+    :param value: The value.
+    :return: An iterator over the events of the value.
+    """
+    if isinstance(value, dict):
+        yield START_MAP, None
+        for key in value:
+            yield SCALAR, key
+            yield from value_events(value[key])
+        yield END_MAP, None
+    elif isinstance(value, list):
+        yield START_LIST, None
+        for item in value:
+            yield from value_events(item)
+        yield END_LIST, None
+    else:
+        yield SCALAR, value
+
+
+NUMBER_RE = re.compile(r'(-?(?:0|[1-9]\d*))(\.\d+)?([eE][-+]?\d+)?')
+NUMBER_CHARS = '0123456789.eE+-'
+WHITESPACE = ' \t\n\r'
+LITERALS = {'true': True, 'false': False, 'null': None}
+
+
+class JsonTokenizer:
+    """
+    This class is an incremental JSON parser that reads its input in chunks and turns it into
+    events. Only the current chunk and the state of the open containers are kept in memory.
+    """
+    def __init__(self,
+                 stream: IO[str],
+                 chunk_size: int = 65536):
+        """
+        Constructor for the JsonTokenizer class.
+
+        :param stream: The text stream to be parsed.
+        :param chunk_size: The number of characters read at once.
+        """
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.offset = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """
+        Reads the next chunk of the input and drops the consumed part of the buffer.
+
+        :return: False if the end of the input has been reached.
+        """
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        self.offset += self.pos
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        if not chunk:
+            self.eof = True
+        return bool(chunk)
+
+    def error(self,
+              msg: str)\
+            -> ValueError:
+        """
+        Creates a parse error pointing at the current position.
+
+        :param msg: The description of the error.
+        :return: The error to be raised.
+        """
+        return ValueError('Invalid JSON: {0}: char {1}'.format(msg, self.offset + self.pos))
+
+    def next_char(self) -> str:
+        """
+        Skips whitespace and returns the next character without consuming it.
+
+        :return: The next character or an empty string at the end of the input.
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self.fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def read_string(self) -> str:
+        """
+        Reads a string starting at the current position.
+
+        :return: The decoded string.
+        """
+        while True:
+            try:
+                value, end = scanstring(self.buffer, self.pos + 1)
+                self.pos = end
+                return value
+            except json.JSONDecodeError as error:
+                incomplete = error.msg.startswith('Unterminated') or \
+                    error.pos >= len(self.buffer) - 6
+                if not incomplete or not self.fill():
+                    raise self.error(error.msg)
+
+    def read_literal(self) -> Any:
+        """
+        Reads a number, true, false or null starting at the current position.
+
+        :return: The value of the literal.
+        """
+        while True:
+            match = NUMBER_RE.match(self.buffer, self.pos)
+            if match is not None and (self.eof or len(self.buffer) - match.end() >= 3 or (
+                    match.end() < len(self.buffer)
+                    and self.buffer[match.end()] not in NUMBER_CHARS)):
+                self.pos = match.end()
+                integer, fraction, exponent = match.groups()
+                if fraction or exponent:
+                    return float(integer + (fraction or '') + (exponent or ''))
+                return int(integer)
+            if match is None:
+                for literal, value in LITERALS.items():
+                    if self.buffer.startswith(literal, self.pos):
+                        self.pos += len(literal)
+                        return value
+                if len(self.buffer) - self.pos >= 5 or self.eof:
+                    raise self.error('Expecting value')
+            self.fill()
+
+    def events(self) -> Iterator[Event]:   # pylint: disable=too-many-branches
+        """
+        Parses the input into events.
+
+        :return: An iterator over the events of the document.
+        """
+        containers: List[str] = []
+        expect = 'value'
+        while True:
+            char = self.next_char()
+            if not char:
+                if expect != 'done':
+                    raise self.error('Unexpected end of input')
+                return
+            if expect == 'done':
+                raise self.error('Extra data')
+            if char == '{' and expect in ('value', 'value_or_end'):
+                self.pos += 1
+                containers.append('{')
+                expect = 'key_or_end'
+                yield START_MAP, None
+                continue
+            if char == '[' and expect in ('value', 'value_or_end'):
+                self.pos += 1
+                containers.append('[')
+                expect = 'value_or_end'
+                yield START_LIST, None
+                continue
+            if char == '}' and containers and containers[-1] == '{' and \
+                    expect in ('key_or_end', 'comma_or_end'):
+                self.pos += 1
+                containers.pop()
+                yield END_MAP, None
+            elif char == ']' and containers and containers[-1] == '[' and \
+                    expect in ('value_or_end', 'comma_or_end'):
+                self.pos += 1
+                containers.pop()
+                yield END_LIST, None
+            elif char == ',' and expect == 'comma_or_end':
+                self.pos += 1
+                expect = 'key' if containers[-1] == '{' else 'value'
+                continue
+            elif char == ':' and expect == 'colon':
+                self.pos += 1
+                expect = 'value'
+                continue
+            elif char == '"' and expect in ('key', 'key_or_end'):
+                yield SCALAR, self.read_string()
+                expect = 'colon'
+                continue
+            elif char == '"' and expect in ('value', 'value_or_end'):
+                yield SCALAR, self.read_string()
+            elif expect in ('value', 'value_or_end') and char not in '{}[],:"':
+                yield SCALAR, self.read_literal()
+            else:
+                raise self.error('Unexpected character {0!r}'.format(char))
+            expect = 'comma_or_end' if containers else 'done'
+
+
+def json_events(stream: IO[str],
+                chunk_size: int = 65536)\
+        -> Iterator[Event]:
+    """
+    Parses a JSON document into events incrementally.
+
+    :param stream: The text stream to be parsed.
+    :param chunk_size: The number of characters read at once.
+    :return: An iterator over the events of the document.
+    """
+    return JsonTokenizer(stream, chunk_size).events()
+
+
+def validate_events(root: Descriptor,
+                    events: Iterator[Event],
+                    max_nodes: Optional[int] = None)\
+        -> bool:
+    """
+    Validates a document given by its events. The events are consumed only until the first
+    violation is found.
+
+    :param root: The descriptor of the whole document.
+    :param events: The events of the document.
+    :param max_nodes: The number of document nodes after which the validation fails, None for no
+        limit, see EventValidator.
+    :return: True if the document is valid otherwise the method will throw a ValidationError.
+    """
+    validator = EventValidator(root, max_nodes)
+    for kind, value in events:
+        validator.event(kind, value)
+    return validator.finish()
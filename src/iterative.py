@@ -0,0 +1,214 @@
+"""
+This module contains the iterative validation engine. It walks the document with an explicit stack
+of frames over the same descriptors the recursive engine uses, so arbitrarily deep documents (e.g.
+long chains of a recursive type) are validated without nested Python calls. The validation errors
+are identical to the ones raised by the validate methods of the descriptors.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from descriptor import BoolDescriptor, IntDescriptor, FloatDescriptor, \
+    StringDescriptor, MapDescriptor, ListDescriptor   # pylint: disable=import-error, wrong-import-position, line-too-long
+from error import ValidationError   # pylint: disable=no-name-in-module, wrong-import-position
+
+PRIMITIVE_CHECKS: Dict[type, Tuple[type, str]] = {
+    BoolDescriptor: (bool, 'Expected type: bool'),
+    StringDescriptor: (str, 'Expected type: string'),
+    IntDescriptor: (int, 'Expected type: int'),
+    FloatDescriptor: (float, 'Expected type: float'),
+}
+
+END = object()
+MAP_FRAME = 0
+LIST_FRAME = 1
+
+# A component to be entered: its descriptor, the component and its path segment (None for the
+# document itself).
+Child = Tuple[Any, Any, Optional[str]]
+
+
+class IterativeValidator:
+    """
+    This class validates documents against a descriptor graph with an explicit work stack.
+    """
+    def __init__(self,
+                 root: MapDescriptor):
+        """
+        Constructor for the IterativeValidator class.
+
+        :param root: The descriptor of the whole document.
+        """
+        self.root = root
+        self.required: Dict[int, List[Any]] = {}
+
+    def required_items(self,
+                       descriptor: MapDescriptor)\
+            -> List[Any]:
+        """
+        Returns the names of the required items of a map descriptor.
+
+        :param descriptor: The map descriptor.
+        :return: The names of the required items in definition order.
+        """
+        required = self.required.get(id(descriptor))
+        if required is None:
+            required = [key for key in descriptor.items if descriptor.items[key].required]
+            self.required[id(descriptor)] = required
+        return required
+
+    def validate(self,
+                 doc: Any)\
+            -> bool:
+        """
+        Validates a document. Every map and list of the document gets a frame on the work stack
+        when it is reached: [kind, descriptor, component, has segment, key iterator] for maps and
+        [kind, descriptor, component, has segment, item type iterator, item iterator, item, item
+        count] for lists. The frame on the top is advanced, checking primitive values in place,
+        until it is finished or a nested map or list is reached, which is entered on a new frame.
+
+        :param doc: The document to be validated.
+        :return: True if the document is valid otherwise the method will throw a ValidationError.
+        """
+        path: List[Any] = []
+        stack: List[List[Any]] = []
+        enter = self.enter
+        advance_map = self.advance_map
+        advance_list = self.advance_list
+        child: Optional[Child] = (self.root, doc, None)
+        while True:
+            if child is not None:
+                enter(child, path, stack)
+            if not stack:
+                return True
+            frame = stack[-1]
+            if frame[0] == MAP_FRAME:
+                child = advance_map(frame, path, stack)
+            else:
+                child = advance_list(frame, path, stack)
+
+    @staticmethod
+    def enter(child: Child,
+              path: List[Any],
+              stack: List[List[Any]])\
+            -> None:
+        """
+        Starts the validation of a component: pushes the frame of a map or a list. The other
+        components, including missing maps and lists and the ones of the wrong type, are validated
+        by their descriptor, which does not recurse into them.
+
+        :param child: The descriptor, the component and the path segment of the component.
+        :param path: The path of the parent of the component.
+        :param stack: The work stack.
+        """
+        descriptor, component, segment = child
+        if segment is not None:
+            path.append(segment)
+        if isinstance(descriptor, MapDescriptor) and isinstance(component, dict):
+            stack.append([MAP_FRAME, descriptor, component, segment is not None, iter(component)])
+        elif isinstance(descriptor, ListDescriptor) and isinstance(component, list):
+            stack.append([LIST_FRAME, descriptor, component, segment is not None,
+                          None, iter(component), None, 0])
+        else:
+            descriptor.validate(component, path)
+            if segment is not None:
+                path.pop()
+
+    def advance_map(self,
+                    frame: List[Any],
+                    path: List[Any],
+                    stack: List[List[Any]])\
+            -> Optional[Child]:
+        """
+        Advances the frame of a map until one of its items is a map or a list, or the map is
+        finished and its frame is popped.
+
+        :param frame: The frame of the map.
+        :param path: The path of the map.
+        :param stack: The work stack.
+        :return: The next component to be entered or None if the map is finished.
+        """
+        parent = frame[1]
+        items = parent.items
+        values = frame[2]
+        for key in frame[4]:
+            if key not in items:
+                raise ValidationError('.'.join(path), 'Unexpected item: "{0}"'.format(key))
+            child = parent.descriptors[items[key].item_type]
+            value = values[key]
+            check = PRIMITIVE_CHECKS.get(type(child))
+            if check is None:
+                return child, value, key
+            if value is None or not isinstance(value, check[0]):
+                raise entry_error(path, key, check[1])
+        required = self.required.get(id(parent))
+        for name in required if required is not None else self.required_items(parent):
+            if name not in values:
+                raise ValidationError('.'.join(path), 'Missing required item: "{0}"'.format(name))
+        stack.pop()
+        if frame[3]:
+            path.pop()
+        return None
+
+    @staticmethod
+    def advance_list(frame: List[Any],
+                     path: List[Any],
+                     stack: List[List[Any]])\
+            -> Optional[Child]:
+        """
+        Advances the frame of a list until the value of one of its items is a map or a list, or the
+        list is finished and its frame is popped.
+
+        :param frame: The frame of the list.
+        :param path: The path of the list.
+        :param stack: The work stack.
+        :return: The next component to be entered or None if the list is finished.
+        """
+        parent = frame[1]
+        item_types = parent.item_types
+        while True:
+            if frame[4] is None:
+                item = next(frame[5], END)
+                if item is END:
+                    if parent.min_items and frame[7] < parent.min_items:
+                        raise ValidationError('.'.join(path), 'Too few list '
+                                              'items: min={0}'.format(parent.min_items))
+                    stack.pop()
+                    if frame[3]:
+                        path.pop()
+                    return None
+                if not isinstance(item, dict):
+                    raise entry_error(path, 'items[{0}]'.format(frame[7]), 'Expected type: map')
+                frame[6] = item
+                frame[4] = iter(item)
+            item = frame[6]
+            for key in frame[4]:
+                if key not in item_types:
+                    raise ValidationError('.'.join(path), 'Unexpected type: "{0}"'.format(key))
+                child = parent.descriptors[key]
+                value = item[key]
+                check = PRIMITIVE_CHECKS.get(type(child))
+                if check is None:
+                    return child, value, 'items[{0}]'.format(frame[7])
+                if value is None or not isinstance(value, check[0]):
+                    raise entry_error(path, 'items[{0}]'.format(frame[7]), check[1])
+            frame[4] = None
+            frame[7] += 1
+            if parent.max_items and frame[7] > parent.max_items:
+                raise ValidationError('.'.join(path), 'Too many list '
+                                      'items: max={0}'.format(parent.max_items))
+
+def entry_error(path: List[str],
+                segment: Optional[str],
+                msg: str)\
+        -> ValidationError:
+    """
+    Creates the ValidationError of a component that failed before getting a frame.
+
+    :param path: The path of the parent of the component.
+    :param segment: The path segment of the component or None for the document itself.
+    :param msg: The description of the error.
+    :return: The error to be raised.
+    """
+    if segment is not None:
+        path.append(segment)
+    return ValidationError('.'.join(path), msg)
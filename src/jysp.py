@@ -1,41 +1,336 @@
+import argparse
 import json
+import mmap
+import os
 import sys
 
 import yaml
 
+from descriptor import ValidationContext
+from error import ValidationError
+from loader import format_of, load_file, loader_names
+from profiler import ValidationProfiler
 from schema import Schema
+from stream import StreamRecord, iter_records, stream_format_of
 
 
-def validate(schema_name, data_name):
-    if schema_name[-4:] == '.yml':
-        schema_def = yaml.load(open(schema_name))
-    elif schema_name[-5:] == '.json':
-        schema_def = json.load(open(schema_name))
-    else:
+def non_negative_int(text):
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError('invalid int value: {0!r}'.format(text)) from None
+    if value < 0:
+        raise argparse.ArgumentTypeError('must not be negative: {0}'.format(value))
+    return value
+
+
+def load_schema(schema_name, use_cache=True, loader='auto', lazy=False):
+    if format_of(schema_name) is None:
         print('unsupported file format: {0}'.format(schema_name))
+        return None
+
+    try:
+        return Schema.from_file(schema_name, use_cache, loader=loader, lazy=lazy)
+    except Exception as e:
+        print(e)
+        return None
+
+
+def write_profile(profiler, show_report, collapsed_name):
+    if show_report:
+        print(profiler.report(), file=sys.stderr)
+    if collapsed_name is not None:
+        with open(collapsed_name, 'w') as collapsed_file:
+            collapsed_file.write(profiler.collapsed())
+
+
+def validate(schema_name, data_name, use_cache=True, profile=False, collapsed_name=None,
+             loader='auto', max_nodes=None):
+    schema = load_schema(schema_name, use_cache, loader)
+    if schema is None:
         return
 
+    data_format = format_of(data_name)
+    if data_format is None:
+        print('unsupported file format: {0}'.format(data_name))
+        return
+    data_def = load_file(data_name, loader)
+    context = None
+    if data_format == 'yaml' or max_nodes is not None:
+        context = ValidationContext(max_nodes)
+
+    profiler = None
+    if profile or collapsed_name is not None:
+        profiler = ValidationProfiler()
     try:
-        schema = Schema(schema_def)
+        schema.validate(data_def, profiler=profiler, context=context)
+        print('valid')
     except Exception as e:
         print(e)
+    if profiler is not None:
+        write_profile(profiler, profile, collapsed_name)
 
-    if data_name[-4:] == '.yml':
-        data_def = yaml.load(open(data_name))
-    elif data_name[-5:] == '.json':
-        data_def = json.load(open(data_name))
-    else:
+
+def validate_events(schema_name, data_name, use_cache=True, loader='auto', max_nodes=None):
+    schema = load_schema(schema_name, use_cache, loader)
+    if schema is None:
+        return
+
+    data_format = format_of(data_name)
+    if data_format is None:
         print('unsupported file format: {0}'.format(data_name))
         return
 
     try:
-        schema.validate(data_def)
+        with open(data_name) as data_file:
+            schema.validate_events(data_file, data_format, max_nodes)
         print('valid')
     except Exception as e:
         print(e)
 
 
+def write_record(out, record, stream_format):
+    if stream_format == 'jsonl':
+        out.write(record.raw if record.raw.endswith('\n') else record.raw + '\n')
+    else:
+        yaml.safe_dump(record.doc, out, explicit_start=True, default_flow_style=False)
+
+
+def write_dead_letter(out, record, error):
+    dead_letter = {'line': record.line, 'path': error.path, 'msg': error.msg,
+                   'record': record.raw.rstrip('\n') if record.raw is not None else record.doc}
+    out.write(json.dumps(dead_letter, default=str) + '\n')
+
+
+def validate_json_lines_parallel(schema, data_name, dead_letter, workers, loader):
+    from batch import validate_json_lines_file
+    valid_cnt = 0
+    invalid_cnt = 0
+    if os.path.getsize(data_name) == 0:
+        return valid_cnt, invalid_cnt
+    sys.stdout.flush()
+    out = sys.stdout.buffer
+    with open(data_name, 'rb') as data_file:
+        data = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        for range_start, range_end, line_cnt, failures in validate_json_lines_file(
+                schema, data_name, workers, loader):
+            position = range_start
+            for line, start, stop, error in failures:
+                out.write(data[position:start])
+                position = stop
+                if error is not None:
+                    record = StreamRecord(line, None, data[start:stop].decode('utf-8', 'replace'))
+                    write_dead_letter(dead_letter, record, error)
+                    invalid_cnt += 1
+            out.write(data[position:range_end])
+            if range_end == len(data) and position < range_end and data[range_end - 1] != 10:
+                out.write(b'\n')
+            valid_cnt += line_cnt - len(failures)
+    finally:
+        data.close()
+    out.flush()
+    return valid_cnt, invalid_cnt
+
+
+def validate_stream(schema_name, data_name, stream_format=None, dead_letter_name=None,
+                    use_cache=True, loader='auto', workers=1):
+    schema = load_schema(schema_name, use_cache, loader)
+    if schema is None:
+        return 2
+    if stream_format is None:
+        stream_format = stream_format_of(data_name)
+    if stream_format is None:
+        print('unsupported stream format: {0}'.format(data_name))
+        return 2
+
+    if stream_format == 'jsonl' and data_name != '-' and workers != 1:
+        dead_letter = sys.stderr if dead_letter_name is None else open(dead_letter_name, 'w')
+        try:
+            valid_cnt, invalid_cnt = validate_json_lines_parallel(schema, data_name, dead_letter,
+                                                                  workers, loader)
+        finally:
+            if dead_letter is not sys.stderr:
+                dead_letter.close()
+        print('{0} valid, {1} invalid'.format(valid_cnt, invalid_cnt), file=sys.stderr)
+        return 1 if invalid_cnt else 0
+
+    validate_doc = schema.compile().validate
+    data_file = sys.stdin if data_name == '-' else open(data_name)
+    dead_letter = sys.stderr if dead_letter_name is None else open(dead_letter_name, 'w')
+    valid_cnt = 0
+    invalid_cnt = 0
+    try:
+        for record in iter_records(data_file, stream_format, loader):
+            error = record.error
+            if error is None:
+                try:
+                    validate_doc(record.doc)
+                except ValidationError as e:
+                    error = e
+            if error is None:
+                write_record(sys.stdout, record, stream_format)
+                valid_cnt += 1
+            else:
+                write_dead_letter(dead_letter, record, error)
+                invalid_cnt += 1
+    except yaml.YAMLError as e:
+        print('invalid YAML stream: {0}'.format(e), file=sys.stderr)
+        return 2
+    finally:
+        if data_file is not sys.stdin:
+            data_file.close()
+        if dead_letter is not sys.stderr:
+            dead_letter.close()
+    print('{0} valid, {1} invalid'.format(valid_cnt, invalid_cnt), file=sys.stderr)
+    return 1 if invalid_cnt else 0
+
+
+def serve(argv):
+    from server import DEFAULT_HOST, DEFAULT_PORT, ValidationService, create_server, schema_name_of
+    parser = argparse.ArgumentParser(prog='jysp serve',
+                                     description='Serve validation requests over HTTP.')
+    parser.add_argument('schemas', nargs='+', metavar='schema',
+                        help='schema file (.yml or .json), served under its name without the '
+                             'extension')
+    parser.add_argument('--host', default=DEFAULT_HOST,
+                        help='address to listen on (default: {0})'.format(DEFAULT_HOST))
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help='port to listen on (default: {0})'.format(DEFAULT_PORT))
+    parser.add_argument('--socket', metavar='PATH', help='listen on a Unix socket instead')
+    parser.add_argument('--no-schema-cache', action='store_false', dest='use_cache',
+                        help='always parse and build the schemas instead of loading their cached '
+                             'snapshots')
+    parser.add_argument('--loader', choices=loader_names(), default='auto',
+                        help='parser of the schema files and request bodies (default: the fastest '
+                             'one installed)')
+    parser.add_argument('--lazy', action='store_true',
+                        help='build the types of the schemas when the requests first reach them '
+                             'instead of at startup')
+    args = parser.parse_args(argv)
+
+    schemas = {}
+    for schema_name in args.schemas:
+        name = schema_name_of(schema_name)
+        if name in schemas:
+            print('duplicate schema name: {0}'.format(name))
+            return 2
+        schemas[name] = load_schema(schema_name, args.use_cache, args.loader, args.lazy)
+        if schemas[name] is None:
+            return 2
+
+    server = create_server(ValidationService(schemas, args.loader), args.host, args.port,
+                           args.socket)
+    print('serving {0} on {1}'.format(', '.join(sorted(schemas)), server.address()),
+          file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def client(argv):
+    import http.client
+    from server import DEFAULT_HOST, DEFAULT_PORT, ValidationClient, schema_name_of
+    parser = argparse.ArgumentParser(prog='jysp client',
+                                     description='Validate a document on a jysp server.')
+    parser.add_argument('schema', help='schema name or schema file loaded by the server')
+    parser.add_argument('data', help='data file (.yml or .json)')
+    parser.add_argument('--host', default=DEFAULT_HOST,
+                        help='address of the server (default: {0})'.format(DEFAULT_HOST))
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help='port of the server (default: {0})'.format(DEFAULT_PORT))
+    parser.add_argument('--socket', metavar='PATH', help='Unix socket of the server')
+    args = parser.parse_args(argv)
+
+    data_format = format_of(args.data)
+    if data_format is None:
+        print('unsupported file format: {0}'.format(args.data))
+        return 0
+    if data_format == 'json':
+        with open(args.data, 'rb') as data_file:
+            doc = data_file.read()
+    else:
+        doc = load_file(args.data)
+
+    validation_client = ValidationClient(args.host, args.port, args.socket)
+    try:
+        error = validation_client.validate(schema_name_of(args.schema), doc)
+    except (OSError, http.client.HTTPException) as e:
+        print('cannot reach the server: {0}'.format(e), file=sys.stderr)
+        return 2
+    except ValueError as e:
+        print(e)
+        return 0
+    finally:
+        validation_client.close()
+    print('valid' if error is None else error)
+    return 0
+
+
+def main(argv):
+    if argv and argv[0] == 'serve':
+        return serve(argv[1:])
+    if argv and argv[0] == 'client':
+        return client(argv[1:])
+    parser = argparse.ArgumentParser(prog='jysp',
+                                     description='Validate documents against a schema.',
+                                     epilog='"jysp serve -h" and "jysp client -h" describe the '
+                                            'validation server and its client.')
+    parser.add_argument('schema', help='schema file (.yml or .json)')
+    parser.add_argument('data', help='data file, or - for standard input in stream mode')
+    parser.add_argument('--stream', action='store_true',
+                        help='validate a JSON Lines file or a multi-document YAML stream record by '
+                             'record, writing valid records to standard output')
+    parser.add_argument('--format', choices=['jsonl', 'yaml'], dest='stream_format',
+                        help='format of the stream, guessed from the file name by default')
+    parser.add_argument('--dead-letter', metavar='FILE',
+                        help='file receiving the invalid records in stream mode (default: stderr)')
+    parser.add_argument('--events', action='store_true',
+                        help='validate a single document while parsing it, without loading it '
+                             'into memory (duplicate keys and YAML merge keys are not supported)')
+    parser.add_argument('--no-schema-cache', action='store_false', dest='use_cache',
+                        help='always parse and build the schema instead of loading its cached '
+                             'snapshot')
+    parser.add_argument('--profile', action='store_true',
+                        help='print the validation time per schema item to standard error')
+    parser.add_argument('--profile-collapsed', metavar='FILE',
+                        help='write the validation time per stack of schema items to FILE in the '
+                             'collapsed stack format of flame graph tools')
+    parser.add_argument('--loader', choices=loader_names(), default='auto',
+                        help='parser of the schema and data files (default: the fastest one '
+                             'installed)')
+    parser.add_argument('--max-nodes', type=int, metavar='N',
+                        help='reject documents with more than N nodes, counting the subtrees '
+                             'shared by YAML aliases once (at every alias with --events)')
+    parser.add_argument('--workers', type=non_negative_int, metavar='N',
+                        help='validate a JSON Lines file in stream mode on N worker processes, '
+                             '0 for one per CPU (default: 1)')
+    args = parser.parse_args(argv)
+    if args.events:
+        ignored = [option for option, used in (('--stream', args.stream),
+                                               ('--format', args.stream_format is not None),
+                                               ('--dead-letter', args.dead_letter is not None),
+                                               ('--workers', args.workers is not None),
+                                               ('--profile', args.profile),
+                                               ('--profile-collapsed',
+                                                args.profile_collapsed is not None))
+                   if used]
+        if ignored:
+            parser.error('{0} cannot be used with --events'.format(', '.join(ignored)))
+        validate_events(args.schema, args.data, args.use_cache, args.loader, args.max_nodes)
+        return 0
+    if args.stream:
+        workers = 1 if args.workers is None else args.workers or None
+        return validate_stream(args.schema, args.data, args.stream_format, args.dead_letter,
+                               args.use_cache, args.loader, workers)
+    validate(args.schema, args.data, args.use_cache, args.profile, args.profile_collapsed,
+             args.loader, args.max_nodes)
+    return 0
+
+
 if __name__ == '__main__':
-    schema_name = sys.argv[1]
-    data_name = sys.argv[2]
-    validate(schema_name, data_name)
+    sys.exit(main(sys.argv[1:]))
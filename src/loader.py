@@ -0,0 +1,206 @@
+"""
+This module contains the loaders of schema and data files. A loader turns the content of a file into
+python objects, and the fastest safe loader available is used by default: the libyaml based
+CSafeLoader for YAML when PyYAML has been built with libyaml, and orjson or ujson for JSON when they
+are installed. Files are read in binary with a single read and decoded by the loader.
+
+The fast JSON decoders are stricter than the json module in a few corner cases (e.g. NaN and
+integers that do not fit in 64 bits), so a document they reject is decoded again with the json
+module, which accepts it or raises its usual error.
+"""
+
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import yaml
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None  # type: ignore
+
+# The fastest safe loader class of PyYAML.
+FastSafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+LOADERS: Dict[str, Tuple[str, Callable[[Union[str, bytes]], Any]]] = {}
+PREFERENCES: Dict[str, List[str]] = {'json': [], 'yaml': []}
+
+
+def register_loader(name: str,
+                    file_format: str,
+                    load: Callable[[Union[str, bytes]], Any],
+                    preferred: bool = False)\
+        -> None:
+    """
+    Registers a loader.
+
+    :param name: The name of the loader.
+    :param file_format: The format read by the loader ('json' or 'yaml').
+    :param load: The function turning the content of a file (bytes or str) into python objects.
+    :param preferred: Whether the loader is preferred to the already registered loaders of the
+        format by the automatic selection.
+    """
+    if file_format not in PREFERENCES:
+        raise ValueError('unsupported file format: {0}'.format(file_format))
+    LOADERS[name] = (file_format, load)
+    if name in PREFERENCES[file_format]:
+        PREFERENCES[file_format].remove(name)
+    if preferred:
+        PREFERENCES[file_format].insert(0, name)
+    else:
+        PREFERENCES[file_format].append(name)
+
+
+def fast_json(decode: Callable[[Union[str, bytes]], Any],
+              error: Any)\
+        -> Callable[[Union[str, bytes]], Any]:
+    """
+    Wraps a fast JSON decoder so the documents it rejects are decoded by the json module.
+
+    :param decode: The decoder function.
+    :param error: The exception type raised by the decoder.
+    :return: The wrapped decoder function.
+    """
+    def load(content: Union[str, bytes]) -> Any:
+        try:
+            return decode(content)
+        except error:
+            return json.loads(content)
+    return load
+
+
+def load_yaml(content: Union[str, bytes]) -> Any:
+    """
+    Loads YAML content with the libyaml based safe loader.
+
+    :param content: The content.
+    :return: The loaded python objects.
+    """
+    return yaml.load(content, Loader=FastSafeLoader)
+
+
+def load_pure_yaml(content: Union[str, bytes]) -> Any:
+    """
+    Loads YAML content with the pure python safe loader.
+
+    :param content: The content.
+    :return: The loaded python objects.
+    """
+    return yaml.load(content, Loader=yaml.SafeLoader)
+
+
+if orjson is not None:
+    register_loader('orjson', 'json', fast_json(orjson.loads, orjson.JSONDecodeError))
+if ujson is not None:
+    register_loader('ujson', 'json', fast_json(ujson.loads, ValueError))
+register_loader('json', 'json', json.loads)
+if FastSafeLoader is not yaml.SafeLoader:
+    register_loader('libyaml', 'yaml', load_yaml)
+register_loader('yaml', 'yaml', load_pure_yaml)
+
+
+def format_of(file_name: str) -> Optional[str]:
+    """
+    Guesses the format of a file from its name.
+
+    :param file_name: The name of the file.
+    :return: 'json', 'yaml' or None if the format is not supported.
+    """
+    if file_name.endswith('.json'):
+        return 'json'
+    if file_name.endswith(('.yml', '.yaml')):
+        return 'yaml'
+    return None
+
+
+def loader_name(file_format: str,
+                name: str = 'auto')\
+        -> str:
+    """
+    Returns the name of the loader that reads a format.
+
+    :param file_format: The format of the content ('json' or 'yaml').
+    :param name: The name of the loader, or 'auto' for the preferred loader of the format. A loader
+        of the other format stands for 'auto', so one name can be given for both schema and data
+        files.
+    :return: The name of the registered loader.
+    """
+    if file_format not in PREFERENCES:
+        raise ValueError('unsupported file format: {0}'.format(file_format))
+    if name not in LOADERS and name != 'auto':
+        raise ValueError('unknown loader: {0}'.format(name))
+    if name == 'auto' or LOADERS[name][0] != file_format:
+        name = PREFERENCES[file_format][0]
+    return name
+
+
+def get_loader(file_format: str,
+               name: str = 'auto')\
+        -> Callable[[Union[str, bytes]], Any]:
+    """
+    Returns the load function of a loader.
+
+    :param file_format: The format of the content ('json' or 'yaml').
+    :param name: The name of the loader, see loader_name.
+    :return: The load function.
+    """
+    return LOADERS[loader_name(file_format, name)][1]
+
+
+def yaml_loader_class(name: str = 'auto') -> Any:
+    """
+    Returns the PyYAML loader class of a loader, for reading YAML streams document by document.
+
+    :param name: The name of the loader, see get_loader.
+    :return: The pure python SafeLoader for the 'yaml' loader, otherwise the fastest safe loader.
+    """
+    if get_loader('yaml', name) is load_pure_yaml:
+        return yaml.SafeLoader
+    return FastSafeLoader
+
+
+def loader_names() -> List[str]:
+    """
+    Returns the names of the registered loaders.
+
+    :return: The names, starting with 'auto'.
+    """
+    return ['auto'] + sorted(LOADERS)
+
+
+def load_content(content: Union[str, bytes],
+                 file_format: str,
+                 name: str = 'auto')\
+        -> Any:
+    """
+    Loads the content of a file.
+
+    :param content: The content.
+    :param file_format: The format of the content ('json' or 'yaml').
+    :param name: The name of the loader, see get_loader.
+    :return: The loaded python objects.
+    """
+    return get_loader(file_format, name)(content)
+
+
+def load_file(file_name: str,
+              name: str = 'auto')\
+        -> Any:
+    """
+    Loads a .json, .yml or .yaml file, reading it with a single binary read.
+
+    :param file_name: The name of the file.
+    :param name: The name of the loader, see get_loader.
+    :return: The loaded python objects.
+    """
+    file_format = format_of(file_name)
+    if file_format is None:
+        raise ValueError('unsupported file format: {0}'.format(file_name))
+    with open(file_name, 'rb') as input_file:
+        content = input_file.read()
+    return load_content(content, file_format, name)
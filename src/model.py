@@ -0,0 +1,275 @@
+"""
+This module contains the materialization of documents into objects. Every map type of a schema gets
+a generated class with __slots__, one attribute per item, and a document is validated and converted
+into instances of these classes in a single traversal, so a valid document is not walked a second
+time and its dicts can be released right after loading. Lists become plain lists of their loaded
+items and primitive values are kept as they are. The validation errors are identical to the ones
+raised by the validate methods of the descriptors, only the list items with several types, which
+have no single loaded value, are rejected.
+"""
+
+import keyword
+import re
+from typing import Any, Callable, Dict, List, Set, Tuple, Type
+
+from descriptor import Descriptor, IncompleteTypeDescriptor, MapDescriptor, ListDescriptor   # pylint: disable=import-error, wrong-import-position, line-too-long
+from error import ValidationError   # pylint: disable=no-name-in-module, wrong-import-position
+from iterative import PRIMITIVE_CHECKS   # pylint: disable=import-error, wrong-import-position
+
+ROOT_CLASS_NAME = 'Document'
+RESERVED_ATTRIBUTES = ('_type_name', '_fields')
+
+Loader = Callable[[Any, List[str]], Any]
+
+
+class Model:
+    """
+    Base class of the generated classes of the map types. The class attribute _type_name holds the
+    name of the map type and _fields maps the item names to the attribute names, which are the item
+    names made valid identifiers. The attributes of absent optional items are None. The generated
+    classes only exist in the process that generated them, so their instances cannot be pickled.
+    """
+    __slots__: Tuple[str, ...] = ()
+    _type_name = ''
+    _fields: Dict[Any, str] = {}
+
+    def __init__(self, **values: Any):
+        for attribute in self.__slots__:
+            setattr(self, attribute, values.pop(attribute, None))
+        if values:
+            raise TypeError('unexpected attributes: {0}'.format(', '.join(sorted(values))))
+
+    def __eq__(self, other: Any) -> bool:
+        return type(self) is type(other) and all(
+            getattr(self, attribute) == getattr(other, attribute) for attribute in self.__slots__)
+
+    def __repr__(self) -> str:
+        return '{0}({1})'.format(type(self).__name__, ', '.join(
+            '{0}={1!r}'.format(attribute, getattr(self, attribute))
+            for attribute in self.__slots__))
+
+
+def attribute_name(name: Any,
+                   used: Set[str])\
+        -> str:
+    """
+    Returns the attribute name of a map item: the item name with the characters that are not
+    allowed in identifiers replaced by underscores, distinct from the keywords, the reserved
+    attributes of the Model class and the attribute names already used by the class.
+
+    :param name: The item name.
+    :param used: The attribute names already used by the class.
+    :return: The attribute name.
+    """
+    attribute = re.sub(r'\W', '_', str(name))
+    if not attribute.isidentifier():
+        attribute = '_' + attribute
+    if keyword.iskeyword(attribute) or attribute in RESERVED_ATTRIBUTES:
+        attribute += '_'
+    while attribute in used:
+        attribute += '_'
+    used.add(attribute)
+    return attribute
+
+
+def primitive_loader(python_type: type,
+                     msg: str)\
+        -> Loader:
+    """
+    Returns the loader of a primitive type, which checks the type of a value and keeps the value.
+
+    :param python_type: The Python type of the values.
+    :param msg: The message of the error of the other values.
+    :return: The loader function.
+    """
+    def load(component: Any, path: List[str]) -> Any:
+        if not isinstance(component, python_type):
+            raise ValidationError('.'.join(path), msg)
+        return component
+    return load
+
+
+def incomplete_loader(component: Any, path: List[str]) -> Any:   # pylint: disable=unused-argument
+    """
+    The loader of incomplete types, which are never valid.
+
+    :param component: The component to be loaded.
+    :param path: The path of the component.
+    :return: Nothing, it always raises a ValidationError.
+    """
+    raise ValidationError('.'.join(path), 'Incomplete component definition')
+
+
+class ObjectLoader:
+    """
+    This class validates documents and converts them into instances of the generated classes of the
+    map types of a schema. The loader functions of all the types are built in advance: the ones of
+    maps and lists refer to the loaders of their item types through tables filled after all the
+    loaders exist, so recursive types need no lookups by name during loading.
+    """
+    def __init__(self,
+                 root: MapDescriptor,
+                 descriptors: Dict[str, Descriptor]):
+        """
+        Constructor for the ObjectLoader class, which generates the classes and the loaders.
+
+        :param root: The descriptor of the whole document.
+        :param descriptors: The descriptors of the schema by type name.
+        """
+        self.descriptors = descriptors
+        self.classes: Dict[str, Type[Model]] = {}
+        self.models: Dict[int, Type[Model]] = {}
+        self.loaders: Dict[int, Loader] = {}
+        self.tables: List[Tuple[Descriptor, Dict[Any, Any]]] = []
+        self.add_loader('__schema__', root)
+        for type_name, descriptor in descriptors.items():
+            self.add_loader(type_name, descriptor)
+        for descriptor, table in self.tables:
+            if isinstance(descriptor, MapDescriptor):
+                for key, (attribute, _) in list(table.items()):
+                    item_type = descriptor.items[key].item_type
+                    table[key] = (attribute, self.loaders[id(descriptors[item_type])])
+            else:
+                for item_type in descriptor.item_types:   # type: ignore
+                    table[item_type] = self.loaders[id(descriptors[item_type])]
+        self.root_loader = self.loaders[id(root)]
+
+    def add_loader(self,
+                   type_name: str,
+                   descriptor: Descriptor)\
+            -> None:
+        """
+        Builds the loader of a type. Type aliases share the loader (and the class) of the
+        descriptor they refer to.
+
+        :param type_name: The name of the type.
+        :param descriptor: The descriptor of the type.
+        """
+        if id(descriptor) in self.loaders:
+            if isinstance(descriptor, MapDescriptor):
+                self.classes[type_name] = self.models[id(descriptor)]
+            return
+        if isinstance(descriptor, MapDescriptor):
+            loader = self.map_loader(type_name, descriptor)
+        elif isinstance(descriptor, ListDescriptor):
+            loader = self.list_loader(descriptor)
+        elif isinstance(descriptor, IncompleteTypeDescriptor):
+            loader = incomplete_loader
+        else:
+            loader = primitive_loader(*PRIMITIVE_CHECKS[type(descriptor)])
+        self.loaders[id(descriptor)] = loader
+
+    def map_loader(self,
+                   type_name: str,
+                   descriptor: MapDescriptor)\
+            -> Loader:
+        """
+        Generates the class of a map type and returns its loader.
+
+        :param type_name: The name of the map type.
+        :param descriptor: The descriptor of the map type.
+        :return: The loader function.
+        """
+        used: Set[str] = set()
+        fields = {key: attribute_name(key, used) for key in descriptor.items}
+        class_name = ROOT_CLASS_NAME if type_name == '__schema__' \
+            else re.sub(r'\W', '_', type_name)
+        cls: Type[Model] = type(class_name, (Model,), {'__slots__': tuple(fields.values()),
+                                                       '_type_name': type_name,
+                                                       '_fields': fields})
+        self.classes[type_name] = self.models[id(descriptor)] = cls
+        table: Dict[Any, Tuple[str, Loader]] = {key: (fields[key], incomplete_loader)
+                                                for key in fields}
+        self.tables.append((descriptor, table))
+        required = [key for key in descriptor.items if descriptor.items[key].required]
+        required_names = descriptor.required_names
+        optional = [(key, fields[key]) for key in descriptor.items
+                    if not descriptor.items[key].required]
+        new = cls.__new__
+
+        def load(component: Any, path: List[str]) -> Any:
+            if component is None:
+                if not required:
+                    return None
+                raise ValidationError('.'.join(path), 'No components found')
+            if not isinstance(component, dict):
+                raise ValidationError('.'.join(path), 'Expected type: map')
+            obj = new(cls)
+            for key in component:
+                if key not in table:
+                    raise ValidationError('.'.join(path), 'Unexpected item: "{0}"'.format(key))
+                attribute, item_loader = table[key]
+                path.append(key)
+                setattr(obj, attribute, item_loader(component[key], path))
+                path.pop()
+            if not component.keys() >= required_names:
+                for key in required:
+                    if key not in component:
+                        raise ValidationError('.'.join(path),
+                                              'Missing required item: "{0}"'.format(key))
+            for key, attribute in optional:
+                if key not in component:
+                    setattr(obj, attribute, None)
+            return obj
+        return load
+
+    def list_loader(self,
+                    descriptor: ListDescriptor)\
+            -> Loader:
+        """
+        Returns the loader of a list type, which returns the list of the loaded items. An item is
+        loaded as the value of its single type, so the items with several types, which validate
+        accepts, cannot be loaded and fail after the checks of validate.
+
+        :param descriptor: The descriptor of the list type.
+        :return: The loader function.
+        """
+        table: Dict[str, Loader] = {}
+        self.tables.append((descriptor, table))
+        item_types = descriptor.item_types
+        min_items = descriptor.min_items
+        max_items = descriptor.max_items
+
+        def load(component: Any, path: List[str]) -> Any:
+            if component is None:
+                if not min_items:
+                    return None
+                raise ValidationError('.'.join(path), 'Too few list '
+                                                      'items: min={0}'.format(min_items))
+            if not isinstance(component, list):
+                raise ValidationError('.'.join(path), 'Expected type: list')
+            result: List[Any] = []
+            append = result.append
+            item_cnt = 0
+            for item in component:
+                if not isinstance(item, dict) or len(item) != 1:
+                    descriptor.validate_item(item, item_cnt, path)
+                    path.append('items[{0}]'.format(item_cnt))
+                    raise ValidationError('.'.join(path), 'Expected a single type: '
+                                          'found={0}'.format(len(item)))
+                for key in item:
+                    if key not in item_types:
+                        raise ValidationError('.'.join(path), 'Unexpected type: "{0}"'.format(key))
+                    path.append('items[{0}]'.format(item_cnt))
+                    append(table[key](item[key], path))
+                    path.pop()
+                item_cnt += 1
+                if max_items and item_cnt > max_items:
+                    raise ValidationError('.'.join(path), 'Too many list '
+                                          'items: max={0}'.format(max_items))
+            if min_items and item_cnt < min_items:
+                raise ValidationError('.'.join(path), 'Too few list '
+                                      'items: min={0}'.format(min_items))
+            return result
+        return load
+
+    def load(self, doc: Any) -> Any:
+        """
+        Validates a document and converts it into objects.
+
+        :param doc: The document.
+        :return: The instance of the class of the whole document (Document), or None for an empty
+            document of a schema without required components. Raises a ValidationError if the
+            document is invalid.
+        """
+        return self.root_loader(doc, [])
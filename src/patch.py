@@ -0,0 +1,431 @@
+"""
+This module contains the incremental revalidation of documents edited by JSON Patches (RFC 6902).
+The patch is applied to a valid document in place and every operation records what it touched: the
+values it added or replaced, the map items it removed and the lists whose length it changed. After
+the patch only the touched values are validated against their descriptors, and the constraints of
+their containers (unexpected and missing map items, list item types and lengths) are checked, so the
+cost is proportional to the patch and the depth of the edits, not to the size of the document.
+
+The operations are applied one after the other, so a later operation can move the targets of the
+earlier ones: the recorded pointers are shifted when list items are inserted or removed before them
+and dropped when a later operation replaces or removes a value containing them. Every change is
+also recorded in an undo log, so a patch that cannot be applied leaves the document unchanged.
+"""
+
+import copy
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from descriptor import ListDescriptor, MapDescriptor   # pylint: disable=import-error, wrong-import-position
+from error import ValidationError   # pylint: disable=no-name-in-module, wrong-import-position
+
+# The kinds of the touched places: a value to be validated, a map item that was removed and a list
+# whose length changed.
+VALUE = 'value'
+REMOVED = 'removed'
+LENGTH = 'length'
+
+Touched = Tuple[str, List[Any]]
+Undo = List[Callable[[], Any]]
+
+
+class UnexpectedStructure(Exception):
+    """
+    Raised when a touched place cannot be matched with the descriptors, in which case the whole
+    document is validated.
+    """
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    """
+    Splits a JSON Pointer (RFC 6901) into its reference tokens.
+
+    :param pointer: The pointer, e.g. '/library/0/book'.
+    :return: The unescaped tokens, empty for the whole document.
+    """
+    if pointer == '':
+        return []
+    if not pointer.startswith('/'):
+        raise ValueError('Invalid JSON pointer: "{0}"'.format(pointer))
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer[1:].split('/')]
+
+
+def list_index(container: List[Any],
+               token: str,
+               insert: bool = False)\
+        -> int:
+    """
+    Converts a reference token to an index of a list.
+
+    :param container: The list.
+    :param token: The token.
+    :param insert: Whether the index is an insert position, which may be the length of the list
+        or '-' for appending.
+    :return: The index.
+    """
+    if insert and token == '-':
+        return len(container)
+    if not token.isdigit() or (token.startswith('0') and token != '0'):
+        raise ValueError('Invalid list index: "{0}"'.format(token))
+    index = int(token)
+    if index > len(container) or (index == len(container) and not insert):
+        raise ValueError('List index out of range: {0}'.format(index))
+    return index
+
+
+def resolve(doc: Any,
+            tokens: List[str])\
+        -> Any:
+    """
+    Returns the value a pointer refers to.
+
+    :param doc: The document.
+    :param tokens: The tokens of the pointer.
+    :return: The value.
+    """
+    value = doc
+    for token in tokens:
+        if isinstance(value, dict):
+            if token not in value:
+                raise ValueError('Missing map item: "{0}"'.format(token))
+            value = value[token]
+        elif isinstance(value, list):
+            value = value[list_index(value, token)]
+        else:
+            raise ValueError('Not a container: "{0}"'.format(token))
+    return value
+
+
+def set_item(container: Dict[str, Any],
+             key: str,
+             value: Any,
+             undo: Undo)\
+        -> None:
+    """
+    Sets an item of a map and records how to restore its previous state.
+
+    :param container: The map.
+    :param key: The key of the item.
+    :param value: The new value of the item.
+    :param undo: The undo log.
+    """
+    if key in container:
+        undo.append(partial(container.__setitem__, key, container[key]))
+    else:
+        undo.append(partial(container.__delitem__, key))
+    container[key] = value
+
+
+def is_prefix(prefix: List[Any],
+              tokens: List[Any])\
+        -> bool:
+    """
+    Decides whether a pointer starts with another one.
+
+    :param prefix: The tokens of the shorter pointer.
+    :param tokens: The tokens of the longer pointer.
+    :return: True if the tokens start with the prefix (or are equal to it).
+    """
+    return len(prefix) <= len(tokens) and tokens[:len(prefix)] == prefix
+
+
+class IncrementalValidator:
+    """
+    This class applies JSON Patches to valid documents and validates the touched parts of the
+    results.
+    """
+    def __init__(self,
+                 root: MapDescriptor):
+        """
+        Constructor for the IncrementalValidator class.
+
+        :param root: The descriptor of the documents.
+        """
+        self.root = root
+
+    @staticmethod
+    def shift(touched: List[Touched],
+              parent: List[Any],
+              index: int,
+              delta: int)\
+            -> None:
+        """
+        Shifts the recorded pointers into a list after an item was inserted or removed.
+
+        :param touched: The recorded places.
+        :param parent: The tokens of the list.
+        :param index: The position of the inserted or removed item.
+        :param delta: 1 for insertion, -1 for removal.
+        """
+        depth = len(parent)
+        for _, tokens in touched:
+            if len(tokens) > depth and tokens[:depth] == parent and tokens[depth].isdigit() \
+                    and int(tokens[depth]) >= index:
+                tokens[depth] = str(int(tokens[depth]) + delta)
+
+    @staticmethod
+    def drop(touched: List[Touched],
+             tokens: List[Any])\
+            -> List[Touched]:
+        """
+        Drops the recorded places inside a value that has been removed or replaced.
+
+        :param touched: The recorded places.
+        :param tokens: The tokens of the value.
+        :return: The remaining places.
+        """
+        return [(kind, place) for kind, place in touched if not is_prefix(tokens, place)]
+
+    def add(self,
+            doc: Any,
+            tokens: List[str],
+            value: Any,
+            touched: List[Touched],
+            undo: Undo)\
+            -> Tuple[Any, List[Touched]]:
+        """
+        Applies an add operation.
+
+        :param doc: The document.
+        :param tokens: The tokens of the target.
+        :param value: The added value.
+        :param touched: The recorded places.
+        :param undo: The undo log.
+        :return: The document (a new one if the whole document was replaced) and the recorded
+            places.
+        """
+        if not tokens:
+            return value, [(VALUE, [])]
+        parent = resolve(doc, tokens[:-1])
+        if isinstance(parent, list):
+            index = list_index(parent, tokens[-1], insert=True)
+            parent.insert(index, value)
+            undo.append(partial(parent.pop, index))
+            target = tokens[:-1] + [str(index)]
+            self.shift(touched, tokens[:-1], index, 1)
+            touched.append((LENGTH, tokens[:-1]))
+        elif isinstance(parent, dict):
+            set_item(parent, tokens[-1], value, undo)
+            target = list(tokens)
+            touched = self.drop(touched, target)
+        else:
+            raise ValueError('Not a container: "{0}"'.format(tokens[-2] if len(tokens) > 1 else ''))
+        touched.append((VALUE, target))
+        return doc, touched
+
+    def remove(self,
+               doc: Any,
+               tokens: List[str],
+               touched: List[Touched],
+               undo: Undo)\
+            -> Tuple[Any, List[Touched]]:
+        """
+        Applies a remove operation.
+
+        :param doc: The document.
+        :param tokens: The tokens of the target.
+        :param touched: The recorded places.
+        :param undo: The undo log.
+        :return: The value that was removed and the recorded places.
+        """
+        if not tokens:
+            raise ValueError('The whole document cannot be removed')
+        parent = resolve(doc, tokens[:-1])
+        if isinstance(parent, list):
+            index = list_index(parent, tokens[-1])
+            value = parent.pop(index)
+            undo.append(partial(parent.insert, index, value))
+            touched = self.drop(touched, tokens[:-1] + [str(index)])
+            self.shift(touched, tokens[:-1], index, -1)
+            touched.append((LENGTH, tokens[:-1]))
+        elif isinstance(parent, dict):
+            if tokens[-1] not in parent:
+                raise ValueError('Missing map item: "{0}"'.format(tokens[-1]))
+            value = parent.pop(tokens[-1])
+            undo.append(partial(parent.__setitem__, tokens[-1], value))
+            touched = self.drop(touched, tokens)
+            touched.append((REMOVED, list(tokens)))
+        else:
+            raise ValueError('Not a container: "{0}"'.format(tokens[-2] if len(tokens) > 1 else ''))
+        return value, touched
+
+    def apply(self,   # pylint: disable=too-many-return-statements
+              doc: Any,
+              operation: Dict[str, Any],
+              touched: List[Touched],
+              undo: Undo)\
+            -> Tuple[Any, List[Touched]]:
+        """
+        Applies an operation of a patch.
+
+        :param doc: The document.
+        :param operation: The operation.
+        :param touched: The recorded places.
+        :param undo: The undo log.
+        :return: The document (a new one if the whole document was replaced) and the recorded
+            places.
+        """
+        op = operation.get('op')
+        tokens = parse_pointer(operation.get('path', ''))
+        if op == 'add':
+            return self.add(doc, tokens, operation['value'], touched, undo)
+        if op == 'remove':
+            return doc, self.remove(doc, tokens, touched, undo)[1]
+        if op == 'replace':
+            resolve(doc, tokens)
+            if not tokens:
+                return operation['value'], [(VALUE, [])]
+            parent = resolve(doc, tokens[:-1])
+            if isinstance(parent, list):
+                index = list_index(parent, tokens[-1])
+                tokens[-1] = str(index)
+                undo.append(partial(parent.__setitem__, index, parent[index]))
+                parent[index] = operation['value']
+            else:
+                set_item(parent, tokens[-1], operation['value'], undo)
+            touched = self.drop(touched, tokens)
+            touched.append((VALUE, tokens))
+            return doc, touched
+        if op == 'move':
+            source = parse_pointer(operation['from'])
+            if source == tokens:
+                return doc, touched
+            if is_prefix(source, tokens):
+                raise ValueError('A value cannot be moved into itself')
+            value, touched = self.remove(doc, source, touched, undo)
+            return self.add(doc, tokens, value, touched, undo)
+        if op == 'copy':
+            value = copy.deepcopy(resolve(doc, parse_pointer(operation['from'])))
+            return self.add(doc, tokens, value, touched, undo)
+        if op == 'test':
+            if resolve(doc, tokens) != operation['value']:
+                raise ValueError('Test failed: "{0}"'.format(operation.get('path', '')))
+            return doc, touched
+        raise ValueError('Unknown patch operation: {0}'.format(op))
+
+    def locate(self,
+               doc: Any,
+               tokens: List[str],
+               to_node: bool = False)\
+            -> Tuple[Any, Any, List[str], Optional[str]]:
+        """
+        Finds the descriptor of a touched place. Below a list the pointer passes the index of the
+        item and the key naming its type, and a place inside a list item that is not deeper than
+        its type key stands for the whole item. Raises UnexpectedStructure if the document does
+        not have the structure of the descriptors along the pointer.
+
+        :param doc: The document.
+        :param tokens: The tokens of the place.
+        :param to_node: Whether the value at the place itself is located, instead of its container.
+        :return: The descriptor, the component and the path of the container of the place (or of
+            the place itself) and the last token, None if the place itself was located.
+        """
+        descriptor: Any = self.root
+        component = doc
+        path: List[str] = []
+        position = 0
+        while position < len(tokens):
+            remaining = len(tokens) - position
+            token = tokens[position]
+            if isinstance(descriptor, ListDescriptor) and isinstance(component, list):
+                if not to_node and remaining <= 2:
+                    return descriptor, component, path, token
+                index = int(token)
+                if remaining == 1 or tokens[position + 1] not in descriptor.item_types:
+                    raise UnexpectedStructure()
+                item = component[index]
+                if not isinstance(item, dict) or tokens[position + 1] not in item:
+                    raise UnexpectedStructure()
+                descriptor = descriptor.descriptors[tokens[position + 1]]
+                component = item[tokens[position + 1]]
+                path = path + ['items[{0}]'.format(index)]
+                position += 2
+            elif isinstance(descriptor, MapDescriptor) and isinstance(component, dict):
+                if not to_node and remaining == 1:
+                    return descriptor, component, path, token
+                if token not in descriptor.items or token not in component:
+                    raise UnexpectedStructure()
+                descriptor = descriptor.descriptors[descriptor.items[token].item_type]
+                component = component[token]
+                path = path + [token]
+                position += 1
+            else:
+                raise UnexpectedStructure()
+        return descriptor, component, path, None
+
+    def check(self,
+              doc: Any,
+              kind: str,
+              tokens: List[str])\
+            -> None:
+        """
+        Validates a touched place of the patched document.
+
+        :param doc: The document.
+        :param kind: The kind of the place.
+        :param tokens: The tokens of the place.
+        """
+        if kind == LENGTH:
+            descriptor, component, path, _ = self.locate(doc, tokens, to_node=True)
+            if not isinstance(descriptor, ListDescriptor) or not isinstance(component, list):
+                raise UnexpectedStructure()
+            if descriptor.max_items and len(component) > descriptor.max_items:
+                raise ValidationError('.'.join(path), 'Too many list '
+                                      'items: max={0}'.format(descriptor.max_items))
+            if descriptor.min_items and len(component) < descriptor.min_items:
+                raise ValidationError('.'.join(path), 'Too few list '
+                                      'items: min={0}'.format(descriptor.min_items))
+            return
+        if not tokens:
+            self.root.validate(doc, [])
+            return
+        descriptor, component, path, token = self.locate(doc, tokens)
+        if isinstance(descriptor, ListDescriptor):
+            if kind == VALUE:
+                index = int(token)   # type: ignore
+                if index >= len(component):
+                    raise UnexpectedStructure()
+                descriptor.validate_item(component[index], index, path)
+            return
+        if kind == REMOVED:
+            item = descriptor.items.get(token)
+            if token not in component and item is not None and item.required:
+                raise ValidationError('.'.join(path), 'Missing required item: "{0}"'.format(token))
+            return
+        if token not in descriptor.items:
+            raise ValidationError('.'.join(path), 'Unexpected item: "{0}"'.format(token))
+        if token not in component:
+            raise UnexpectedStructure()
+        path.append(token)   # type: ignore
+        descriptor.descriptors[descriptor.items[token].item_type].validate(component[token], path)
+
+    def revalidate(self,
+                   doc: Any,
+                   patch: List[Dict[str, Any]])\
+            -> Any:
+        """
+        Applies a JSON Patch to a valid document in place and validates the result.
+
+        :param doc: The document, which must be valid before the patch.
+        :param patch: The operations of the patch.
+        :return: The patched document, which is a new object if the patch replaced the whole
+            document. Raises a ValidationError if it is invalid, and a ValueError if the patch
+            cannot be applied, in which case the operations already applied are undone and the
+            document is left unchanged.
+        """
+        touched: List[Touched] = []
+        undo: Undo = []
+        patched = doc
+        try:
+            for operation in patch:
+                patched, touched = self.apply(patched, operation, touched, undo)
+        except BaseException:
+            for restore in reversed(undo):
+                restore()
+            raise
+        try:
+            for kind, tokens in touched:
+                self.check(patched, kind, tokens)
+        except UnexpectedStructure:
+            self.root.validate(patched, [])
+        return patched
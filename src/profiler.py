@@ -0,0 +1,230 @@
+"""
+This module contains the validation profiler, which attributes the validation time of a document to
+the items of the schema types (e.g. book.year or library.items[*].book) instead of to the
+descriptor methods. A profiled document is validated with shallow copies of the map and list
+descriptors that find their item descriptors among profiling proxies, so the schema itself is never
+modified: validation without a profiler runs the descriptors unchanged, also in other threads while
+profiling.
+"""
+
+import copy
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from descriptor import Descriptor, ListDescriptor, MapDescriptor, ValidationContext   # pylint: disable=import-error, wrong-import-position
+
+ROOT_LABEL = '(document)'
+
+
+class ProfileEntry:  # pylint: disable=too-few-public-methods
+    """
+    The statistics of one item of a schema type.
+    """
+    __slots__ = ('type_name', 'calls', 'nodes', 'total', 'self_time')
+
+    def __init__(self,
+                 type_name: str):
+        self.type_name = type_name
+        self.calls = 0
+        self.nodes = 0
+        self.total = 0.0
+        self.self_time = 0.0
+
+
+class ProfiledDescriptor(Descriptor):
+    """
+    Proxy descriptor that measures the validation of the components of a named type.
+    """
+    def __init__(self,
+                 type_name: str,
+                 descriptor: Descriptor,
+                 profiler: 'ValidationProfiler'):
+        """
+        Constructor for the ProfiledDescriptor class.
+
+        :param type_name: The name the descriptor is registered with in the schema.
+        :param descriptor: The profiled descriptor.
+        :param profiler: The profiler receiving the measurements.
+        """
+        self.type_name = type_name
+        self.descriptor = descriptor
+        self.profiler = profiler
+
+    def validate(self,
+                 component: Any,
+                 path: List[str],
+                 context: Optional[ValidationContext] = None)\
+            -> bool:
+        """
+        Validates the component with the profiled descriptor and records the elapsed time.
+
+        :param component: The component to be validated.
+        :param path: The path of the component to be validated.
+        :param context: The state of the validation of the document, see ValidationContext.
+        :return: True if the component is valid otherwise the method will throw a ValidationError.
+        """
+        profiler = self.profiler
+        profiler.enter(self.type_name, path[-1] if path else None)
+        try:
+            return self.descriptor.validate(component, path, context)  # type: ignore
+        finally:
+            profiler.exit()
+
+
+class ValidationProfiler:
+    """
+    This class collects the time, the number of calls and the number of visited document nodes per
+    item of a schema type, labeled with the name of the type containing the item and the item name
+    (book.year, library.items[*].book), so the components of a recursive type share their labels
+    however deep they are nested. The items of the document itself are labeled with their names. The
+    self time is also collected per stack of item names for flame graphs. A profiler can be
+    used for several documents, the measurements are accumulated. A profiler collects the
+    measurements of one document at a time, so it must not be shared by threads, while the profiled
+    schema can be.
+    """
+    def __init__(self,
+                 clock: Any = time.perf_counter):
+        """
+        Constructor for the ValidationProfiler class.
+
+        :param clock: The function returning the current time in seconds.
+        """
+        self.clock = clock
+        self.entries: Dict[str, ProfileEntry] = {}
+        self.stacks: Dict[str, float] = {}
+        self.frames: List[List[Any]] = []
+        self.labels: Dict[Tuple[str, Any, str], Tuple[str, str]] = {}
+
+    def profile(self,
+                schema: Any,
+                doc: Any,
+                context: Optional[ValidationContext] = None)\
+            -> bool:
+        """
+        Validates a document with the recursive engine of a schema, profiling the validation.
+
+        :param schema: The Schema instance.
+        :param doc: The document to be validated.
+        :param context: The state of the validation of the document, see ValidationContext.
+        :return: True if the document is valid otherwise the method will throw a ValidationError.
+        """
+        proxies: Dict[str, Descriptor] = {}
+        copies: Dict[int, Descriptor] = {}
+        for name, descriptor in schema.descriptors.items():
+            if id(descriptor) not in copies:
+                copies[id(descriptor)] = self.detached(descriptor, proxies)
+            proxies[name] = ProfiledDescriptor(name, copies[id(descriptor)], self)
+        if context is not None and context.sampling:
+            for original, clone in copies.items():
+                if original in context.sampling:
+                    context.sampling[id(clone)] = context.sampling[original]
+        self.frames = [[ROOT_LABEL, ROOT_LABEL, 0.0, 0.0, 0, None]]
+        root = ProfiledDescriptor('__schema__', self.detached(schema.schema, proxies), self)
+        try:
+            return root.validate(doc, [], context)
+        finally:
+            self.frames = []
+
+    @staticmethod
+    def detached(descriptor: Descriptor,
+                 proxies: Dict[str, Descriptor])\
+            -> Descriptor:
+        """
+        Returns a descriptor that validates like a descriptor of the schema but finds its item
+        descriptors among the profiling proxies: a shallow copy of a map or list descriptor, or the
+        descriptor itself for the others, which have no item descriptors.
+
+        :param descriptor: The descriptor of the schema.
+        :param proxies: The profiling proxies by type name.
+        :return: The detached descriptor.
+        """
+        if not isinstance(descriptor, (MapDescriptor, ListDescriptor)):
+            return descriptor
+        clone = copy.copy(descriptor)
+        clone.descriptors = proxies
+        return clone
+
+    def enter(self,
+              type_name: str,
+              segment: Any)\
+            -> None:
+        """
+        Starts measuring a component.
+
+        :param type_name: The name of the type of the component.
+        :param segment: The last segment of the path of the component or None for the document.
+        """
+        parent = self.frames[-1]
+        if isinstance(segment, str) and segment.startswith('items['):
+            segment = 'items[*]'
+        key = (parent[1], segment, type_name)
+        names = self.labels.get(key)
+        if names is None:
+            if segment is None:
+                names = (ROOT_LABEL, ROOT_LABEL)
+            else:
+                name = str(segment)
+                if name == 'items[*]':
+                    name = 'items[*].' + type_name
+                label = name if parent[5] == '__schema__' else parent[5] + '.' + name
+                names = (label, parent[1] + ';' + name.replace(';', '_').replace(' ', '_'))
+            self.labels[key] = names
+        self.frames.append([names[0], names[1], self.clock(), 0.0, 0, type_name])
+
+    def exit(self) -> None:
+        """
+        Finishes measuring the current component.
+        """
+        label, stack, start, child_time, child_nodes, type_name = self.frames.pop()
+        elapsed = self.clock() - start
+        parent = self.frames[-1]
+        parent[3] += elapsed
+        parent[4] += child_nodes + 1
+        entry = self.entries.get(label)
+        if entry is None:
+            entry = self.entries[label] = ProfileEntry(type_name)
+        entry.calls += 1
+        entry.nodes += child_nodes + 1
+        entry.total += elapsed
+        entry.self_time += elapsed - child_time
+        self.stacks[stack] = self.stacks.get(stack, 0.0) + elapsed - child_time
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the measurements per item of the schema types.
+
+        :return: A dict from the item labels to dicts with the type name, the number of calls, the
+            number of visited nodes in the subtrees and the total and self time in seconds.
+        """
+        return {label: {'type': entry.type_name, 'calls': entry.calls, 'nodes': entry.nodes,
+                        'total': entry.total, 'self': entry.self_time}
+                for label, entry in self.entries.items()}
+
+    def report(self,
+               limit: int = 20)\
+            -> str:
+        """
+        Returns a table of the items of the schema types with the largest self time.
+
+        :param limit: The maximum number of rows.
+        :return: The report as text.
+        """
+        lines = ['{0:>10} {1:>10} {2:>10} {3:>10}  {4} ({5})'.format(
+            'self ms', 'total ms', 'calls', 'nodes', 'item', 'type')]
+        entries = sorted(self.entries.items(), key=lambda pair: pair[1].self_time, reverse=True)
+        for label, entry in entries[:limit]:
+            lines.append('{0:>10.3f} {1:>10.3f} {2:>10} {3:>10}  {4} ({5})'.format(
+                entry.self_time * 1000, entry.total * 1000, entry.calls, entry.nodes, label,
+                entry.type_name))
+        return '\n'.join(lines)
+
+    def collapsed(self) -> str:
+        """
+        Returns the self time per stack of item names in the collapsed stack format of flame graph
+        tools: one line per stack with the frames separated by semicolons and the time in
+        microseconds.
+
+        :return: The collapsed stacks as text.
+        """
+        return ''.join('{0} {1}\n'.format(stack, int(round(self_time * 1e6)))
+                       for stack, self_time in sorted(self.stacks.items()))
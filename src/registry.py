@@ -0,0 +1,147 @@
+"""
+This module contains the schema registry, an in-process cache that shares built Schema instances
+between the users of the same schema definition. Schema definitions are canonicalized and hashed, so
+definitions that differ only in formatting or in the order of the attributes of a component share
+one Schema. The least recently used schemas are evicted when the registry grows beyond its bounds.
+"""
+
+import hashlib
+import json
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from schema import Schema   # pylint: disable=import-error, wrong-import-position
+
+
+def canonical_definition(value: Any,
+                         top_level: bool = True)\
+        -> Any:
+    """
+    Returns the canonical form of a schema definition. The order of the named types and of the
+    items of maps is kept because it determines the order of the validation errors, while the
+    attributes of the components (type, required, items, ...) are sorted.
+
+    :param value: The schema definition or a part of it.
+    :param top_level: True if the value is the whole schema definition.
+    :return: The canonical form of the value, made of lists and scalars.
+    """
+    if isinstance(value, dict):
+        if top_level:
+            return [[name, canonical_definition(value[name], False)] for name in value]
+        return sorted([[str(key), canonical_definition(value[key], False)] for key in value],
+                      key=lambda pair: pair[0])
+    if isinstance(value, list):
+        return [canonical_definition(item, isinstance(item, dict) and len(item) == 1)
+                for item in value]
+    return value
+
+
+def definition_key(schema_def: Any) -> str:
+    """
+    Computes the content hash of a schema definition.
+
+    :param schema_def: The schema definition.
+    :return: The hex digest identifying the schema definition.
+    """
+    canonical = json.dumps(canonical_definition(schema_def), separators=(',', ':'), default=repr)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class SchemaRegistry:   # pylint: disable=too-many-instance-attributes
+    """
+    This class is a thread-safe LRU cache of built schemas keyed by the content hash of their
+    definitions.
+    """
+    def __init__(self,
+                 max_entries: int = 128,
+                 max_bytes: Optional[int] = None):
+        """
+        Constructor for the SchemaRegistry class.
+
+        :param max_entries: The maximum number of schemas kept in the registry.
+        :param max_bytes: The maximum total size of the kept schemas, measured as the size of their
+            pickled descriptor graphs. No size bound is applied if it is None.
+        """
+        if max_entries < 1:
+            raise ValueError('The registry must be able to hold at least one schema')
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries: 'OrderedDict[str, Tuple[Schema, int]]' = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self,
+            schema_def: Dict[str, Any])\
+            -> Schema:
+        """
+        Returns the shared Schema of a schema definition, building it on a miss. Building happens
+        outside the lock, so a slow build does not block the lookups of other threads.
+
+        :param schema_def: The schema definition.
+        :return: The Schema instance of the definition.
+        """
+        key = definition_key(schema_def)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        schema = Schema(schema_def)
+        size = len(pickle.dumps(schema, pickle.HIGHEST_PROTOCOL)) if self.max_bytes else 0
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                return entry[0]
+            self.entries[key] = (schema, size)
+            self.total_bytes += size
+            self.evict(key)
+        return schema
+
+    def evict(self,
+              keep: str)\
+            -> None:
+        """
+        Evicts the least recently used schemas until the registry is within its bounds. The lock
+        must be held by the caller.
+
+        :param keep: The key of the schema that has just been added and must not be evicted.
+        """
+        while len(self.entries) > 1 and (
+                len(self.entries) > self.max_entries or
+                (self.max_bytes is not None and self.total_bytes > self.max_bytes)):
+            key = next(iter(self.entries))
+            if key == keep:
+                break
+            _, size = self.entries.pop(key)
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Removes every schema from the registry. The counters are kept.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the counters of the registry.
+
+        :return: A dict with the number of hits, misses, evictions, kept schemas and their size.
+        """
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'entries': len(self.entries), 'bytes': self.total_bytes}
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.entries)
@@ -4,24 +4,47 @@ methods for loading, processing and validating the documents agains the schema.
 schema processing relies upon the lower-level descriptor classes defined in the descriptors module.
 """
 
-from typing import Any, Dict, List, Tuple, Optional
+import gc
+import sys
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, IO, Iterable, Iterator, List,\
+    Tuple, Type, Optional, Union, TYPE_CHECKING
 
+from compiler import CompiledSchema, compile_schema  # pylint: disable=import-error, wrong-import-position
 from descriptor import Descriptor, IncompleteTypeDescriptor, BoolDescriptor, IntDescriptor,\
-    FloatDescriptor, StringDescriptor, MapItem, MapDescriptor, ListDescriptor   # pylint: disable=import-error, wrong-import-position, line-too-long
-from error import SchemaError   # pylint: disable=no-name-in-module, wrong-import-position
+    FloatDescriptor, StringDescriptor, LazyDescriptors, MapItem, MapDescriptor, ListDescriptor,\
+    SamplingPolicy, ValidationContext   # pylint: disable=import-error, wrong-import-position, line-too-long
+from error import ErrorCollector, ErrorLimitReached, ErrorPath, SchemaError, ValidationError   # pylint: disable=no-name-in-module, wrong-import-position
+from events import json_events, validate_events, yaml_events  # pylint: disable=import-error, wrong-import-position
+from loader import format_of, load_content, loader_name  # pylint: disable=import-error, wrong-import-position
+from model import Model, ObjectLoader  # pylint: disable=import-error, wrong-import-position
+from patch import IncrementalValidator  # pylint: disable=import-error, wrong-import-position
+from iterative import IterativeValidator  # pylint: disable=import-error, wrong-import-position
+from profiler import ValidationProfiler  # pylint: disable=import-error, wrong-import-position
+from snapshot import read_snapshot, snapshot_key, write_snapshot  # pylint: disable=import-error, wrong-import-position
+
+if TYPE_CHECKING:
+    from aio import AsyncValidator  # pylint: disable=import-error, wrong-import-position
 
 
 class Schema:
     """
     This class represents the schema of the json/yaml documents and is capable of loading, storing
     and validating schemas according to a schema definition.
+
+    The modules of the columnar, parallel and asyncio validation (and the libraries they use) are
+    imported when they are first used, so they do not slow down the startup of the command line.
     """
     def __init__(self,
-                 schema_def: Dict[str, Dict]):
+                 schema_def: Dict[str, Dict],
+                 lazy: bool = False):
         """
         Constructor for the Schema class which takes a schema definition and stores
 
         :param schema_def: The definition of a schema as a dict.
+        :param lazy: Whether the types of the schema are built the first time the validation
+            reaches them instead of in advance. Only the type and required attributes of the
+            top-level components are checked here, the errors of the rest of the definition of a
+            type are raised as SchemaErrors when it is built or by Schema.check.
         """
         self.schema_def: Dict[str, Any] = {}
         self.schema_def['type'] = 'map'
@@ -35,13 +58,75 @@ class Schema:
             raise SchemaError('', 'No component definitions found')
         for name in schema_def:
             self.schema_def['items'].append({name: schema_def[name]})
+        self.definitions: Dict[str, Any] = dict(schema_def)
         self.primitive_types = ['bool', 'string', 'int', 'float']
-        self.descriptors: Dict[str, Descriptor] = {}
+        self.lazy = lazy
+        self.descriptors: Dict[str, Descriptor] = LazyDescriptors(self.build_descriptor) if lazy\
+            else {}
         self.descriptors['bool'] = BoolDescriptor()
         self.descriptors['string'] = StringDescriptor()
         self.descriptors['int'] = IntDescriptor()
         self.descriptors['float'] = FloatDescriptor()
+        self.map_items: Dict[Tuple[Any, str, bool], MapItem] = {}
         self.schema = self.create_map_descriptor('__schema__', self.schema_def, [])
+        self.compiled: Optional[CompiledSchema] = None
+        self.iterative: Optional[IterativeValidator] = None
+        self.async_validator: Optional['AsyncValidator'] = None
+        self.object_loader: Optional[ObjectLoader] = None
+
+    @classmethod
+    def from_file(cls,
+                  file_name: str,
+                  use_cache: bool = True,
+                  cache_dir: Optional[str] = None,
+                  loader: str = 'auto',
+                  lazy: bool = False)\
+            -> 'Schema':
+        """
+        This method loads a schema from a .yml or .json schema definition file. Built schemas are
+        cached on disk, keyed by the content of the file, its loader and the version of jysp, so a
+        schema file is parsed and built only once. Lazy schemas are not cached, since loading the snapshot of a
+        schema loads all of its types.
+
+        :param file_name: The name of the schema definition file.
+        :param use_cache: Whether the schema snapshot cache is used.
+        :param cache_dir: The cache directory, defaults to the one returned by
+            snapshot.cache_directory.
+        :param loader: The name of the loader of the file, see loader.get_loader.
+        :param lazy: Whether the types of the schema are built on demand, see Schema.__init__.
+        :return: The Schema instance.
+        """
+        file_format = format_of(file_name)
+        if file_format is None:
+            raise ValueError('unsupported file format: {0}'.format(file_name))
+        with open(file_name, 'rb') as schema_file:
+            content = schema_file.read()
+        if lazy:
+            return cls(load_content(content, file_format, loader), lazy=True)
+        key = snapshot_key(content, loader_name(file_format, loader))
+        if use_cache:
+            schema = read_snapshot(key, cache_dir)
+            if isinstance(schema, cls):
+                return schema
+        schema = cls(load_content(content, file_format, loader))
+        if use_cache:
+            write_snapshot(key, schema, cache_dir)
+        return schema
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state['compiled'] = None
+        state['iterative'] = None
+        state['async_validator'] = None
+        state['object_loader'] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.__dict__.setdefault('lazy', False)
+        self.__dict__.setdefault('iterative', None)
+        self.__dict__.setdefault('async_validator', None)
+        self.__dict__.setdefault('object_loader', None)
 
     def register_descriptor(self,    # pylint: disable=too-many-branches
                             component_name: str,
@@ -58,22 +143,11 @@ class Schema:
         :return: A two-tuple consisting of the component type and a boolean that is True if it is a
             required component.
         """
-        if component_def is None:
-            raise SchemaError('.'.join(path), 'The component has no definition')
-        if not isinstance(component_def, dict):
-            raise SchemaError('.'.join(path), 'The component definition is not of type "map"')
-        if 'type' not in component_def:
-            raise SchemaError('.'.join(path), 'The component has no type')
-        component_type = component_def['type']
-        if not isinstance(component_type, str):
-            raise SchemaError('.'.join(path), 'The component type attribute is not a type name')
-        component_required = True
-        if 'required' in component_def:
-            component_required = component_def['required']
-        if not isinstance(component_required, bool):
-            raise SchemaError('.'.join(path), 'The required attribute is not of type "bool"')
-        if component_name in self.descriptors:
-            pass
+        definition, component_type, component_required = self.component_header(component_def,
+                                                                                path)
+        if not path and component_name in self.descriptors:
+            if component_type in ('map', 'list'):
+                component_type = component_name
         elif component_type in self.primitive_types:
             if not path:
                 self.descriptors[component_name] = self.descriptors[component_type]
@@ -82,25 +156,127 @@ class Schema:
             if path:
                 generated_type_name = '.'.join(path + [component_name])
             self.descriptors[generated_type_name] = self.create_map_descriptor(component_name,
-                                                                               component_def,
+                                                                               definition,
                                                                                path)
             component_type = generated_type_name
         elif component_type == 'list':
             component_type = '.'.join(path + [component_name])
-            self.descriptors[component_type] = self.create_list_descriptor(
-                component_name, component_def, path)
+            self.descriptors[component_type] = self.create_list_descriptor(definition, path)
         elif self.get_definition(component_type):
-            self.descriptors[component_name] = IncompleteTypeDescriptor()
-            self.register_descriptor(component_type, self.get_definition(component_type), [])
             if not path:
-                self.descriptors[component_name] = self.descriptors[component_type]
+                self.descriptors[component_name] = self.resolve_alias(component_name,
+                                                                      component_type)
         else:
             raise SchemaError('.'.join(path), 'Unknown type: "{0}"'.format(component_type))
-        if component_name in self.descriptors and isinstance(
-                self.descriptors[component_name], IncompleteTypeDescriptor):
-            del self.descriptors[component_name]
         return (component_type, component_required)
 
+    @staticmethod
+    def component_header(component_def: Optional[Dict[str, Any]],
+                         path: List[str])\
+            -> Tuple[Dict[str, Any], str, bool]:
+        """
+        This method checks and returns the type and required attributes of a component definition.
+
+        :param component_def: The definition of the component.
+        :param path: The path of the component.
+        :return: A three-tuple consisting of the checked definition, the type attribute of the
+            component and a boolean that is True if it is a required component.
+        """
+        if component_def is None:
+            raise SchemaError('.'.join(path), 'The component has no definition')
+        if not isinstance(component_def, dict):
+            raise SchemaError('.'.join(path), 'The component definition is not of type "map"')
+        if 'type' not in component_def:
+            raise SchemaError('.'.join(path), 'The component has no type')
+        component_type = component_def['type']
+        if not isinstance(component_type, str):
+            raise SchemaError('.'.join(path), 'The component type attribute is not a type name')
+        component_required = True
+        if 'required' in component_def:
+            component_required = component_def['required']
+        if not isinstance(component_required, bool):
+            raise SchemaError('.'.join(path), 'The required attribute is not of type "bool"')
+        return (component_def, component_type, component_required)
+
+    def declare_descriptor(self,
+                           component_name: str,
+                           component_def: Optional[Dict[str, Any]])\
+            -> Tuple[str, bool]:
+        """
+        This method returns the type and required attributes of a top-level component of a lazy
+        schema like register_descriptor does, but without building its descriptor.
+
+        :param component_name: The name of the top-level component.
+        :param component_def: The definition of the component.
+        :return: A two-tuple consisting of the component type and a boolean that is True if it is a
+            required component.
+        """
+        _, component_type, component_required = self.component_header(component_def, [])
+        if component_type in ('map', 'list'):
+            component_type = component_name
+        elif component_type not in self.primitive_types and not self.get_definition(component_type):
+            raise SchemaError('', 'Unknown type: "{0}"'.format(component_type))
+        return (component_type, component_required)
+
+    def build_descriptor(self,
+                         type_name: str)\
+            -> Descriptor:
+        """
+        This method builds and registers the descriptor of a top-level type of a lazy schema, along
+        with the descriptors of the maps and lists nested in its definition. If the definition is
+        incorrect, the descriptors registered while building it are removed, so the SchemaError is
+        raised again the next time the type is reached.
+
+        :param type_name: The name of the type.
+        :return: The descriptor of the type. Raises a KeyError for unknown types.
+        """
+        component_def = self.get_definition(type_name)
+        if component_def is None:
+            raise KeyError(type_name)
+        registered = set(self.descriptors)
+        try:
+            self.register_descriptor(type_name, component_def, [])
+        except SchemaError:
+            for name in set(self.descriptors) - registered:
+                del self.descriptors[name]
+            raise
+        return dict.__getitem__(self.descriptors, type_name)
+
+    def check(self) -> 'Schema':
+        """
+        This method builds all the types of a lazy schema, so the errors of the schema definition
+        are raised here instead of during the validation of a document. Eagerly built schemas have
+        been checked by the constructor.
+
+        :return: The Schema instance itself. Raises a SchemaError if the definition is incorrect.
+        """
+        for type_name in list(self.definitions):
+            if type_name not in self.descriptors:
+                self.build_descriptor(type_name)
+        return self
+
+    def resolve_alias(self,
+                      component_name: str,
+                      component_type: str)\
+            -> Descriptor:
+        """
+        This method returns the descriptor of a top-level component whose type is another named
+        type, registering the named type first if it has not been registered yet. References to
+        named types from map items and list item types are resolved by name during validation, so
+        aliases are the only components that need their type to be built in advance.
+
+        :param component_name: The name of the alias component.
+        :param component_type: The name of the type of the alias component.
+        :return: The descriptor of the named type.
+        """
+        self.descriptors[component_name] = IncompleteTypeDescriptor()
+        if component_type not in self.descriptors:
+            self.register_descriptor(component_type, self.get_definition(component_type), [])
+        descriptor = self.descriptors[component_type]
+        if isinstance(descriptor, IncompleteTypeDescriptor):
+            raise SchemaError('', 'Circular type alias: "{0}"'.format(component_name))
+        return descriptor
+
     def create_map_descriptor(self,
                               component_name: str,
                               component_def: Dict[str, Any],
@@ -136,22 +312,41 @@ class Schema:
                 item_components = item[item_name]
                 if component_name != '__schema__':
                     path.append(component_name)
-                item_type, item_required = self.register_descriptor(
-                    item_name, item_components, path)
-                map_items.append(MapItem(item_name, item_type, item_required))
+                declare = self.lazy and component_name == '__schema__'
+                item_type, item_required = self.declare_descriptor(item_name, item_components) \
+                    if declare else self.register_descriptor(item_name, item_components, path)
+                map_items.append(self.map_item(item_name, item_type, item_required))
                 if component_name != '__schema__':
                     path.pop()
         return MapDescriptor(map_items, self.descriptors)
 
+    def map_item(self,
+                 name: Any,
+                 item_type: str,
+                 required: bool)\
+            -> MapItem:
+        """
+        This method returns the MapItem with the given details. Equal items are shared by all the
+        map descriptors of the schema, which keeps schemas with many similar maps small.
+
+        :param name: The name of the item.
+        :param item_type: The type of the item.
+        :param required: Whether the item is required.
+        :return: The MapItem instance.
+        """
+        key = (name, item_type, required)
+        item = self.map_items.get(key)
+        if item is None:
+            item = self.map_items[key] = MapItem(name, item_type, required)
+        return item
+
     def create_list_descriptor(self,    # pylint: disable=too-many-branches
-                               component_name: str,
                                component_def: Dict[str, Any],
                                path: List[str])\
             -> ListDescriptor:
         """
         This method returns a ListDescriptor with the details specified in the arguments.
 
-        :param component_name: The name of the component to be created.
         :param component_def: The definition of the component to be created.
         :param path: The path of the component to be created.
         :return: A ListDescriptor instance describing the new component.
@@ -166,12 +361,8 @@ class Schema:
         if not item_types:
             raise SchemaError('.'.join(path), 'The component has empty "item_types" list')
         for item_type in item_types:
-            if item_type not in self.descriptors:
-                if self.get_definition(item_type):
-                    self.descriptors[component_name] = IncompleteTypeDescriptor()
-                    self.register_descriptor(item_type, self.get_definition(item_type), [])
-                else:
-                    raise SchemaError('.'.join(path), 'Unknown type: "{0}"'.format(item_type))
+            if item_type not in self.descriptors and not self.get_definition(item_type):
+                raise SchemaError('.'.join(path), 'Unknown type: "{0}"'.format(item_type))
         min_items = None
         if 'min' in component_def:
             min_items = component_def['min']
@@ -200,18 +391,365 @@ class Schema:
         :param component_type: The string representation of a the component's type.
         :return:
         """
-        for component_def in self.schema_def['items']:
-            if component_type in component_def:
-                return component_def[component_type]
-        return None
+        return self.definitions.get(component_type)
+
+    def freeze(self,
+               gc_freeze: bool = True)\
+            -> 'Schema':
+        """
+        This method prepares a fully built schema for prefork servers, whose worker processes share
+        the memory of the parent until they write to it. The data that is only needed while the
+        schema is built is released (after building all the types of a lazy schema) and the schema
+        is compiled, so the workers share the validator functions instead of compiling them one by
+        one. With gc_freeze the objects existing at this point are moved to the permanent generation
+        of the garbage collector (gc.freeze), so collections in the workers do not write to the
+        memory pages holding them; it affects every object of the process, so it is best called once
+        after all the schemas have been loaded and right before forking. A frozen schema validates
+        like before but it cannot be extended.
+
+        :param gc_freeze: Whether gc.freeze is called.
+        :return: The Schema instance itself.
+        """
+        self.check()
+        self.schema_def = {}
+        self.definitions = {}
+        self.map_items = {}
+        self.compile()
+        if gc_freeze:
+            gc.collect()
+            gc.freeze()
+        return self
 
     def validate(self,
-                 doc: Descriptor)\
+                 doc: Descriptor,
+                 engine: str = 'recursive',
+                 profiler: Optional[ValidationProfiler] = None,
+                 context: Optional[ValidationContext] = None,
+                 structure_depth: Optional[int] = None)\
             -> bool:
         """
-        This method validates the provided document against the Schema instance's own schema.
+        This method validates the provided document against the Schema instance's own schema. The
+        recursive engine first checks the document with Schema.is_valid and only walks it again
+        to find the path of the error if it is invalid, so valid documents cost no path bookkeeping.
 
         :param doc: The document to be validated.
+        :param engine: The validation engine: 'recursive' walks the document with nested calls of
+            the descriptors, 'iterative' walks it with an explicit stack, so the depth of the
+            document is not limited by the recursion limit. Both raise the same errors.
+        :param profiler: A ValidationProfiler that measures the validation time per schema item. It
+            is only supported by the recursive engine.
+        :param context: A new ValidationContext for the document, which validates the maps and lists
+            that appear at several places of the document (YAML aliases) only once per type and
+            limits the number of visited nodes. It is only supported by the recursive engine.
+        :param structure_depth: The number of levels of the document checked by a structural
+            pre-pass before the validation, see Schema.check_structure. None for no pre-pass.
+        :return: True if the document is valid or raises a ValidationError if not.
+        """
+        if structure_depth is not None:
+            self.check_structure(doc, structure_depth)
+        if context is not None and engine != 'recursive':
+            raise ValueError('validation contexts are only supported by the recursive engine')
+        if profiler is not None:
+            if engine != 'recursive':
+                raise ValueError('profiling is only supported by the recursive engine')
+            self.check()
+            return profiler.profile(self, doc, context)
+        if engine == 'iterative':
+            if self.iterative is None:
+                self.iterative = IterativeValidator(self.schema)
+            return self.iterative.validate(doc)
+        if engine != 'recursive':
+            raise ValueError('unknown validation engine: {0}'.format(engine))
+        if context is None and self.schema.is_valid(doc):
+            return True
+        return self.schema.validate(doc, [], context)
+
+    def is_valid(self,
+                 doc: Any)\
+            -> bool:
+        """
+        This method returns whether the provided document is valid without constructing an error
+        for invalid ones, for filtering documents when the reason of the rejection is not needed.
+
+        :param doc: The document to be validated.
+        :return: True if the document is valid, False if not.
+        """
+        return self.schema.is_valid(doc)
+
+    def check_structure(self,
+                        doc: Any,
+                        max_depth: Optional[int] = None)\
+            -> bool:
+        """
+        This method checks the structure of the provided document without the types of its
+        primitive values: the keys of the maps against the allowed and required item names of their
+        types, and the lengths and item types of the lists. It is much cheaper than the validation
+        and rejects most of the invalid documents, so validating a document after checking its
+        structure turns structurally wrong documents away early. The error of an invalid document
+        is one of its errors, but not necessarily the first one found by the validation.
+
+        :param doc: The document to be checked.
+        :param max_depth: The number of levels of the document checked, 1 for the top-level
+            components only, None for all the levels.
+        :return: True if the structure of the document is valid or raises a ValidationError if not.
+        """
+        if max_depth is not None and max_depth < 1:
+            raise ValueError('The depth of the structural check must be positive')
+        return self.schema.check_structure(doc, [], sys.maxsize if max_depth is None else max_depth)
+
+    def validate_sampled(self,
+                         doc: Any,
+                         sampling: Union[SamplingPolicy, Dict[str, SamplingPolicy]],
+                         context: Optional[ValidationContext] = None)\
+            -> Dict[str, Tuple[int, int]]:
+        """
+        This method validates the provided document checking only a sample of the items of its
+        lists, for documents from trusted sources whose lists are too long to be validated on every
+        load. The numbers of the items of the sampled lists are always checked against their min and
+        max attributes. The rest of the document is validated like by the recursive engine.
+
+        :param doc: The document to be validated.
+        :param sampling: A SamplingPolicy applied to the lists of every type, or a dict from the
+            names of list types to the SamplingPolicy of their lists (the lists of the other types
+            are validated entirely).
+        :param context: A new ValidationContext for the document, see Schema.validate.
+        :return: The coverage of the validation: a dict from the names of the sampled list types to
+            the number of validated items and the number of items of their lists. Raises a
+            ValidationError if the document is invalid.
+        """
+        if context is None:
+            context = ValidationContext()
+        if isinstance(sampling, SamplingPolicy):
+            self.check()
+            sampled = set()
+            for type_name, descriptor in self.descriptors.items():
+                if isinstance(descriptor, ListDescriptor) and id(descriptor) not in sampled:
+                    sampled.add(id(descriptor))
+                    context.sample(descriptor, type_name, sampling)
+        else:
+            for type_name, policy in sampling.items():
+                descriptor = self.descriptors.get(type_name)
+                if not isinstance(descriptor, ListDescriptor):
+                    raise ValueError('not a list type: {0}'.format(type_name))
+                context.sample(descriptor, type_name, policy)
+        self.schema.validate(doc, [], context)
+        return context.coverage
+
+    def revalidate(self,
+                   doc: Any,
+                   patch: List[Dict[str, Any]])\
+            -> Any:
+        """
+        This method applies a JSON Patch (RFC 6902) to a valid document in place and validates the
+        result, checking only the values the patch touched and the constraints of their containers,
+        so the cost is proportional to the patch instead of the document.
+
+        :param doc: The document, which must be valid before the patch.
+        :param patch: The operations of the patch.
+        :return: The patched document, a new object if the patch replaced the whole document.
+            Raises a ValidationError if the patched document is invalid and a ValueError if the
+            patch cannot be applied, in which case the document is left unchanged.
+        """
+        return IncrementalValidator(self.schema).revalidate(doc, patch)
+
+    def compile(self) -> CompiledSchema:
+        """
+        This method compiles the descriptors of the schema into specialized validator functions.
+        The result is cached, so the schema is compiled only once.
+
+        :return: A CompiledSchema instance whose validate method is equivalent to Schema.validate.
+        """
+        if self.compiled is None:
+            self.check()
+            self.compiled = compile_schema(self.schema, self.descriptors)
+        return self.compiled
+
+    def get_object_loader(self) -> ObjectLoader:
+        """
+        This method returns the ObjectLoader of the schema, which generates the classes of its map
+        types. It is created once and cached.
+
+        :return: The ObjectLoader instance.
+        """
+        if self.object_loader is None:
+            self.check()
+            self.object_loader = ObjectLoader(self.schema, self.descriptors)
+        return self.object_loader
+
+    def load(self,
+             doc: Any)\
+            -> Any:
+        """
+        This method validates the provided document and converts it into objects in the same pass:
+        the maps become instances of the generated classes of their types (see Schema.model_class),
+        the lists become lists of their converted items and the primitive values are kept.
+
+        :param doc: The document to be loaded.
+        :return: The instance of the class of the whole document, whose attributes are the top-level
+            components. Raises a ValidationError if the document is invalid.
+        """
+        return self.get_object_loader().load(doc)
+
+    def model_class(self,
+                    type_name: str)\
+            -> Type[Model]:
+        """
+        This method returns the generated class of a map type, '__schema__' for the class of the
+        whole document. Its attributes are the item names of the map made valid identifiers, see
+        the _fields attribute of the class.
+
+        :param type_name: The name of the map type.
+        :return: The class. Raises a ValueError if the type is not a map type.
+        """
+        classes = self.get_object_loader().classes
+        if type_name not in classes:
+            raise ValueError('not a map type: {0}'.format(type_name))
+        return classes[type_name]
+
+    def validate_columns(self,
+                         type_name: str,
+                         batch: Any)\
+            -> bool:
+        """
+        This method validates a columnar batch of records against a map type of the schema. Row i
+        of the batch is valid if the map made of its non-null values is a valid component of the
+        type, and the error of the first invalid row is the same as the error of validating the rows
+        as a list. Primitive columns are checked by their types where the batch allows it (pyarrow
+        arrays, NumPy arrays of non-object dtypes), so the cost does not grow with the number of
+        rows of valid batches.
+
+        :param type_name: The name of the map type of the rows.
+        :param batch: A pyarrow RecordBatch or Table, or a dict from column names to NumPy arrays
+            (masked arrays for null values) or to sequences (None for null values).
+        :return: True if the batch is valid or raises a ValidationError if not.
+        """
+        descriptor = self.descriptors.get(type_name)
+        if not isinstance(descriptor, MapDescriptor):
+            raise ValueError('not a map type: {0}'.format(type_name))
+        from columnar import ColumnarValidator  # pylint: disable=import-error, import-outside-toplevel
+        return ColumnarValidator(descriptor).validate(batch)
+
+    def validate_all(self,
+                     doc: Any,
+                     max_errors: Optional[int] = None)\
+            -> List[ValidationError]:
+        """
+        This method validates the provided document and collects all of its errors instead of
+        stopping at the first one. The paths of the errors are only rendered when they are accessed.
+
+        :param doc: The document to be validated.
+        :param max_errors: The number of errors after which the validation stops.
+        :return: The list of the validation errors, empty if the document is valid.
+        """
+        if max_errors is not None and max_errors < 1:
+            raise ValueError('The maximum number of errors must be positive')
+        errors = ErrorCollector(max_errors)
+        try:
+            self.schema.collect(doc, ErrorPath(), errors)
+        except ErrorLimitReached:
+            pass
+        return errors.errors
+
+    def validate_many(self,
+                      docs: Iterable[Any],
+                      workers: Optional[int] = None,
+                      chunksize: Optional[int] = None)\
+            -> List[Optional[ValidationError]]:
+        """
+        This method validates many documents in parallel on a pool of worker processes. The schema
+        is sent to every worker only once, when the pool is started.
+
+        :param docs: The documents to be validated.
+        :param workers: The number of worker processes, defaults to the number of CPUs.
+        :param chunksize: The number of documents sent to a worker in one task.
+        :return: The result of every document in input order, None for valid documents and the
+            ValidationError for invalid ones.
+        """
+        from batch import validate_many  # pylint: disable=import-error, import-outside-toplevel
+        return validate_many(self, docs, workers, chunksize)
+
+    def iter_valid(self,
+                   docs: Iterable[Any],
+                   on_error: Optional[Callable[[int, Any, ValidationError], None]] = None)\
+            -> Iterator[Any]:
+        """
+        This generator validates the documents one by one as they are consumed and yields the valid
+        ones, so arbitrarily long streams can be filtered in constant memory.
+
+        :param docs: The documents to be validated.
+        :param on_error: Called with the index, the document and the ValidationError of every
+            invalid document.
+        :return: An iterator over the valid documents.
+        """
+        validate = self.compile().validate
+        for index, doc in enumerate(docs):
+            try:
+                validate(doc)
+            except ValidationError as error:
+                if on_error is not None:
+                    on_error(index, doc, error)
+                continue
+            yield doc
+
+    def get_async_validator(self) -> 'AsyncValidator':
+        """
+        This method returns the AsyncValidator used by validate_async and validate_stream_async,
+        which offloads large documents to the default executor of the event loop. An AsyncValidator
+        created by the caller can set the size threshold, the executor and the concurrency.
+
+        :return: The cached AsyncValidator instance.
+        """
+        if self.async_validator is None:
+            from aio import AsyncValidator  # pylint: disable=import-error, import-outside-toplevel, redefined-outer-name
+            self.async_validator = AsyncValidator(self)
+        return self.async_validator
+
+    async def validate_async(self,
+                             doc: Any)\
+            -> bool:
+        """
+        This coroutine validates the provided document without blocking the event loop for long:
+        small documents are validated inline and large ones in an executor.
+
+        :param doc: The document to be validated.
+        :return: True if the document is valid or raises a ValidationError if not.
+        """
+        return await self.get_async_validator().validate(doc)
+
+    def validate_stream_async(self,
+                              docs: AsyncIterable[Any])\
+            -> AsyncIterator[Tuple[Any, Optional[ValidationError]]]:
+        """
+        This method validates the documents of an async iterator like validate_async, with a
+        bounded number of large documents validated concurrently, and yields the results in input
+        order.
+
+        :param docs: The documents to be validated.
+        :return: An async iterator over (document, error) pairs, where error is None for valid
+            documents.
+        """
+        return self.get_async_validator().validate_stream(docs)
+
+    def validate_events(self,
+                        stream: IO[str],
+                        stream_format: str = 'json',
+                        max_nodes: Optional[int] = None)\
+            -> bool:
+        """
+        This method validates a single document while it is being parsed from the stream, without
+        building the document in memory. Parsing stops at the first violation. Documents with
+        duplicate keys and YAML documents with merge keys (<<) are not supported and raise a
+        ValueError.
+
+        :param stream: The text stream holding the document.
+        :param stream_format: The format of the document, either "json" or "yaml".
+        :param max_nodes: The number of document nodes after which the validation fails, None for
+            no limit. Unlike with a ValidationContext, the nodes of a YAML alias are counted at every
+            alias, as they are validated at every alias.
         :return: True if the document is valid or raises a ValidationError if not.
         """
-        return self.schema.validate(doc, [])
+        if stream_format == 'json':
+            return validate_events(self.schema, json_events(stream), max_nodes)
+        if stream_format == 'yaml':
+            return validate_events(self.schema, yaml_events(stream), max_nodes)
+        raise ValueError('Unsupported format: {0}'.format(stream_format))
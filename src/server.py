@@ -0,0 +1,503 @@
+"""
+This module contains the validation server and its client. The server is a long-lived process that
+builds its schemas once and validates the documents posted to it, so a validation does not pay for
+the start of the interpreter and the build of the schema. It speaks HTTP/1.1 with keep-alive on a
+local TCP port or a Unix socket and handles every connection in its own thread.
+
+Endpoints:
+    GET  /schemas                   the names of the loaded schemas
+    GET  /stats                     the number of requests and the latency percentiles per endpoint
+    POST /validate/<schema>         validates the JSON document of the body
+    POST /validate/<schema>/batch   validates the documents of the JSON array of the body
+
+The result of a document is {"valid": true} or {"valid": false, "path": ..., "msg": ...} with the
+path and the message of the ValidationError, and errors of the request are answered with a 4xx
+status and {"error": ...}.
+"""
+
+import http.client
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+
+from error import SchemaError, ValidationError   # pylint: disable=no-name-in-module, wrong-import-position
+from loader import get_loader   # pylint: disable=import-error, wrong-import-position
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# The number of latest requests per endpoint the latency percentiles are computed from.
+DEFAULT_WINDOW = 10000
+
+# The size of the write buffer of a connection, large enough to send the headers and the body of a
+# response in one write.
+WRITE_BUFFER_SIZE = 64 * 1024
+
+
+def schema_name_of(file_name: str) -> str:
+    """
+    Returns the name a schema file is served under: its base name without the extension.
+
+    :param file_name: The name of the schema definition file.
+    :return: The name of the schema.
+    """
+    return os.path.splitext(os.path.basename(file_name))[0]
+
+
+def percentile(values: List[float],
+               fraction: float)\
+        -> float:
+    """
+    Returns the nearest-rank percentile of sorted values.
+
+    :param values: The sorted values, not empty.
+    :param fraction: The percentile as a fraction (e.g. 0.99).
+    :return: The percentile.
+    """
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class LatencyStats:
+    """
+    This class records the latency of the requests per endpoint. The percentiles are computed from
+    a window of the latest requests, so the memory use does not grow with the number of requests.
+    """
+    def __init__(self,
+                 window: int = DEFAULT_WINDOW):
+        """
+        Constructor for the LatencyStats class.
+
+        :param window: The number of latest requests per endpoint the percentiles are computed from.
+        """
+        self.window = window
+        self.lock = threading.Lock()
+        self.samples: Dict[str, Deque[float]] = {}
+        self.counts: Dict[str, int] = {}
+
+    def record(self,
+               endpoint: str,
+               seconds: float)\
+            -> None:
+        """
+        Records the latency of a request.
+
+        :param endpoint: The name of the endpoint.
+        :param seconds: The time spent on the request.
+        """
+        with self.lock:
+            samples = self.samples.get(endpoint)
+            if samples is None:
+                samples = self.samples[endpoint] = deque(maxlen=self.window)
+                self.counts[endpoint] = 0
+            samples.append(seconds)
+            self.counts[endpoint] += 1
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the statistics of the endpoints.
+
+        :return: A dict from the endpoints to dicts with the number of requests and the 50th, 90th,
+            99th percentile and the maximum of the latency in milliseconds.
+        """
+        with self.lock:
+            samples = {endpoint: sorted(values) for endpoint, values in self.samples.items()}
+            counts = dict(self.counts)
+        return {endpoint: {'count': counts[endpoint],
+                           'p50': percentile(values, 0.5) * 1000,
+                           'p90': percentile(values, 0.9) * 1000,
+                           'p99': percentile(values, 0.99) * 1000,
+                           'max': values[-1] * 1000}
+                for endpoint, values in samples.items()}
+
+
+def error_result(error: Optional[ValidationError]) -> Dict[str, Any]:
+    """
+    Returns the JSON representation of the result of a document.
+
+    :param error: The ValidationError of the document or None if it is valid.
+    :return: The result.
+    """
+    if error is None:
+        return {'valid': True}
+    return {'valid': False, 'path': error.path, 'msg': error.msg}
+
+
+class ValidationService:
+    """
+    This class implements the endpoints of the server independently of the transport.
+    """
+    def __init__(self,
+                 schemas: Dict[str, Any],
+                 loader: str = 'auto'):
+        """
+        Constructor for the ValidationService class, which compiles the schemas. Lazy schemas are
+        validated by their recursive engine instead, so their types are only built when the
+        requests reach them.
+
+        :param schemas: A dict from the names of the schemas to Schema instances.
+        :param loader: The name of the JSON loader of the request bodies, see loader.get_loader.
+        """
+        self.validators = {name: schema.validate if getattr(schema, 'lazy', False)
+                           else schema.compile().validate for name, schema in schemas.items()}
+        self.loads = get_loader('json', loader)
+        self.stats = LatencyStats()
+
+    def check(self,
+              schema_name: str,
+              doc: Any)\
+            -> Optional[ValidationError]:
+        """
+        Validates a document.
+
+        :param schema_name: The name of the schema.
+        :param doc: The document.
+        :return: None if the document is valid, otherwise its ValidationError.
+        """
+        try:
+            self.validators[schema_name](doc)
+        except ValidationError as error:
+            return error
+        return None
+
+    def handle(self,   # pylint: disable=too-many-return-statements
+               method: str,
+               path: str,
+               body: bytes)\
+            -> Tuple[int, Any]:
+        """
+        Handles a request.
+
+        :param method: The HTTP method.
+        :param path: The path of the request.
+        :param body: The body of the request.
+        :return: The HTTP status and the JSON payload of the response.
+        """
+        start = time.perf_counter()
+        parts = path.split('?', 1)[0].strip('/').split('/')
+        if parts in (['schemas'], ['stats']):
+            if method != 'GET':
+                return 405, {'error': 'method not allowed: {0}'.format(method)}
+            if parts == ['schemas']:
+                return 200, sorted(self.validators)
+            return 200, self.stats.summary()
+        if parts[0] != 'validate' or len(parts) not in (2, 3) \
+                or (len(parts) == 3 and parts[2] != 'batch'):
+            return 404, {'error': 'not found: {0}'.format(path)}
+        if method != 'POST':
+            return 405, {'error': 'method not allowed: {0}'.format(method)}
+        schema_name = parts[1]
+        if schema_name not in self.validators:
+            return 404, {'error': 'unknown schema: {0}'.format(schema_name)}
+        try:
+            doc = self.loads(body)
+        except ValueError as error:
+            return 400, {'error': 'Invalid JSON: {0}'.format(error)}
+        try:
+            if len(parts) == 2:
+                result = error_result(self.check(schema_name, doc))
+                self.stats.record('validate', time.perf_counter() - start)
+                return 200, result
+            if not isinstance(doc, list):
+                return 400, {'error': 'The body of a batch must be a JSON array'}
+            results = [error_result(self.check(schema_name, item)) for item in doc]
+        except SchemaError as error:
+            return 500, {'error': str(error)}
+        except Exception as error:   # pylint: disable=broad-except
+            return 500, {'error': 'Validation failed: {0}: {1}'.format(type(error).__name__, error)}
+        self.stats.record('batch', time.perf_counter() - start)
+        return 200, results
+
+
+class ValidationRequestHandler(BaseHTTPRequestHandler):
+    """
+    This class handles the HTTP requests of a connection, keeping the connection open between them.
+    """
+    protocol_version = 'HTTP/1.1'
+    wbufsize = WRITE_BUFFER_SIZE
+
+    def do_GET(self) -> None:   # pylint: disable=invalid-name
+        self.respond(*self.server.service.handle('GET', self.path, b''))   # type: ignore
+
+    def do_POST(self) -> None:   # pylint: disable=invalid-name
+        length = self.headers.get('Content-Length')
+        if length is None:
+            self.respond(411, {'error': 'Content-Length required'})
+            return
+        body = self.rfile.read(int(length))
+        self.respond(*self.server.service.handle('POST', self.path, body))   # type: ignore
+
+    def respond(self,
+                status: int,
+                payload: Any)\
+            -> None:
+        """
+        Sends a JSON response.
+
+        :param status: The HTTP status.
+        :param payload: The JSON payload.
+        """
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:   # pylint: disable=redefined-builtin
+        """
+        Requests are not logged, their latency is reported by the stats endpoint.
+        """
+
+
+class TCPValidationServer(ThreadingHTTPServer):
+    """
+    The validation server listening on a TCP port.
+    """
+    daemon_threads = True
+
+    def __init__(self,
+                 service: ValidationService,
+                 host: str = DEFAULT_HOST,
+                 port: int = DEFAULT_PORT):
+        """
+        Constructor for the TCPValidationServer class.
+
+        :param service: The ValidationService handling the requests.
+        :param host: The address to listen on.
+        :param port: The port to listen on, 0 for any free port.
+        """
+        self.service = service
+        super().__init__((host, port), ValidationRequestHandler)
+
+    def address(self) -> str:
+        """
+        Returns the address the server listens on.
+
+        :return: The address as host:port.
+        """
+        host, port = self.socket.getsockname()[:2]
+        return '{0}:{1}'.format(host, port)
+
+
+class UnixValidationServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    The validation server listening on a Unix socket. The socket file is removed when the server is
+    closed.
+    """
+    daemon_threads = True
+
+    def __init__(self,
+                 service: ValidationService,
+                 socket_path: str):
+        """
+        Constructor for the UnixValidationServer class. A socket file left behind by a previous
+        server is replaced.
+
+        :param service: The ValidationService handling the requests.
+        :param socket_path: The path of the socket file.
+        """
+        self.service = service
+        self.socket_path = socket_path
+        if os.path.exists(socket_path) and stat.S_ISSOCK(os.stat(socket_path).st_mode):
+            os.remove(socket_path)
+        super().__init__(socket_path, ValidationRequestHandler)
+
+    def address(self) -> str:
+        """
+        Returns the address the server listens on.
+
+        :return: The path of the socket file.
+        """
+        return self.socket_path
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+
+def create_server(service: ValidationService,
+                  host: str = DEFAULT_HOST,
+                  port: int = DEFAULT_PORT,
+                  socket_path: Optional[str] = None)\
+        -> Union[TCPValidationServer, UnixValidationServer]:
+    """
+    Creates a validation server, which starts listening immediately and serves the requests once
+    its serve_forever method is called.
+
+    :param service: The ValidationService handling the requests.
+    :param host: The address to listen on.
+    :param port: The port to listen on, 0 for any free port.
+    :param socket_path: The path of a Unix socket to listen on instead of the TCP port.
+    :return: The server.
+    """
+    if socket_path is not None:
+        return UnixValidationServer(service, socket_path)
+    return TCPValidationServer(service, host, port)
+
+
+def check_json_keys(component: Any,
+                    path: List[str])\
+        -> None:
+    """
+    Checks that the keys of the maps of a document are strings, because json.dumps would silently
+    turn the other keys into strings and the server would validate a different document.
+
+    :param component: The component to be checked.
+    :param path: The path of the component.
+    """
+    if isinstance(component, dict):
+        for key, value in component.items():
+            if not isinstance(key, str):
+                raise ValueError('Cannot send the document as JSON: non-string key {0!r} at '
+                                 '"{1}"'.format(key, '.'.join(path)))
+            path.append(key)
+            check_json_keys(value, path)
+            path.pop()
+    elif isinstance(component, list):
+        for index, item in enumerate(component):
+            path.append('items[{0}]'.format(index))
+            check_json_keys(item, path)
+            path.pop()
+
+
+def encode_json(doc: Any) -> bytes:
+    """
+    Encodes a document as the JSON body of a request. Documents that JSON cannot represent as they
+    are, such as the dates or the non-string keys of YAML documents, are refused instead of being
+    converted.
+
+    :param doc: The document.
+    :return: The JSON text. Raises a ValueError if the document cannot be represented as JSON.
+    """
+    check_json_keys(doc, [])
+    try:
+        return json.dumps(doc).encode('utf-8')
+    except TypeError as error:
+        raise ValueError('Cannot send the document as JSON: {0}'.format(error)) from error
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """
+    HTTP connection over a Unix socket.
+    """
+    def __init__(self,
+                 socket_path: str,
+                 timeout: Optional[float] = None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class ValidationClient:
+    """
+    This class is the client of the validation server. The connection is kept open between the
+    requests.
+    """
+    def __init__(self,
+                 host: str = DEFAULT_HOST,
+                 port: int = DEFAULT_PORT,
+                 socket_path: Optional[str] = None,
+                 timeout: Optional[float] = None):
+        """
+        Constructor for the ValidationClient class.
+
+        :param host: The address of the server.
+        :param port: The port of the server.
+        :param socket_path: The path of the Unix socket of the server, used instead of the port.
+        :param timeout: The timeout of the socket operations in seconds.
+        """
+        if socket_path is not None:
+            self.connection: http.client.HTTPConnection = UnixHTTPConnection(socket_path, timeout)
+        else:
+            self.connection = http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def request(self,
+                method: str,
+                path: str,
+                body: Optional[bytes] = None)\
+            -> Any:
+        """
+        Sends a request to the server.
+
+        :param method: The HTTP method.
+        :param path: The path of the request.
+        :param body: The body of the request.
+        :return: The JSON payload of the response. Raises a ValueError if the server rejected the
+            request.
+        """
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        self.connection.request(method, path, body, headers)
+        response = self.connection.getresponse()
+        payload = json.loads(response.read())
+        if response.status != 200:
+            raise ValueError(payload.get('error', 'HTTP {0}'.format(response.status)))
+        return payload
+
+    def validate(self,
+                 schema_name: str,
+                 doc: Any)\
+            -> Optional[ValidationError]:
+        """
+        Validates a document on the server.
+
+        :param schema_name: The name of the schema.
+        :param doc: The document, or its JSON text as bytes.
+        :return: None if the document is valid, otherwise its ValidationError. Raises a ValueError
+            if the document cannot be represented as JSON.
+        """
+        body = doc if isinstance(doc, bytes) else encode_json(doc)
+        result = self.request('POST', '/validate/{0}'.format(schema_name), body)
+        return None if result['valid'] else ValidationError(result['path'], result['msg'])
+
+    def validate_batch(self,
+                       schema_name: str,
+                       docs: List[Any])\
+            -> List[Optional[ValidationError]]:
+        """
+        Validates documents on the server in one request.
+
+        :param schema_name: The name of the schema.
+        :param docs: The documents.
+        :return: The result of every document in order, None for valid documents and the
+            ValidationError for invalid ones. Raises a ValueError if a document cannot be
+            represented as JSON.
+        """
+        body = encode_json(docs)
+        results = self.request('POST', '/validate/{0}/batch'.format(schema_name), body)
+        return [None if result['valid'] else ValidationError(result['path'], result['msg'])
+                for result in results]
+
+    def schemas(self) -> List[str]:
+        """
+        Returns the names of the schemas of the server.
+
+        :return: The names.
+        """
+        return self.request('GET', '/schemas')
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the latency statistics of the server, see LatencyStats.summary.
+
+        :return: The statistics per endpoint.
+        """
+        return self.request('GET', '/stats')
+
+    def close(self) -> None:
+        """
+        Closes the connection.
+        """
+        self.connection.close()
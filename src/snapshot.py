@@ -0,0 +1,122 @@
+"""
+This module contains the on-disk cache of built schemas. A schema snapshot is the pickled Schema
+instance with its whole descriptor graph, stored under a key derived from the content of the schema
+file, the loader that parsed it, the version of jysp and the layout of the pickled classes, so
+loading a schema that has been built before skips parsing the schema file and building the
+descriptors.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import Any, Optional
+
+import descriptor   # pylint: disable=import-error, wrong-import-position
+from version import __version__   # pylint: disable=import-error, wrong-import-position
+
+# The version of the pickled layout of the Schema class. It must be increased whenever the
+# attributes of Schema change, so that snapshots written by an older layout are not loaded. The
+# __slots__ of the descriptor classes are part of the key by themselves, see descriptor_layout.
+SNAPSHOT_FORMAT = 3
+
+
+def cache_directory() -> str:
+    """
+    Returns the directory of the schema snapshots. It can be set by the JYSP_CACHE_DIR environment
+    variable and defaults to ~/.cache/jysp.
+
+    :return: The path of the cache directory.
+    """
+    cache_dir = os.environ.get('JYSP_CACHE_DIR')
+    if cache_dir:
+        return cache_dir
+    return os.path.join(os.path.expanduser('~'), '.cache', 'jysp')
+
+
+def descriptor_layout() -> str:
+    """
+    Describes the pickled layout of the classes of the descriptor module: the name and the own
+    __slots__ of every class, in the order of their names.
+
+    :return: The description of the layout.
+    """
+    classes = sorted((name, value) for name, value in vars(descriptor).items()
+                     if isinstance(value, type) and value.__module__ == descriptor.__name__)
+    return ';'.join('{0}{1!r}'.format(name, cls.__dict__.get('__slots__'))
+                    for name, cls in classes)
+
+
+def snapshot_key(content: bytes,
+                 loader: str)\
+        -> str:
+    """
+    Computes the key of the snapshot of a schema file.
+
+    :param content: The content of the schema file.
+    :param loader: The name of the loader that parses the schema file, see loader.loader_name.
+    :return: The key of the snapshot.
+    """
+    digest = hashlib.sha256('{0}\0{1}\0{2}\0{3}'.format(
+        __version__, SNAPSHOT_FORMAT, descriptor_layout(), loader).encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(content)
+    return digest.hexdigest()
+
+
+def snapshot_path(key: str,
+                  cache_dir: Optional[str] = None)\
+        -> str:
+    """
+    Returns the path of a snapshot file.
+
+    :param key: The key of the snapshot.
+    :param cache_dir: The cache directory, defaults to the one returned by cache_directory.
+    :return: The path of the snapshot file.
+    """
+    return os.path.join(cache_dir or cache_directory(), key + '.pickle')
+
+
+def read_snapshot(key: str,
+                  cache_dir: Optional[str] = None)\
+        -> Optional[Any]:
+    """
+    Reads a snapshot from the cache. Missing, unreadable or corrupt snapshots are treated as cache
+    misses.
+
+    :param key: The key of the snapshot.
+    :param cache_dir: The cache directory, defaults to the one returned by cache_directory.
+    :return: The cached object or None if there is no usable snapshot.
+    """
+    try:
+        with open(snapshot_path(key, cache_dir), 'rb') as snapshot_file:
+            return pickle.load(snapshot_file)
+    except Exception:   # pylint: disable=broad-except
+        return None
+
+
+def write_snapshot(key: str,
+                   obj: Any,
+                   cache_dir: Optional[str] = None)\
+        -> None:
+    """
+    Writes a snapshot to the cache. The file is written under a temporary name and renamed, so
+    concurrent readers never see a partial snapshot. Failing to write the cache is not an error.
+
+    :param key: The key of the snapshot.
+    :param obj: The object to be cached.
+    :param cache_dir: The cache directory, defaults to the one returned by cache_directory.
+    """
+    path = snapshot_path(key, cache_dir)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as snapshot_file:
+                pickle.dump(obj, snapshot_file, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except OSError:
+        pass
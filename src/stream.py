@@ -0,0 +1,110 @@
+"""
+This module contains the readers of document streams, i.e. JSON Lines files holding one JSON
+document per line and YAML streams holding "---" separated documents. The readers yield the
+documents one by one as they are read, so a stream is never loaded into memory as a whole.
+"""
+
+from typing import Any, IO, Iterator, Optional
+
+from error import ValidationError   # pylint: disable=no-name-in-module, wrong-import-position
+from loader import get_loader, yaml_loader_class   # pylint: disable=import-error, wrong-import-position
+
+
+class StreamRecord:  # pylint: disable=too-few-public-methods
+    """
+    A document read from a stream together with its position in the stream.
+    """
+    def __init__(self,
+                 line: int,
+                 doc: Any,
+                 raw: Optional[str] = None,
+                 error: Optional[ValidationError] = None):
+        """
+        Constructor for the StreamRecord class.
+
+        :param line: The line number where the document starts in the stream.
+        :param doc: The document.
+        :param raw: The text of the document if it is available (JSON Lines).
+        :param error: The error if the text of the document could not be parsed.
+        """
+        self.line = line
+        self.doc = doc
+        self.raw = raw
+        self.error = error
+
+
+def iter_json_lines(stream: IO[str],
+                    loader: str = 'auto')\
+        -> Iterator[StreamRecord]:
+    """
+    Reads a JSON Lines stream and yields its documents one by one. Empty lines are skipped. Lines
+    that are not valid JSON are yielded with an error instead of aborting the stream.
+
+    :param stream: The text stream to be read.
+    :param loader: The name of the JSON loader, see loader.get_loader.
+    :return: An iterator over the records of the stream.
+    """
+    loads = get_loader('json', loader)
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            doc = loads(line)
+        except ValueError as error:
+            yield StreamRecord(line_number, None, line,
+                               ValidationError('', 'Invalid JSON: {0}'.format(error)))
+            continue
+        yield StreamRecord(line_number, doc, line)
+
+
+def iter_yaml_documents(stream: IO[str],
+                        loader: str = 'auto')\
+        -> Iterator[StreamRecord]:
+    """
+    Reads a YAML stream and yields its documents one by one. Only the document being constructed is
+    kept in memory.
+
+    :param stream: The text stream to be read.
+    :param loader: The name of the YAML loader, see loader.get_loader.
+    :return: An iterator over the records of the stream.
+    """
+    yaml_loader = yaml_loader_class(loader)(stream)
+    try:
+        while yaml_loader.check_node():
+            node = yaml_loader.get_node()
+            yield StreamRecord(node.start_mark.line + 1, yaml_loader.construct_document(node))
+    finally:
+        yaml_loader.dispose()
+
+
+def iter_records(stream: IO[str],
+                 stream_format: str,
+                 loader: str = 'auto')\
+        -> Iterator[StreamRecord]:
+    """
+    Reads a stream of the given format.
+
+    :param stream: The text stream to be read.
+    :param stream_format: The format of the stream, either "jsonl" or "yaml".
+    :param loader: The name of the loader, see loader.get_loader.
+    :return: An iterator over the records of the stream.
+    """
+    if stream_format == 'jsonl':
+        return iter_json_lines(stream, loader)
+    if stream_format == 'yaml':
+        return iter_yaml_documents(stream, loader)
+    raise ValueError('Unsupported stream format: {0}'.format(stream_format))
+
+
+def stream_format_of(file_name: str) -> Optional[str]:
+    """
+    Guesses the stream format from the name of a file.
+
+    :param file_name: The name of the file.
+    :return: The name of the format or None if it could not be recognized.
+    """
+    if file_name.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    if file_name.endswith(('.yml', '.yaml')):
+        return 'yaml'
+    return None
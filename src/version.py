@@ -0,0 +1,5 @@
+"""
+This module contains the version of jysp.
+"""
+
+__version__ = '0.1.0'
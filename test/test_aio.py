@@ -0,0 +1,102 @@
+import asyncio
+import unittest
+import os
+import pickle
+import sys
+
+import yaml
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from aio import AsyncValidator, document_size, process_executor   # pylint: disable=import-error, wrong-import-position
+from error import ValidationError   # pylint: disable=no-name-in-module, wrong-import-position
+from schema import Schema           # pylint: disable=import-error, wrong-import-position
+
+
+async def aiter_docs(docs):
+    for doc in docs:
+        await asyncio.sleep(0)
+        yield doc
+
+
+async def collect(results):
+    return [(doc, error) async for doc, error in results]
+
+
+class TestAsync(unittest.TestCase):
+    def setUp(self):
+        data_file_name = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                      'data/validation.yml'))
+        with open(data_file_name) as validation_data:
+            self.test_data = yaml.load(validation_data)
+        self.schema = Schema(self.test_data['simple_map']['schema'])
+        self.valid = self.test_data['simple_map']['data']
+        self.invalid = self.test_data['map_item_wrong_type']['data']
+        self.docs = [self.valid, self.invalid, self.valid, self.valid, self.invalid] * 20
+
+    def assert_results(self, results):
+        self.assertEqual([doc for doc, _ in results], self.docs)
+        for doc, error in results:
+            if doc is self.valid:
+                self.assertIsNone(error)
+            else:
+                self.assertEqual(error.path, 'person.age')
+                self.assertEqual(error.msg, 'Expected type: int')
+
+    def test_document_size(self):
+        self.assertEqual(document_size(1, 10), 1)
+        self.assertEqual(document_size({'a': [1, 2, {'b': 'c'}]}, 10), 6)
+        self.assertEqual(document_size({'a': list(range(1000))}, 10), 11)
+
+    def test_validate_async(self):
+        self.assertTrue(asyncio.run(self.schema.validate_async(self.valid)))
+        with self.assertRaises(ValidationError) as context:
+            asyncio.run(self.schema.validate_async(self.invalid))
+        self.assertEqual(context.exception.path, 'person.age')
+
+    def test_offloaded(self):
+        validator = AsyncValidator(self.schema, threshold=0)
+        self.assertTrue(validator.is_large(self.valid))
+        self.assertTrue(asyncio.run(validator.validate(self.valid)))
+        self.assertEqual(asyncio.run(validator.check(self.invalid)).msg, 'Expected type: int')
+
+    def test_stream_inline(self):
+        results = asyncio.run(collect(self.schema.validate_stream_async(aiter_docs(self.docs))))
+        self.assert_results(results)
+
+    def test_stream_order(self):
+        schema = Schema({'person': self.test_data['simple_map']['schema']['person'],
+                         'extra': {'type': 'list', 'item_types': ['int']}})
+        docs = [dict(self.valid, extra=[{'int': item} for item in range(index % 7)]) for index in range(60)]
+        for threshold in (0, 4):
+            validator = AsyncValidator(schema, threshold=threshold, concurrency=2)
+            results = asyncio.run(collect(validator.validate_stream(aiter_docs(docs))))
+            self.assertEqual([doc for doc, _ in results], docs)
+            self.assertTrue(all(error is None for _, error in results))
+
+    def test_stream_mixed_sizes(self):
+        validator = AsyncValidator(self.schema, threshold=5, concurrency=2)
+        results = asyncio.run(collect(validator.validate_stream(aiter_docs(self.docs))))
+        self.assert_results(results)
+
+    def test_process_executor(self):
+        with process_executor(self.schema, 2) as executor:
+            validator = AsyncValidator(self.schema, threshold=0, executor=executor)
+            results = asyncio.run(collect(validator.validate_stream(aiter_docs(self.docs))))
+        self.assert_results(results)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            AsyncValidator(self.schema, concurrency=0)
+        with self.assertRaises(ValueError):
+            AsyncValidator(self.schema, threshold=-1)
+
+    def test_pickle_schema(self):
+        asyncio.run(self.schema.validate_async(self.valid))
+        schema = pickle.loads(pickle.dumps(self.schema))
+        self.assertIsNone(schema.async_validator)
+        self.assertTrue(asyncio.run(schema.validate_async(self.valid)))
+
+
+if __name__ == '__main__':
+    unittest.main()
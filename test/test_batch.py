@@ -0,0 +1,170 @@
+import json
+import unittest
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+
+import yaml
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from batch import newline_ranges, validate_json_lines_file   # pylint: disable=import-error, wrong-import-position
+from error import ValidationError   # pylint: disable=no-name-in-module, wrong-import-position
+from schema import Schema           # pylint: disable=import-error, wrong-import-position
+from stream import iter_json_lines  # pylint: disable=import-error, wrong-import-position
+
+JYSP = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/jysp.py'))
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        data_file_name = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                      'data/validation.yml'))
+        with open(data_file_name) as validation_data:
+            self.test_data = yaml.load(validation_data)
+        self.schema = Schema(self.test_data['simple_map']['schema'])
+        valid = self.test_data['simple_map']['data']
+        wrong_type = self.test_data['map_item_wrong_type']['data']
+        unexpected = self.test_data['unexpected_map_item']['data']
+        self.docs = [valid, wrong_type, valid, unexpected] * 25
+
+    def assert_results(self, results):
+        self.assertEqual(len(results), len(self.docs))
+        for index, result in enumerate(results):
+            if index % 4 in (0, 2):
+                self.assertIsNone(result)
+            elif index % 4 == 1:
+                self.assertEqual(result.path, 'person.age')
+                self.assertEqual(result.msg, 'Expected type: int')
+            else:
+                self.assertEqual(result.path, 'person')
+                self.assertEqual(result.msg, 'Unexpected item: "eye_color"')
+
+    def test_single_worker(self):
+        self.assert_results(self.schema.validate_many(self.docs, workers=1))
+
+    def test_worker_pool(self):
+        self.assert_results(self.schema.validate_many(self.docs, workers=2, chunksize=7))
+
+    def test_iterable_input(self):
+        self.assert_results(self.schema.validate_many(iter(self.docs), workers=2))
+
+    def test_invalid_worker_count(self):
+        with self.assertRaises(ValueError):
+            self.schema.validate_many(self.docs, workers=0)
+
+    def test_pickle_schema_and_error(self):
+        self.schema.compile()
+        schema = pickle.loads(pickle.dumps(self.schema))
+        self.assertTrue(schema.validate(self.docs[0]))
+        error = pickle.loads(pickle.dumps(ValidationError('person', 'Expected type: map')))
+        self.assertEqual(error.path, 'person')
+        self.assertEqual(error.msg, 'Expected type: map')
+
+
+class TestJsonLinesFile(unittest.TestCase):
+    def setUp(self):
+        data_file_name = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                      'data/validation.yml'))
+        with open(data_file_name) as validation_data:
+            self.test_data = yaml.load(validation_data)
+        self.schema = Schema(self.test_data['simple_map']['schema'])
+        valid = json.dumps(self.test_data['simple_map']['data'])
+        wrong_type = json.dumps(self.test_data['map_item_wrong_type']['data'])
+        lines = []
+        for index in range(200):
+            lines.append(wrong_type if index % 7 == 3 else valid)
+            if index % 31 == 5:
+                lines.append('')
+            if index % 53 == 8:
+                lines.append('{"person": ')
+        self.content = '\n'.join(lines)
+        handle, self.file_name = tempfile.mkstemp(suffix='.jsonl')
+        with os.fdopen(handle, 'w') as data_file:
+            data_file.write(self.content)
+        self.directory = tempfile.mkdtemp()
+        self.schema_file = os.path.join(self.directory, 'schema.yml')
+        with open(self.schema_file, 'w') as schema_file:
+            yaml.safe_dump(self.test_data['simple_map']['schema'], schema_file)
+
+    def tearDown(self):
+        os.remove(self.file_name)
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+        os.rmdir(self.directory)
+
+    def expected_errors(self):
+        errors = []
+        with open(self.file_name) as data_file:
+            for record in iter_json_lines(data_file):
+                error = record.error
+                if error is None:
+                    try:
+                        self.schema.validate(record.doc)
+                    except ValidationError as e:
+                        error = e
+                if error is not None:
+                    errors.append((record.line, error.path, error.msg))
+        return errors
+
+    def assert_ranges(self, workers):
+        ranges = list(validate_json_lines_file(self.schema, self.file_name, workers))
+        data = self.content.encode('utf-8')
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], len(data))
+        for index in range(1, len(ranges)):
+            self.assertEqual(ranges[index - 1][1], ranges[index][0])
+        self.assertEqual(sum(range_[2] for range_ in ranges), self.content.count('\n') + 1)
+        failures = [failure for range_ in ranges for failure in range_[3]]
+        errors = []
+        for line, start, stop, error in failures:
+            self.assertEqual(data[start:stop].decode('utf-8').rstrip('\n'),
+                             self.content.split('\n')[line - 1])
+            if error is not None:
+                errors.append((line, error.path, error.msg))
+        self.assertEqual(errors, self.expected_errors())
+
+    def validate_stream(self, workers):
+        dead_letter_name = os.path.join(self.directory, 'dead_letter.jsonl')
+        result = subprocess.run([sys.executable, JYSP, self.schema_file, self.file_name, '--stream',
+                                 '--no-schema-cache', '--workers', str(workers),
+                                 '--dead-letter', dead_letter_name],
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)
+        with open(dead_letter_name) as dead_letter:
+            dead_letters = [json.loads(line) for line in dead_letter]
+        return result.returncode, result.stdout, result.stderr, dead_letters
+
+    def test_parallel_stream_matches_serial(self):
+        self.assertGreater(len(list(validate_json_lines_file(self.schema, self.file_name, 3))), 4)
+        serial = self.validate_stream(1)
+        parallel = self.validate_stream(3)
+        self.assertEqual(parallel, serial)
+        dead_letters = [(letter['line'], letter['path'], letter['msg']) for letter in serial[3]]
+        self.assertEqual(dead_letters, self.expected_errors())
+        self.assertEqual(len([msg for _, _, msg in dead_letters if msg.startswith('Invalid JSON')]),
+                         4)
+
+    def test_newline_ranges(self):
+        data = b'a\nbb\n\nccc\ndddd'
+        for parts in range(1, 12):
+            ranges = newline_ranges(data, parts)
+            self.assertEqual(b''.join(data[start:end] for start, end in ranges), data)
+            for start, _ in ranges:
+                self.assertTrue(start == 0 or data[start - 1:start] == b'\n')
+        self.assertEqual(newline_ranges(b'', 4), [])
+
+    def test_single_worker(self):
+        self.assert_ranges(1)
+
+    def test_worker_pool(self):
+        self.assert_ranges(3)
+
+    def test_invalid_worker_count(self):
+        with self.assertRaises(ValueError):
+            list(validate_json_lines_file(self.schema, self.file_name, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+import unittest.mock
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from error import ValidationError   # pylint: disable=no-name-in-module, wrong-import-position
+from schema import Schema           # pylint: disable=import-error, wrong-import-position
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+SCHEMA = {'person': {'type': 'map', 'required': False,
+                     'items': [{'name': {'type': 'string'}},
+                               {'age': {'type': 'int', 'required': False}},
+                               {'score': {'type': 'float', 'required': False}},
+                               {'active': {'type': 'bool', 'required': False}}]},
+          'people': {'type': 'list', 'item_types': ['person']}}
+
+
+class TestColumnar(unittest.TestCase):
+    def setUp(self):
+        self.schema = Schema(SCHEMA)
+
+    def assert_same_result(self, columns, batch=None):
+        row_cnt = len(next(iter(columns.values()))) if columns else 0
+        rows = [{'person': {name: values[i] for name, values in columns.items()
+                            if values[i] is not None}} for i in range(row_cnt)]
+        batch = columns if batch is None else batch
+        try:
+            expected = self.schema.descriptors['people'].validate(rows, [])
+        except ValidationError as error:
+            with self.assertRaises(ValidationError) as context:
+                self.schema.validate_columns('person', batch)
+            self.assertEqual(context.exception.msg, error.msg)
+            self.assertEqual(context.exception.path, error.path)
+        else:
+            self.assertEqual(self.schema.validate_columns('person', batch), expected)
+
+    def cases(self):
+        return {
+            'valid': {'name': ['a', 'b', 'c'], 'age': [1, None, 3],
+                      'score': [1.5, 2.5, None], 'active': [True, False, None]},
+            'missing_required_value': {'name': ['a', None, 'c'], 'age': [1, 2, None]},
+            'missing_required_column': {'age': [1, 2, 3]},
+            'wrong_type': {'name': ['a', 'b', 'c'], 'age': [1.0, 2.0, 3.0]},
+            'unexpected_column': {'name': ['a', 'b', 'c'], 'email': [None, 'x', None]},
+            'first_error_wins': {'age': [1, 'x', 3], 'name': ['a', 'b', None]},
+        }
+
+    def test_sequences(self):
+        for name, columns in self.cases().items():
+            with self.subTest(name):
+                self.assert_same_result(columns)
+
+    @unittest.skipUnless(numpy, 'numpy is not installed')
+    def test_numpy(self):
+        for name, columns in self.cases().items():
+            with self.subTest(name):
+                arrays = {}
+                for column, values in columns.items():
+                    mask = [value is None for value in values]
+                    filled = [value for value in values if value is not None]
+                    data = [filled[0] if value is None else value for value in values]
+                    dtype = object if len(set(type(value) for value in filled)) > 1 else None
+                    arrays[column] = numpy.ma.masked_array(numpy.array(data, dtype=dtype),
+                                                           mask=mask)
+                self.assert_same_result(columns, arrays)
+
+    @unittest.skipUnless(pyarrow, 'pyarrow is not installed')
+    def test_arrow(self):
+        for name, columns in self.cases().items():
+            if name == 'first_error_wins':
+                continue
+            with self.subTest(name):
+                batch = pyarrow.RecordBatch.from_pydict(columns)
+                self.assert_same_result(columns, batch)
+                self.assert_same_result(columns, pyarrow.Table.from_batches([batch]))
+
+    @unittest.skipUnless(pyarrow and hasattr(pyarrow, 'string_view'),
+                         'pyarrow with string views is not installed')
+    def test_false_candidate_rows(self):
+        schema = Schema({'row': {'type': 'map', 'items': [{'s': {'type': 'string'}},
+                                                          {'n': {'type': 'int'}}]}})
+        batch = pyarrow.RecordBatch.from_arrays(
+            [pyarrow.array(['a', 'b', 'c'], type=pyarrow.string_view()),
+             pyarrow.array([1, 2, None])], names=['s', 'n'])
+        with self.assertRaises(ValidationError) as context:
+            schema.validate_columns('row', batch)
+        self.assertEqual(context.exception.path, 'items[2]')
+        self.assertEqual(context.exception.msg, 'Missing required item: "n"')
+        batch = pyarrow.RecordBatch.from_arrays(
+            [pyarrow.array(['a', 'b', 'c'], type=pyarrow.string_view()),
+             pyarrow.array([1, 2, 3])], names=['s', 'n'])
+        self.assertTrue(schema.validate_columns('row', batch))
+        with unittest.mock.patch('columnar.arrow_type_matches', return_value=False):
+            self.assertTrue(schema.validate_columns('row', batch))
+            self.assert_same_result(self.cases()['missing_required_value'],
+                                    pyarrow.RecordBatch.from_pydict(
+                                        self.cases()['missing_required_value']))
+
+    def test_empty_batch(self):
+        self.assertTrue(self.schema.validate_columns('person', {'age': []}))
+
+    def test_not_a_map_type(self):
+        with self.assertRaises(ValueError):
+            self.schema.validate_columns('people', {'name': ['a']})
+
+    def test_different_lengths(self):
+        with self.assertRaises(ValueError):
+            self.schema.validate_columns('person', {'name': ['a'], 'age': [1, 2]})
+
+
+if __name__ == '__main__':
+    unittest.main()
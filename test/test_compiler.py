@@ -0,0 +1,83 @@
+import unittest
+import os
+import sys
+
+import yaml
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from error import ValidationError   # pylint: disable=no-name-in-module, wrong-import-position
+from schema import Schema           # pylint: disable=import-error, wrong-import-position
+
+
+class TestCompiler(unittest.TestCase):
+    def setUp(self):
+        data_file_name = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                      'data/validation.yml'))
+        with open(data_file_name) as validation_data:
+            self.test_data = yaml.load(validation_data)
+
+    def assert_same_result(self, schema, data):
+        try:
+            expected = schema.validate(data)
+        except ValidationError as error:
+            with self.assertRaises(ValidationError) as context:
+                schema.compile().validate(data)
+            self.assertEqual(context.exception.msg, error.msg)
+            self.assertEqual(context.exception.path, error.path)
+        else:
+            self.assertEqual(schema.compile().validate(data), expected)
+
+    def test_validation_cases(self):
+        for test_case_name in self.test_data:
+            with self.subTest(test_case_name):
+                schema = Schema(self.test_data[test_case_name]['schema'])
+                self.assert_same_result(schema, self.test_data[test_case_name]['data'])
+
+    def test_compile_is_cached(self):
+        schema = Schema(self.test_data['complex_map']['schema'])
+        self.assertIs(schema.compile(), schema.compile())
+
+    def test_function_per_type(self):
+        schema = Schema(self.test_data['complex_map']['schema'])
+        compiled = schema.compile()
+        for type_name in compiled.function_names:
+            self.assertIn('def {0}('.format(compiled.function_names[type_name]), compiled.source)
+        self.assertIn('__schema__', compiled.validators)
+
+    def test_list_item_error_path(self):
+        schema = Schema(self.test_data['simple_list']['schema'])
+        data = {'sequence': [{'int': 1}, {'int': 2}, {'int': 'three'}]}
+        with self.assertRaises(ValidationError) as context:
+            schema.compile().validate(data)
+        self.assertEqual(context.exception.msg, 'Expected type: int')
+        self.assertEqual(context.exception.path, 'sequence.items[2]')
+
+    def test_list_item_is_not_a_map(self):
+        schema = Schema(self.test_data['simple_list']['schema'])
+        for item in (5, None, 'int', ['int'], [{'int': 1}]):
+            with self.subTest(item=item):
+                self.assert_same_result(schema, {'sequence': [{'int': 1}, item]})
+
+    def test_wide_map(self):
+        schema_def = {'wide': {'type': 'map',
+                               'items': [{'item{0}'.format(i): {'type': 'int'}}
+                                         for i in range(20)]}}
+        schema = Schema(schema_def)
+        valid = {'wide': {'item{0}'.format(i): i for i in range(20)}}
+        self.assert_same_result(schema, valid)
+        wrong_type = {'wide': dict(valid['wide'], item7='seven')}
+        self.assert_same_result(schema, wrong_type)
+        unexpected = {'wide': dict(valid['wide'], item20=20)}
+        self.assert_same_result(schema, unexpected)
+        missing = {'wide': {'item{0}'.format(i): i for i in range(19)}}
+        self.assert_same_result(schema, missing)
+
+    def test_recursive_type(self):
+        schema = Schema(self.test_data['recursive_map']['schema'])
+        data = self.test_data['recursive_map']['data']
+        self.assert_same_result(schema, data)
+
+
+if __name__ == '__main__':
+    unittest.main()
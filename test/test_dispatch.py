@@ -0,0 +1,65 @@
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from dispatch import Dispatcher     # pylint: disable=import-error, wrong-import-position
+from error import ValidationError   # pylint: disable=no-name-in-module, wrong-import-position
+from schema import Schema           # pylint: disable=import-error, wrong-import-position
+
+
+def event_schema(kind, field_type, lazy=False):
+    return Schema({'kind': {'type': 'string'},
+                   kind: {'type': 'map', 'items': [{'value': {'type': field_type}}]}}, lazy=lazy)
+
+
+class TestDispatch(unittest.TestCase):
+    def setUp(self):
+        self.by_key = Dispatcher({'click': event_schema('click', 'int'),
+                                  'search': event_schema('search', 'string', lazy=True)},
+                                 key='kind')
+        self.by_component = Dispatcher({
+            'person': Schema({'person': {'type': 'map', 'items': [{'name': {'type': 'string'}}]}}),
+            'city': Schema({'city': {'type': 'string'},
+                            'country': {'type': 'string', 'required': False}})})
+
+    def assert_error(self, dispatcher, record, path, msg):
+        with self.assertRaises(ValidationError) as context:
+            dispatcher.validate(record)
+        self.assertEqual(context.exception.path, path)
+        self.assertEqual(context.exception.msg, msg)
+
+    def test_discriminator_key(self):
+        self.assertEqual(self.by_key.validate({'kind': 'click', 'click': {'value': 1}}), 'click')
+        self.assertEqual(self.by_key.validate({'kind': 'search', 'search': {'value': 'q'}}),
+                         'search')
+        self.assert_error(self.by_key, {'kind': 'click', 'click': {'value': 'x'}},
+                          'click.value', 'Expected type: int')
+        self.assert_error(self.by_key, {'kind': 'view'}, 'kind', 'Unknown discriminator: "view"')
+        self.assert_error(self.by_key, {'kind': ['click']}, 'kind',
+                          'Unknown discriminator: "[\'click\']"')
+        self.assert_error(self.by_key, {'click': {'value': 1}}, '', 'Missing discriminator: "kind"')
+        self.assert_error(self.by_key, [], '', 'Expected type: map')
+
+    def test_component_names(self):
+        self.assertEqual(self.by_component.validate({'person': {'name': 'x'}}), 'person')
+        self.assertEqual(self.by_component.validate({'country': 'y', 'city': 'x'}), 'city')
+        self.assert_error(self.by_component, {'city': 'x', 'person': {'name': 'x'}},
+                          '', 'Unexpected item: "person"')
+        self.assert_error(self.by_component, {'planet': 'x'}, '', 'Unexpected item: "planet"')
+        self.assert_error(self.by_component, {}, '', 'No components found')
+        with self.assertRaises(ValueError):
+            Dispatcher({'a': Schema({'x': {'type': 'int'}}), 'b': Schema({'x': {'type': 'int'}})})
+
+    def test_check(self):
+        self.assertEqual(self.by_key.check({'kind': 'click', 'click': {'value': 1}}),
+                         ('click', None))
+        name, error = self.by_key.check({'kind': 'click', 'click': {'value': 'x'}})
+        self.assertEqual((name, error.path), ('click', 'click.value'))
+        name, error = self.by_key.check({'kind': 'view'})
+        self.assertEqual((name, error.msg), (None, 'Unknown discriminator: "view"'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import unittest
+import io
+import json
+import os
+import sys
+
+import yaml
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from error import ValidationError   # pylint: disable=no-name-in-module, wrong-import-position
+from events import json_events, validate_events, value_events, ValueBuilder  # pylint: disable=import-error, wrong-import-position
+from schema import Schema           # pylint: disable=import-error, wrong-import-position
+
+
+class TestEvents(unittest.TestCase):
+    def setUp(self):
+        data_file_name = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                      'data/validation.yml'))
+        with open(data_file_name) as validation_data:
+            self.test_data = yaml.load(validation_data)
+
+    def assert_same_result(self, schema, data, validate):
+        try:
+            expected = schema.validate(data)
+        except ValidationError as error:
+            with self.assertRaises(ValidationError) as context:
+                validate()
+            self.assertEqual(context.exception.msg, error.msg)
+            self.assertEqual(context.exception.path, error.path)
+        else:
+            self.assertEqual(validate(), expected)
+
+    def test_validation_cases_json(self):
+        for test_case_name in self.test_data:
+            with self.subTest(test_case_name):
+                schema = Schema(self.test_data[test_case_name]['schema'])
+                data = self.test_data[test_case_name]['data']
+                text = json.dumps(data)
+                self.assert_same_result(schema, data, lambda: schema.validate_events(
+                    io.StringIO(text), 'json'))
+
+    def test_validation_cases_yaml(self):
+        for test_case_name in self.test_data:
+            with self.subTest(test_case_name):
+                schema = Schema(self.test_data[test_case_name]['schema'])
+                data = self.test_data[test_case_name]['data']
+                text = yaml.safe_dump(data)
+                self.assert_same_result(schema, data, lambda: schema.validate_events(
+                    io.StringIO(text), 'yaml'))
+
+    def test_stops_at_first_violation(self):
+        schema = Schema(self.test_data['simple_list']['schema'])
+        consumed = []
+
+        def events():
+            for event in value_events({'sequence': [{'int': 'one'}] + [{'int': 2}] * 100}):
+                consumed.append(event)
+                yield event
+
+        with self.assertRaises(ValidationError) as context:
+            validate_events(schema.schema, events())
+        self.assertEqual(context.exception.path, 'sequence.items[0]')
+        self.assertEqual(len(consumed), 6)
+
+    def test_list_item_is_not_a_map(self):
+        schema = Schema(self.test_data['simple_list']['schema'])
+        data = {'sequence': [{'int': 1}, 5]}
+        for validate in (schema.validate, lambda doc: validate_events(schema.schema,
+                                                                     value_events(doc))):
+            with self.assertRaises(ValidationError) as context:
+                validate(data)
+            self.assertEqual(context.exception.path, 'sequence.items[1]')
+            self.assertEqual(context.exception.msg, 'Expected type: map')
+
+    def test_yaml_aliases(self):
+        schema = Schema(self.test_data['recursive_map']['schema'])
+        valid = ('node:\n'
+                 '    data: 1\n'
+                 '    left: &child\n'
+                 '        data: &number 2\n'
+                 '    right:\n'
+                 '        data: *number\n'
+                 '        left: *child\n')
+        invalid = ('node:\n'
+                   '    data: 1\n'
+                   '    left: &child\n'
+                   '        data: 2\n'
+                   '    right:\n'
+                   '        data: 3\n'
+                   '        left: *child\n'
+                   '        right: &bad\n'
+                   '            data: two\n')
+        for text in (valid, invalid):
+            data = yaml.safe_load(text)
+            self.assert_same_result(schema, data, lambda: schema.validate_events(
+                io.StringIO(text), 'yaml'))
+
+    def test_max_nodes(self):
+        schema = Schema.from_file(os.path.join(os.path.dirname(__file__),
+                                               '../examples/tree/tree_schema.yml'), use_cache=False)
+        text = json.dumps({'tree': {'data': 1, 'left': {'data': 2, 'left': {'data': 3}}}})
+        self.assertTrue(schema.validate_events(io.StringIO(text), 'json', max_nodes=7))
+        with self.assertRaises(ValidationError) as error:
+            schema.validate_events(io.StringIO(text), 'json', max_nodes=6)
+        self.assertEqual(error.exception.path, 'tree.left.left')
+        self.assertEqual(error.exception.msg, 'Too many nodes: max=6')
+        with self.assertRaises(ValueError):
+            schema.validate_events(io.StringIO(text), 'json', max_nodes=0)
+
+    def test_max_nodes_alias_bomb(self):
+        schema = Schema.from_file(os.path.join(os.path.dirname(__file__),
+                                               '../examples/tree/tree_schema.yml'), use_cache=False)
+        tree = '{data: 0}'
+        for level in range(1, 40):
+            tree = '{{data: {0}, left: &t{0} {1}, right: *t{0}}}'.format(level, tree)
+        with self.assertRaises(ValidationError) as error:
+            schema.validate_events(io.StringIO('tree: ' + tree), 'yaml', max_nodes=1000)
+        self.assertEqual(error.exception.msg, 'Too many nodes: max=1000')
+
+    def test_unsupported_keys(self):
+        schema = Schema(self.test_data['recursive_map']['schema'])
+        merge = ('node:\n'
+                 '    data: 1\n'
+                 '    left: &child\n'
+                 '        data: 2\n'
+                 '    right:\n'
+                 '        <<: *child\n')
+        with self.assertRaisesRegex(ValueError, 'merge keys'):
+            schema.validate_events(io.StringIO(merge), 'yaml')
+        with self.assertRaisesRegex(ValueError, 'Duplicate key "data" at "node"'):
+            schema.validate_events(io.StringIO('{"node": {"data": 1, "data": "x"}}'), 'json')
+        with self.assertRaisesRegex(ValueError, 'Duplicate key "node" at ""'):
+            schema.validate_events(io.StringIO('node: {data: 1}\nnode: {data: 2}\n'), 'yaml')
+
+    def test_json_tokenizer(self):
+        doc = {'a': [1, -2.5e3, True, False, None, 'x\\"yé'], 'b': {}, 'c': [[], {'d': 0}]}
+        text = json.dumps(doc, indent=2)
+        for chunk_size in (1, 2, 3, 7, 65536):
+            builder = ValueBuilder()
+            for kind, value in json_events(io.StringIO(text), chunk_size):
+                builder.event(kind, value)
+            self.assertEqual(builder.value, doc)
+
+    def test_json_tokenizer_errors(self):
+        for text in ('{"a": 1', '{"a" 1}', '[1,]', '{"a": tru}', '[1] 2', ''):
+            with self.subTest(text):
+                with self.assertRaises(ValueError):
+                    list(json_events(io.StringIO(text), 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import os
+import sys
+
+import yaml
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../bench')))
+
+from error import ValidationError       # pylint: disable=no-name-in-module, wrong-import-position
+from generator import MUTATIONS, DocumentGenerator  # pylint: disable=import-error, wrong-import-position
+from schema import Schema               # pylint: disable=import-error, wrong-import-position
+
+EXAMPLES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../examples'))
+
+
+class TestGenerator(unittest.TestCase):
+    def setUp(self):
+        self.schemas = {}
+        for name in ('library', 'person', 'tree'):
+            with open(os.path.join(EXAMPLES_DIR, name, name + '_schema.yml')) as schema_file:
+                self.schemas[name] = Schema(yaml.safe_load(schema_file))
+
+    def test_valid_documents(self):
+        for name, schema in self.schemas.items():
+            with self.subTest(name):
+                for doc in DocumentGenerator(schema, seed=3).documents(50):
+                    self.assertTrue(schema.validate(doc))
+
+    def test_invalid_documents(self):
+        for name, schema in self.schemas.items():
+            with self.subTest(name):
+                generator = DocumentGenerator(schema, seed=3)
+                for _ in range(20):
+                    with self.assertRaises(ValidationError):
+                        schema.validate(generator.invalid())
+
+    def test_is_valid(self):
+        for name, schema in self.schemas.items():
+            with self.subTest(name):
+                generator = DocumentGenerator(schema, seed=11)
+                for doc in generator.documents(30):
+                    self.assertTrue(schema.is_valid(doc))
+                for _ in range(30):
+                    self.assertFalse(schema.is_valid(generator.invalid()))
+
+    def test_mutations(self):
+        schema = Schema({'values': {'type': 'list', 'max': 3, 'item_types': ['int']}})
+        generator = DocumentGenerator(schema)
+        for mutation in MUTATIONS:
+            with self.subTest(mutation):
+                with self.assertRaises(ValidationError):
+                    schema.validate(generator.invalid(mutation))
+
+    def test_seed_is_deterministic(self):
+        schema = self.schemas['library']
+        self.assertEqual(DocumentGenerator(schema, seed=7).documents(10),
+                         DocumentGenerator(schema, seed=7).documents(10))
+
+
+if __name__ == '__main__':
+    unittest.main()
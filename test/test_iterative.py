@@ -0,0 +1,78 @@
+import unittest
+import os
+import sys
+
+import yaml
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from error import ValidationError   # pylint: disable=no-name-in-module, wrong-import-position
+from schema import Schema           # pylint: disable=import-error, wrong-import-position
+
+EXAMPLES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../examples'))
+
+
+def deep_tree(depth, leaf_data=0):
+    tree = {'data': leaf_data}
+    for i in range(depth):
+        tree = {'data': i, 'left': tree}
+    return {'tree': tree}
+
+
+class TestIterative(unittest.TestCase):
+    def setUp(self):
+        data_file_name = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                      'data/validation.yml'))
+        with open(data_file_name) as validation_data:
+            self.test_data = yaml.load(validation_data)
+        self.tree_schema = Schema.from_file(os.path.join(EXAMPLES_DIR, 'tree/tree_schema.yml'),
+                                            use_cache=False)
+
+    def assert_same_result(self, schema, data):
+        try:
+            expected = schema.validate(data)
+        except ValidationError as error:
+            with self.assertRaises(ValidationError) as context:
+                schema.validate(data, engine='iterative')
+            self.assertEqual(context.exception.msg, error.msg)
+            self.assertEqual(context.exception.path, error.path)
+        except TypeError:
+            with self.assertRaises(TypeError):
+                schema.validate(data, engine='iterative')
+        else:
+            self.assertEqual(schema.validate(data, engine='iterative'), expected)
+
+    def test_validation_cases(self):
+        for test_case_name in self.test_data:
+            with self.subTest(test_case_name):
+                schema = Schema(self.test_data[test_case_name]['schema'])
+                self.assert_same_result(schema, self.test_data[test_case_name]['data'])
+
+    def test_shallow_tree(self):
+        self.assert_same_result(self.tree_schema, deep_tree(50))
+        self.assert_same_result(self.tree_schema, deep_tree(50, 'leaf'))
+
+    def test_list_item_is_not_a_map(self):
+        schema = Schema(self.test_data['simple_list']['schema'])
+        for item in (5, None, 'int', ['int'], [{'int': 1}]):
+            with self.subTest(item=item):
+                self.assert_same_result(schema, {'sequence': [{'int': 1}, item]})
+                with self.assertRaises(ValidationError) as context:
+                    schema.validate({'sequence': [{'int': 1}, item]}, engine='iterative')
+                self.assertEqual(context.exception.path, 'sequence.items[1]')
+
+    def test_deep_tree(self):
+        depth = sys.getrecursionlimit() * 5
+        self.assertTrue(self.tree_schema.validate(deep_tree(depth), engine='iterative'))
+        with self.assertRaises(ValidationError) as context:
+            self.tree_schema.validate(deep_tree(depth, 'leaf'), engine='iterative')
+        self.assertEqual(context.exception.msg, 'Expected type: int')
+        self.assertEqual(context.exception.path, 'tree' + '.left' * depth + '.data')
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            self.tree_schema.validate(deep_tree(1), engine='unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
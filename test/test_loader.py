@@ -0,0 +1,83 @@
+import unittest
+import json
+import os
+import sys
+
+import yaml
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import loader                       # pylint: disable=import-error, wrong-import-position
+from schema import Schema           # pylint: disable=import-error, wrong-import-position
+
+EXAMPLES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../examples'))
+
+
+class TestLoader(unittest.TestCase):
+    def test_loaders_agree(self):
+        for name in ('library', 'person', 'tree'):
+            json_name = os.path.join(EXAMPLES_DIR, name, name + '.json')
+            yaml_name = os.path.join(EXAMPLES_DIR, name, name + '.yml')
+            with open(json_name) as json_file:
+                expected = json.load(json_file)
+            for loader_name in loader.loader_names():
+                with self.subTest(name=name, loader=loader_name):
+                    self.assertEqual(loader.load_file(json_name, loader_name), expected)
+                    self.assertEqual(loader.load_file(yaml_name, loader_name), expected)
+
+    def test_auto_prefers_fast_loaders(self):
+        if hasattr(yaml, 'CSafeLoader'):
+            self.assertIs(loader.get_loader('yaml'), loader.load_yaml)
+        self.assertIs(loader.get_loader('yaml', 'yaml'), loader.load_pure_yaml)
+        self.assertIs(loader.get_loader('json', 'json'), json.loads)
+        self.assertIs(loader.get_loader('json', 'yaml'), loader.get_loader('json'))
+
+    def test_json_corner_cases(self):
+        content = b'{"big": 123456789012345678901234567890, "nan": NaN}'
+        for loader_name in loader.loader_names():
+            with self.subTest(loader_name):
+                doc = loader.load_content(content, 'json', loader_name)
+                self.assertEqual(doc['big'], 123456789012345678901234567890)
+                self.assertNotEqual(doc['nan'], doc['nan'])
+                with self.assertRaises(ValueError):
+                    loader.load_content(b'{"a": ', 'json', loader_name)
+
+    def test_yaml_is_safe(self):
+        content = b'!!python/object/apply:os.system ["true"]'
+        for loader_name in loader.loader_names():
+            with self.subTest(loader_name):
+                with self.assertRaises(yaml.YAMLError):
+                    loader.load_content(content, 'yaml', loader_name)
+
+    def test_unknown_loader_and_format(self):
+        with self.assertRaises(ValueError):
+            loader.get_loader('json', 'simdjson')
+        with self.assertRaises(ValueError):
+            loader.load_file('data.txt')
+        self.assertEqual(loader.format_of('data.yaml'), 'yaml')
+
+    def test_register_loader(self):
+        calls = []
+
+        def load(content):
+            calls.append(content)
+            return json.loads(content)
+
+        loader.register_loader('custom', 'json', load, preferred=True)
+        try:
+            self.assertEqual(loader.load_content(b'[1]', 'json'), [1])
+            self.assertEqual(calls, [b'[1]'])
+        finally:
+            del loader.LOADERS['custom']
+            loader.PREFERENCES['json'].remove('custom')
+
+    def test_schema_loader_option(self):
+        schema_name = os.path.join(EXAMPLES_DIR, 'tree/tree_schema.yml')
+        for loader_name in loader.loader_names():
+            with self.subTest(loader_name):
+                schema = Schema.from_file(schema_name, use_cache=False, loader=loader_name)
+                self.assertIn('tree', schema.descriptors)
+
+
+if __name__ == '__main__':
+    unittest.main()
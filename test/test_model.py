@@ -0,0 +1,103 @@
+import pickle
+import unittest
+import os
+import sys
+
+import yaml
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../bench')))
+
+from error import ValidationError       # pylint: disable=no-name-in-module, wrong-import-position
+from generator import DocumentGenerator  # pylint: disable=import-error, wrong-import-position
+from loader import load_file            # pylint: disable=import-error, wrong-import-position
+from model import Model                 # pylint: disable=import-error, wrong-import-position
+from schema import Schema               # pylint: disable=import-error, wrong-import-position
+
+EXAMPLES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../examples'))
+
+
+class TestModel(unittest.TestCase):
+    def setUp(self):
+        self.schemas = {}
+        for name in ('library', 'person', 'tree'):
+            with open(os.path.join(EXAMPLES_DIR, name, name + '_schema.yml')) as schema_file:
+                self.schemas[name] = Schema(yaml.safe_load(schema_file))
+
+    def test_library(self):
+        schema = self.schemas['library']
+        library = schema.load(load_file(os.path.join(EXAMPLES_DIR, 'library/library.json')))
+        book = schema.model_class('book')
+        self.assertIsInstance(library, schema.model_class('__schema__'))
+        self.assertIsInstance(library.library, list)
+        self.assertTrue(all(isinstance(item, book) for item in library.library))
+        self.assertEqual(library.library[0].year, 1929)
+        self.assertIsNone(library.book)
+        self.assertFalse(hasattr(library.library[0], '__dict__'))
+        self.assertEqual(library.library[0], book(author=library.library[0].author,
+                                                  title=library.library[0].title, year=1929))
+        with self.assertRaises(TypeError):
+            book(isbn='1')
+        with self.assertRaises(ValueError):
+            schema.model_class('library')
+
+    def test_errors_match_validation(self):
+        for name, schema in self.schemas.items():
+            with self.subTest(name):
+                generator = DocumentGenerator(schema, seed=5)
+                for doc in generator.documents(30):
+                    self.assertIsInstance(schema.load(doc), Model)
+                for _ in range(30):
+                    doc = generator.invalid()
+                    with self.assertRaises(ValidationError) as expected:
+                        schema.validate(doc)
+                    with self.assertRaises(ValidationError) as actual:
+                        schema.load(doc)
+                    self.assertEqual((actual.exception.path, actual.exception.msg),
+                                     (expected.exception.path, expected.exception.msg))
+
+    def test_attribute_names(self):
+        schema = Schema({'doc': {'type': 'map', 'items': [
+            {'first-name': {'type': 'string'}}, {'first_name': {'type': 'string'}},
+            {'class': {'type': 'int'}}, {'_fields': {'type': 'int', 'required': False}},
+            {1: {'type': 'int', 'required': False}}]}})
+        doc = schema.load({'doc': {'first-name': 'a', 'first_name': 'b', 'class': 1, 1: 2}})
+        self.assertEqual(getattr(type(doc.doc), '_fields'),
+                         {'first-name': 'first_name', 'first_name': 'first_name_',
+                          'class': 'class_', '_fields': '_fields_', 1: '_1'})
+        self.assertEqual((doc.doc.first_name, doc.doc.first_name_, doc.doc.class_,
+                          getattr(doc.doc, '_1')), ('a', 'b', 1, 2))
+        self.assertIsNone(getattr(doc.doc, '_fields_'))
+
+    def test_list_item_shape(self):
+        schema = Schema({'sequence': {'type': 'list', 'item_types': ['int', 'a']},
+                         'a': {'type': 'map', 'required': False,
+                               'items': [{'b': {'type': 'int'}}]}})
+        for item in (5, None, 'ab', ('int',), [{'int': 1}], {'int': 'x', 'a': {'b': 1}},
+                     {'int': 1, 'c': 2}):
+            doc = {'sequence': [{'int': 1}, item]}
+            with self.subTest(item=item):
+                with self.assertRaises(ValidationError) as expected:
+                    schema.validate(doc)
+                with self.assertRaises(ValidationError) as actual:
+                    schema.load(doc)
+                self.assertEqual((actual.exception.path, actual.exception.msg),
+                                 (expected.exception.path, expected.exception.msg))
+        for item in ({'int': 1, 'a': {'b': 2}}, {}):
+            doc = {'sequence': [{'int': 1}, item]}
+            with self.subTest(item=item):
+                self.assertTrue(schema.validate(doc))
+                with self.assertRaises(ValidationError) as actual:
+                    schema.load(doc)
+                self.assertEqual(actual.exception.path, 'sequence.items[1]')
+                self.assertEqual(actual.exception.msg,
+                                 'Expected a single type: found={0}'.format(len(item)))
+
+    def test_recursive_and_pickled_schema(self):
+        schema = pickle.loads(pickle.dumps(self.schemas['tree']))
+        for doc in DocumentGenerator(schema, seed=2).documents(10):
+            self.assertIsInstance(schema.load(doc), schema.model_class('__schema__'))
+
+
+if __name__ == '__main__':
+    unittest.main()
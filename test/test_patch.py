@@ -0,0 +1,175 @@
+import copy
+import random
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from error import ValidationError   # pylint: disable=no-name-in-module, wrong-import-position
+from loader import load_file        # pylint: disable=import-error, wrong-import-position
+from patch import parse_pointer     # pylint: disable=import-error, wrong-import-position
+from schema import Schema           # pylint: disable=import-error, wrong-import-position
+
+EXAMPLES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../examples'))
+
+
+def book(title, year=1900):
+    return {'book': {'author': 'A', 'title': title, 'year': year}}
+
+
+class TestPatch(unittest.TestCase):
+    def setUp(self):
+        self.schema = Schema.from_file(os.path.join(EXAMPLES_DIR, 'library/library_schema.yml'),
+                                       use_cache=False)
+        self.doc = load_file(os.path.join(EXAMPLES_DIR, 'library/library.json'))
+        self.list_schema = Schema({'sequence': {'type': 'list', 'required': False, 'min': 2,
+                                                'max': 3, 'item_types': ['int']}})
+
+    def assert_error(self, schema, doc, patch, path, msg):
+        with self.assertRaises(ValidationError) as context:
+            schema.revalidate(doc, patch)
+        self.assertEqual(context.exception.path, path)
+        self.assertEqual(context.exception.msg, msg)
+        with self.assertRaises(ValidationError) as context:
+            schema.validate(doc)
+        self.assertEqual(context.exception.path, path)
+        self.assertEqual(context.exception.msg, msg)
+
+    def test_parse_pointer(self):
+        self.assertEqual(parse_pointer(''), [])
+        self.assertEqual(parse_pointer('/a~1b/~01/0'), ['a/b', '~1', '0'])
+        with self.assertRaises(ValueError):
+            parse_pointer('a')
+
+    def test_valid_patch(self):
+        patch = [{'op': 'replace', 'path': '/library/1/book/title', 'value': 'Ecce Homo'},
+                 {'op': 'add', 'path': '/library/-', 'value': book('Emma')},
+                 {'op': 'remove', 'path': '/library/0'},
+                 {'op': 'test', 'path': '/library/2/book/title', 'value': 'Emma'}]
+        doc = self.schema.revalidate(self.doc, patch)
+        self.assertIs(doc, self.doc)
+        self.assertEqual([item['book']['title'] for item in doc['library']],
+                         ['Ecce Homo', 'Moby Dick', 'Emma'])
+
+    def test_touched_values(self):
+        self.assert_error(self.schema, self.doc,
+                          [{'op': 'replace', 'path': '/library/1/book/year', 'value': 'x'}],
+                          'library.items[1].year', 'Expected type: int')
+        self.doc = load_file(os.path.join(EXAMPLES_DIR, 'library/library.json'))
+        self.assert_error(self.schema, self.doc,
+                          [{'op': 'add', 'path': '/library/1', 'value': {'cd': {}}}],
+                          'library', 'Unexpected type: "cd"')
+        self.doc = load_file(os.path.join(EXAMPLES_DIR, 'library/library.json'))
+        self.assert_error(self.schema, self.doc,
+                          [{'op': 'add', 'path': '/library/0/book/isbn', 'value': '1'}],
+                          'library.items[0]', 'Unexpected item: "isbn"')
+
+    def test_removed_items(self):
+        self.assert_error(self.schema, self.doc,
+                          [{'op': 'remove', 'path': '/library/2/book/author'}],
+                          'library.items[2]', 'Missing required item: "author"')
+        doc = load_file(os.path.join(EXAMPLES_DIR, 'library/library.json'))
+        patch = [{'op': 'remove', 'path': '/library/2/book/author'},
+                 {'op': 'add', 'path': '/library/2/book/author', 'value': 'B'}]
+        self.assertTrue(self.schema.revalidate(doc, patch))
+
+    def test_list_length(self):
+        doc = {'sequence': [{'int': 1}, {'int': 2}, {'int': 3}]}
+        self.assert_error(self.list_schema, doc,
+                          [{'op': 'add', 'path': '/sequence/0', 'value': {'int': 0}}],
+                          'sequence', 'Too many list items: max=3')
+        doc = {'sequence': [{'int': 1}, {'int': 2}]}
+        self.assert_error(self.list_schema, doc, [{'op': 'remove', 'path': '/sequence/1'}],
+                          'sequence', 'Too few list items: min=2')
+        doc = {'sequence': [{'int': 1}, {'int': 2}]}
+        patch = [{'op': 'remove', 'path': '/sequence/1'},
+                 {'op': 'add', 'path': '/sequence/0', 'value': {'int': 0}}]
+        self.assertEqual(self.list_schema.revalidate(doc, patch),
+                         {'sequence': [{'int': 0}, {'int': 1}]})
+
+    def test_shifted_targets(self):
+        patch = [{'op': 'replace', 'path': '/library/1/book/title', 'value': 5},
+                 {'op': 'add', 'path': '/library/0', 'value': book('Emma')}]
+        self.assert_error(self.schema, self.doc, patch,
+                          'library.items[2].title', 'Expected type: string')
+        doc = load_file(os.path.join(EXAMPLES_DIR, 'library/library.json'))
+        patch = [{'op': 'replace', 'path': '/library/1/book/title', 'value': 5},
+                 {'op': 'remove', 'path': '/library/1'}]
+        self.assertTrue(self.schema.revalidate(doc, patch))
+
+    def test_move_and_copy(self):
+        patch = [{'op': 'copy', 'from': '/library/0', 'path': '/library/-'},
+                 {'op': 'move', 'from': '/library/0', 'path': '/library/1'}]
+        doc = self.schema.revalidate(self.doc, patch)
+        self.assertEqual([item['book']['year'] for item in doc['library']],
+                         [1883, 1929, 1851, 1929])
+        self.assertIsNot(doc['library'][1], doc['library'][3])
+        self.assert_error(self.schema, doc,
+                          [{'op': 'move', 'from': '/library/0/book/title',
+                            'path': '/library/1/book/name'}],
+                          'library.items[0]', 'Missing required item: "title"')
+
+    def test_replace_document(self):
+        doc = self.schema.revalidate(self.doc, [{'op': 'replace', 'path': '',
+                                                 'value': {'library': [book('Emma')]}}])
+        self.assertEqual(doc, {'library': [book('Emma')]})
+        with self.assertRaises(ValidationError):
+            self.schema.revalidate(doc, [{'op': 'replace', 'path': '', 'value': {}}])
+
+    def test_invalid_patch(self):
+        for operation in ({'op': 'remove', 'path': '/library/9'},
+                          {'op': 'replace', 'path': '/missing', 'value': 1},
+                          {'op': 'test', 'path': '/library/0/book/year', 'value': 1},
+                          {'op': 'move', 'from': '/library', 'path': '/library/0'},
+                          {'op': 'add', 'path': '/library/01', 'value': book('x')},
+                          {'op': 'other', 'path': ''}):
+            with self.assertRaises(ValueError):
+                self.schema.revalidate(copy.deepcopy(self.doc), [operation])
+
+    def test_failed_patch_is_undone(self):
+        original = copy.deepcopy(self.doc)
+        patch = [{'op': 'replace', 'path': '/library/1/book/title', 'value': 'Ecce Homo'},
+                 {'op': 'add', 'path': '/library/0/book/isbn', 'value': '1'},
+                 {'op': 'move', 'from': '/library/2', 'path': '/library/0'},
+                 {'op': 'remove', 'path': '/library/1/book/author'},
+                 {'op': 'add', 'path': '/library/-', 'value': book('Emma')},
+                 {'op': 'remove', 'path': '/library/9'}]
+        with self.assertRaises(ValueError):
+            self.schema.revalidate(self.doc, patch)
+        self.assertEqual(self.doc, original)
+
+    def test_random_patches(self):
+        rand = random.Random(7)
+        values = ['t', 1, None, {'x': 1}]
+        for _ in range(300):
+            doc = {'library': [book('b{0}'.format(i), i) for i in range(5)]}
+            patch = []
+            for _ in range(rand.randint(1, 4)):
+                length = len(doc['library']) + sum(
+                    1 if op['op'] == 'add' else -1 if op['op'] == 'remove' else 0 for op in patch)
+                choice = rand.randint(0, 4)
+                if choice == 0 or length == 0:
+                    patch.append({'op': 'add', 'path': '/library/{0}'.format(rand.randint(0, length)),
+                                  'value': book('n', rand.choice([1, 'y']))})
+                elif choice == 1:
+                    patch.append({'op': 'remove', 'path': '/library/{0}'.format(
+                        rand.randrange(length))})
+                else:
+                    patch.append({'op': 'replace', 'path': '/library/{0}/book/{1}'.format(
+                        rand.randrange(length), rand.choice(['title', 'year', 'author'])),
+                                  'value': rand.choice(values)})
+            incremental = True
+            try:
+                self.schema.revalidate(doc, patch)
+            except ValidationError:
+                incremental = False
+            try:
+                full = self.schema.validate(doc)
+            except ValidationError:
+                full = False
+            self.assertEqual(incremental, full, patch)
+
+
+if __name__ == '__main__':
+    unittest.main()
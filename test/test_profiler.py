@@ -0,0 +1,88 @@
+import unittest
+import itertools
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from descriptor import SamplingPolicy, ValidationContext  # pylint: disable=import-error, wrong-import-position
+from error import ValidationError           # pylint: disable=no-name-in-module, wrong-import-position
+from profiler import ValidationProfiler     # pylint: disable=import-error, wrong-import-position
+from schema import Schema                   # pylint: disable=import-error, wrong-import-position
+
+EXAMPLES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../examples'))
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.schema = Schema.from_file(os.path.join(EXAMPLES_DIR, 'library/library_schema.yml'),
+                                       use_cache=False)
+        self.data = {'library': [{'book': {'title': 'Ulysses', 'author': 'James Joyce',
+                                           'year': 1922}},
+                                 {'book': {'title': 'Dubliners', 'author': 'James Joyce',
+                                           'year': 1914}}]}
+        self.profiler = ValidationProfiler(clock=itertools.count().__next__)
+
+    def test_stats_per_type_item(self):
+        self.assertTrue(self.schema.validate(self.data, profiler=self.profiler))
+        stats = self.profiler.stats()
+        self.assertEqual(sorted(stats), ['(document)', 'book.author', 'book.title', 'book.year',
+                                         'library', 'library.items[*].book'])
+        self.assertEqual(stats['library.items[*].book']['type'], 'book')
+        self.assertEqual(stats['library.items[*].book']['calls'], 2)
+        self.assertEqual(stats['library.items[*].book']['nodes'], 8)
+        self.assertEqual(stats['(document)']['nodes'], 10)
+        self.assertEqual(stats['book.year']['total'], 2)
+        self.assertEqual(stats['library.items[*].book']['self'],
+                         stats['library.items[*].book']['total'] - 6)
+
+    def test_recursive_type(self):
+        schema = Schema.from_file(os.path.join(EXAMPLES_DIR, 'tree/tree_schema.yml'),
+                                  use_cache=False)
+        tree = {'data': 0}
+        for index in range(1, 30):
+            tree = {'data': index, 'left': tree, 'right': {'data': -index}}
+        self.assertTrue(schema.validate({'tree': tree}, profiler=self.profiler))
+        stats = self.profiler.stats()
+        self.assertEqual(sorted(stats), ['(document)', 'tree', 'tree.data', 'tree.left',
+                                         'tree.right'])
+        self.assertEqual(stats['tree.left']['calls'], 29)
+        self.assertEqual(stats['tree.data']['calls'], 59)
+        self.assertIn('(document);tree;left;left;data', self.profiler.collapsed())
+
+    def test_collapsed_stacks(self):
+        self.schema.validate(self.data, profiler=self.profiler)
+        lines = self.profiler.collapsed().splitlines()
+        self.assertIn('(document);library;items[*].book;year 2000000', lines)
+        self.assertEqual(len(lines), 6)
+
+    def test_schema_is_not_modified(self):
+        descriptors = dict(self.schema.descriptors)
+        counter = itertools.count()
+
+        def clock():
+            self.assertEqual(self.schema.descriptors, descriptors)
+            return next(counter)
+
+        profiler = ValidationProfiler(clock=clock)
+        with self.assertRaises(ValidationError) as context:
+            self.schema.validate({'library': [{'book': {'title': 'Ulysses'}}]}, profiler=profiler)
+        self.assertEqual(context.exception.path, 'library.items[0]')
+        self.assertEqual(self.schema.descriptors, descriptors)
+        self.assertIn('library.items[*].book', profiler.report())
+
+    def test_sampled_lists(self):
+        context = ValidationContext()
+        context.sample(self.schema.descriptors['library'], 'library', SamplingPolicy(first=1))
+        self.data['library'][1]['book']['year'] = 'x'
+        self.assertTrue(self.schema.validate(self.data, context=context, profiler=self.profiler))
+        self.assertEqual(context.coverage, {'library': (1, 2)})
+        self.assertEqual(self.profiler.stats()['library.items[*].book']['calls'], 1)
+
+    def test_only_recursive_engine(self):
+        with self.assertRaises(ValueError):
+            self.schema.validate(self.data, engine='iterative', profiler=self.profiler)
+
+
+if __name__ == '__main__':
+    unittest.main()
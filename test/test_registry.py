@@ -0,0 +1,76 @@
+import unittest
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from registry import SchemaRegistry, definition_key     # pylint: disable=import-error, wrong-import-position
+
+
+def person_schema(age_type='int'):
+    return {'person': {'type': 'map',
+                       'items': [{'name': {'type': 'string'}},
+                                 {'age': {'type': age_type, 'required': False}}]}}
+
+
+class TestRegistry(unittest.TestCase):
+    def test_hit_and_miss(self):
+        registry = SchemaRegistry()
+        schema = registry.get(person_schema())
+        self.assertIs(registry.get(person_schema()), schema)
+        self.assertEqual(registry.stats()['hits'], 1)
+        self.assertEqual(registry.stats()['misses'], 1)
+
+    def test_canonical_key(self):
+        reordered = {'person': {'items': [{'name': {'type': 'string'}},
+                                          {'age': {'required': False, 'type': 'int'}}],
+                                'type': 'map'}}
+        self.assertEqual(definition_key(person_schema()), definition_key(reordered))
+        self.assertNotEqual(definition_key(person_schema()), definition_key(person_schema('float')))
+        swapped = {'person': {'type': 'map',
+                              'items': [{'age': {'type': 'int', 'required': False}},
+                                        {'name': {'type': 'string'}}]}}
+        self.assertNotEqual(definition_key(person_schema()), definition_key(swapped))
+
+    def test_lru_eviction(self):
+        registry = SchemaRegistry(max_entries=2)
+        int_schema = registry.get(person_schema('int'))
+        registry.get(person_schema('float'))
+        registry.get(person_schema('int'))
+        registry.get(person_schema('bool'))
+        self.assertEqual(len(registry), 2)
+        self.assertEqual(registry.stats()['evictions'], 1)
+        self.assertIs(registry.get(person_schema('int')), int_schema)
+        registry.get(person_schema('float'))
+        self.assertEqual(registry.stats()['misses'], 4)
+
+    def test_size_bound(self):
+        registry = SchemaRegistry(max_entries=100, max_bytes=1)
+        registry.get(person_schema('int'))
+        registry.get(person_schema('float'))
+        self.assertEqual(len(registry), 1)
+        self.assertGreater(registry.stats()['bytes'], 0)
+
+    def test_threads_share_schema(self):
+        registry = SchemaRegistry()
+        schemas = []
+
+        def worker():
+            for _ in range(50):
+                schemas.append(registry.get(person_schema()))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(registry), 1)
+        stats = registry.stats()
+        self.assertEqual(stats['hits'] + stats['misses'], 200)
+        shared = registry.get(person_schema())
+        self.assertTrue(all(schema is shared for schema in schemas[-10:]))
+
+
+if __name__ == '__main__':
+    unittest.main()
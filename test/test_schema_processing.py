@@ -1,3 +1,4 @@
+import pickle
 import unittest
 import os
 import sys
@@ -7,7 +8,7 @@ import yaml
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
 from descriptor import BoolDescriptor, IntDescriptor, FloatDescriptor, StringDescriptor, MapDescriptor, ListDescriptor # pylint: disable=import-error, wrong-import-position, line-too-long
-from error import SchemaError       # pylint: disable=no-name-in-module, wrong-import-position
+from error import SchemaError, ValidationError   # pylint: disable=no-name-in-module, wrong-import-position
 from schema import Schema           # pylint: disable=import-error, wrong-import-position
 
 
@@ -214,6 +215,31 @@ class TestSchemaProcessing(unittest.TestCase):
         self.assertTrue(isinstance(schema.descriptors['a'], MapDescriptor))
         self.assertTrue(isinstance(schema.descriptors['b'], MapDescriptor))
         self.assertEqual(len(schema.descriptors), 6)
+        self.assertEqual(schema.schema.items['b'].item_type, 'b')
+
+    def test_alias_of_later_map_type(self):
+        test_case_name = 'alias_of_later_map_type'
+        schema = Schema(self.test_data[test_case_name]['schema'])
+        self.assertIs(schema.descriptors['human'], schema.descriptors['person'])
+        self.assertEqual(schema.schema.items['person'].item_type, 'person')
+        self.assertEqual(len(schema.descriptors), 6)
+
+    def test_circular_alias(self):
+        test_case_name = 'circular_alias'
+        with self.assertRaises(SchemaError) as context:
+            Schema(self.test_data[test_case_name]['schema'])
+        self.assertEqual(context.exception.msg, 'Circular type alias: "b"')
+
+    def test_long_forward_reference_chain(self):
+        schema_def = {}
+        for i in range(5000):
+            schema_def['type{0}'.format(i)] = {
+                'type': 'map',
+                'items': [{'next': {'type': 'type{0}'.format((i + 1) % 5000), 'required': False}},
+                          {'all': {'type': 'list', 'item_types': ['type{0}'.format(4999 - i)]}}]}
+        schema = Schema(schema_def)
+        self.assertEqual(len(schema.descriptors), 4 + 5000 * 2)
+        self.assertEqual(schema.schema.items['type4999'].item_type, 'type4999')
 
     def test_list_has_no_item_types_component(self):
         test_case_name = 'list_has_no_item_types_component'
@@ -365,6 +391,73 @@ class TestSchemaProcessing(unittest.TestCase):
                                    ListDescriptor))
         self.assertEqual(len(schema.descriptors), 8)
 
+    def test_compact_descriptors(self):
+        schema = Schema({'a': {'type': 'map', 'required': False, 'items': [
+                             {'x': {'type': 'int'}}, {'y': {'type': 'list', 'item_types': ['int']}}]},
+                         'b': {'type': 'map', 'required': False, 'items': [{'x': {'type': 'int'}}]}})
+        for descriptor in schema.descriptors.values():
+            self.assertFalse(hasattr(descriptor, '__dict__'))
+        self.assertIs(schema.descriptors['a'].items['x'], schema.descriptors['b'].items['x'])
+        self.assertEqual(schema.descriptors['a.y'].item_types, ('int',))
+        copy = pickle.loads(pickle.dumps(schema))
+        self.assertTrue(copy.validate({'a': {'x': 1, 'y': [{'int': 2}]}}))
+
+    def test_freeze(self):
+        schema = Schema(self.test_data['complex2']['schema'])
+        descriptors = dict(schema.descriptors)
+        self.assertIs(schema.freeze(gc_freeze=False), schema)
+        self.assertEqual(schema.definitions, {})
+        self.assertEqual(schema.descriptors, descriptors)
+        self.assertIsNotNone(schema.compiled)
+        doc = {'book': {'title': 'W', 'year': 1850}, 'city': {'name': 'X', 'library': {'address': 'Y', 'books': [
+            {'book': {'title': 'Z', 'year': 1900}}]}}}
+        self.assertTrue(schema.validate(doc))
+        self.assertTrue(schema.compile().validate(doc))
+
+    def test_lazy_check_is_equivalent(self):
+        for test_case_name, test_case in self.test_data.items():
+            with self.subTest(test_case_name):
+                try:
+                    expected = sorted(Schema(test_case['schema']).descriptors)
+                except SchemaError as error:
+                    expected = (error.path, error.msg)
+                try:
+                    actual = sorted(Schema(test_case['schema'], lazy=True).check().descriptors)
+                except SchemaError as error:
+                    actual = (error.path, error.msg)
+                self.assertEqual(actual, expected)
+
+    def test_lazy_builds_reached_types(self):
+        schema = Schema(self.test_data['complex2']['schema'], lazy=True)
+        self.assertEqual(sorted(schema.descriptors), ['bool', 'float', 'int', 'string'])
+        with self.assertRaises(ValidationError) as context:
+            schema.validate({'book': {'title': 'W', 'year': 1850}})
+        self.assertEqual(context.exception.msg, 'Missing required item: "city"')
+        self.assertIn('book', schema.descriptors)
+        self.assertNotIn('city', schema.descriptors)
+        copy = pickle.loads(pickle.dumps(schema))
+        with self.assertRaises(ValidationError) as context:
+            copy.validate({'book': {'title': 'W', 'year': 1850}, 'city': {'name': 'X'}})
+        self.assertEqual(context.exception.path, 'city')
+        self.assertIn('city.library', copy.descriptors)
+
+    def test_lazy_schema_errors(self):
+        schema = Schema({'a': {'type': 'map', 'required': False, 'items': [{'x': {'type': 'int'}}]},
+                         'b': {'type': 'map', 'required': False, 'items': [
+                             {'y': {'type': 'map', 'items': [{'z': {'type': 'nope'}}]}}]}},
+                        lazy=True)
+        self.assertTrue(schema.validate({'a': {'x': 1}}))
+        for _ in range(2):
+            with self.assertRaises(SchemaError) as context:
+                schema.validate({'b': {}})
+            self.assertEqual(context.exception.msg, 'Unknown type: "nope"')
+            self.assertNotIn('b.y', schema.descriptors)
+        with self.assertRaises(SchemaError):
+            schema.check()
+        with self.assertRaises(SchemaError) as context:
+            Schema({'a': {'type': 'nope'}}, lazy=True)
+        self.assertEqual(context.exception.msg, 'Unknown type: "nope"')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,133 @@
+import datetime
+import unittest
+import os
+import sys
+import tempfile
+import threading
+
+import yaml
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from schema import Schema           # pylint: disable=import-error, wrong-import-position
+from server import LatencyStats, ValidationClient, ValidationService, create_server,\
+    encode_json, schema_name_of   # pylint: disable=import-error, wrong-import-position
+
+
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        data_file_name = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                      'data/validation.yml'))
+        with open(data_file_name) as validation_data:
+            self.test_data = yaml.load(validation_data)
+        self.valid = self.test_data['simple_map']['data']
+        self.invalid = self.test_data['map_item_wrong_type']['data']
+        self.service = ValidationService({'person': Schema(self.test_data['simple_map']['schema'])})
+
+    def start(self, server):
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+
+        def stop():
+            server.shutdown()
+            thread.join()
+            server.server_close()
+        self.addCleanup(stop)
+
+    def assert_client(self, client):
+        self.assertEqual(client.schemas(), ['person'])
+        self.assertIsNone(client.validate('person', self.valid))
+        error = client.validate('person', b'{"person": {"name": "x", "age": "y"}}')
+        self.assertEqual(error.path, 'person.age')
+        self.assertEqual(error.msg, 'Expected type: int')
+        results = client.validate_batch('person', [self.valid, self.invalid, self.valid])
+        self.assertIsNone(results[0])
+        self.assertEqual(results[1].msg, 'Expected type: int')
+        self.assertIsNone(results[2])
+        with self.assertRaises(ValueError):
+            client.validate('unknown', self.valid)
+        with self.assertRaises(ValueError):
+            client.validate('person', b'{"person": ')
+        stats = client.stats()
+        self.assertEqual(stats['validate']['count'], 2)
+        self.assertEqual(stats['batch']['count'], 1)
+
+    def test_tcp(self):
+        server = create_server(self.service, port=0)
+        self.start(server)
+        client = ValidationClient(port=server.server_address[1], timeout=10)
+        self.addCleanup(client.close)
+        self.assert_client(client)
+
+    def test_unix_socket(self):
+        socket_path = os.path.join(tempfile.mkdtemp(), 'jysp.sock')
+        server = create_server(self.service, socket_path=socket_path)
+        self.start(server)
+        client = ValidationClient(socket_path=socket_path, timeout=10)
+        self.addCleanup(client.close)
+        self.assert_client(client)
+
+    def test_routes(self):
+        self.assertEqual(self.service.handle('GET', '/validate/person', b'')[0], 405)
+        self.assertEqual(self.service.handle('POST', '/stats', b'')[0], 405)
+        self.assertEqual(self.service.handle('GET', '/unknown', b'')[0], 404)
+        self.assertEqual(self.service.handle('POST', '/validate/person/other', b'{}')[0], 404)
+        self.assertEqual(self.service.handle('POST', '/validate/person/batch', b'{}')[0], 400)
+        self.assertEqual(self.service.handle('POST', '/validate/person', b'{}'),
+                         (200, {'valid': False, 'path': '', 'msg': 'Missing required item: "person"'}))
+
+    def test_lazy_schema(self):
+        schema = Schema({'a': {'type': 'map', 'required': False, 'items': [{'x': {'type': 'int'}}]},
+                         'b': {'type': 'map', 'required': False, 'items': [{'y': {'type': 'nope'}}]}},
+                        lazy=True)
+        service = ValidationService({'lazy': schema})
+        self.assertEqual(service.handle('POST', '/validate/lazy', b'{"a": {"x": 1}}'),
+                         (200, {'valid': True}))
+        self.assertNotIn('b', schema.descriptors)
+        status, payload = service.handle('POST', '/validate/lazy/batch', b'[{"b": {"y": 1}}]')
+        self.assertEqual(status, 500)
+        self.assertIn('Unknown type: "nope"', payload['error'])
+
+    def test_unexpected_error(self):
+        schema = Schema({'library': {'type': 'list', 'item_types': ['book']},
+                         'book': {'type': 'map', 'required': False,
+                                  'items': [{'title': {'type': 'string'}}]}})
+        service = ValidationService({'library': schema})
+        self.assertEqual(service.handle('POST', '/validate/library', b'{"library": [1]}'),
+                         (200, {'valid': False, 'path': 'library.items[0]',
+                                'msg': 'Expected type: map'}))
+
+        def fail(document):
+            raise TypeError('unhashable type: {0}'.format(type(document).__name__))
+
+        service.validators['library'] = fail
+        status, payload = service.handle('POST', '/validate/library', b'{"library": []}')
+        self.assertEqual(status, 500)
+        self.assertTrue(payload['error'].startswith('Validation failed: TypeError'))
+        status, _ = service.handle('POST', '/validate/library/batch', b'[{"library": []}]')
+        self.assertEqual(status, 500)
+
+    def test_encode_json(self):
+        self.assertEqual(encode_json({'a': [{'b': 1}]}), b'{"a": [{"b": 1}]}')
+        with self.assertRaisesRegex(ValueError, 'non-string key 1 at "a.items\\[0\\]"'):
+            encode_json({'a': [{1: 'x'}]})
+        with self.assertRaisesRegex(ValueError, 'date is not JSON serializable'):
+            encode_json({'a': datetime.date(2020, 1, 1)})
+
+    def test_latency_stats(self):
+        stats = LatencyStats(window=100)
+        for index in range(200):
+            stats.record('validate', index / 1000)
+        summary = stats.summary()['validate']
+        self.assertEqual(summary['count'], 200)
+        self.assertAlmostEqual(summary['p50'], 150)
+        self.assertAlmostEqual(summary['p99'], 199)
+        self.assertAlmostEqual(summary['max'], 199)
+
+    def test_schema_name(self):
+        self.assertEqual(schema_name_of('examples/library/library_schema.yml'), 'library_schema')
+        self.assertEqual(schema_name_of('person.json'), 'person')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import unittest.mock
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from error import ValidationError   # pylint: disable=no-name-in-module, wrong-import-position
+from schema import Schema           # pylint: disable=import-error, wrong-import-position
+from snapshot import read_snapshot, snapshot_key, snapshot_path  # pylint: disable=import-error, wrong-import-position
+from loader import loader_name      # pylint: disable=import-error, wrong-import-position
+import descriptor                   # pylint: disable=import-error, wrong-import-position
+import snapshot                     # pylint: disable=import-error, wrong-import-position
+
+EXAMPLES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../examples'))
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.schema_name = os.path.join(EXAMPLES_DIR, 'library/library_schema.yml')
+        with open(self.schema_name, 'rb') as schema_file:
+            self.key = snapshot_key(schema_file.read(), loader_name('yaml'))
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_snapshot_is_written_and_reused(self):
+        schema = Schema.from_file(self.schema_name, cache_dir=self.cache_dir)
+        self.assertTrue(os.path.exists(snapshot_path(self.key, self.cache_dir)))
+        cached = read_snapshot(self.key, self.cache_dir)
+        self.assertIsInstance(cached, Schema)
+        self.assertEqual(sorted(cached.descriptors), sorted(schema.descriptors))
+        loaded = Schema.from_file(self.schema_name, cache_dir=self.cache_dir)
+        data = {'library': [{'book': {'title': 'Ulysses', 'author': 'James Joyce'}}]}
+        with self.assertRaises(ValidationError) as context:
+            loaded.validate(data)
+        self.assertEqual(context.exception.msg, 'Missing required item: "year"')
+        self.assertEqual(context.exception.path, 'library.items[0]')
+
+    def test_cache_can_be_disabled(self):
+        Schema.from_file(self.schema_name, use_cache=False, cache_dir=self.cache_dir)
+        self.assertFalse(os.path.exists(snapshot_path(self.key, self.cache_dir)))
+
+    def test_corrupt_snapshot_is_a_miss(self):
+        with open(snapshot_path(self.key, self.cache_dir), 'wb') as snapshot_file:
+            snapshot_file.write(b'not a snapshot')
+        schema = Schema.from_file(self.schema_name, cache_dir=self.cache_dir)
+        self.assertIn('book', schema.descriptors)
+        self.assertIsInstance(read_snapshot(self.key, self.cache_dir), Schema)
+
+    def test_key_depends_on_content(self):
+        self.assertNotEqual(snapshot_key(b'a: {type: int}', 'yaml'),
+                            snapshot_key(b'a: {type: bool}', 'yaml'))
+
+    def test_key_depends_on_loader(self):
+        self.assertNotEqual(snapshot_key(b'a: {type: int}', 'yaml'),
+                            snapshot_key(b'a: {type: int}', 'libyaml'))
+        with unittest.mock.patch('schema.snapshot_key', wraps=snapshot_key) as key:
+            Schema.from_file(self.schema_name, cache_dir=self.cache_dir, loader='yaml')
+        key.assert_called_once_with(unittest.mock.ANY, 'yaml')
+
+    def test_key_depends_on_format(self):
+        key = snapshot_key(b'a: {type: int}', 'yaml')
+        with unittest.mock.patch('snapshot.SNAPSHOT_FORMAT', snapshot.SNAPSHOT_FORMAT + 1):
+            self.assertNotEqual(snapshot_key(b'a: {type: int}', 'yaml'), key)
+
+    def test_key_depends_on_descriptor_slots(self):
+        key = snapshot_key(b'a: {type: int}', 'yaml')
+        self.assertIn("MapItem('name', 'item_type', 'required')", snapshot.descriptor_layout())
+        with unittest.mock.patch.object(descriptor.MapItem, '__slots__',
+                                        descriptor.MapItem.__slots__ + ('default',)):
+            self.assertNotEqual(snapshot_key(b'a: {type: int}', 'yaml'), key)
+        self.assertEqual(snapshot_key(b'a: {type: int}', 'yaml'), key)
+
+
+if __name__ == '__main__':
+    unittest.main()
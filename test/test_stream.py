@@ -0,0 +1,59 @@
+import unittest
+import io
+import os
+import sys
+
+import yaml
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from schema import Schema                                   # pylint: disable=import-error, wrong-import-position
+from stream import iter_json_lines, iter_yaml_documents     # pylint: disable=import-error, wrong-import-position
+
+
+class TestStream(unittest.TestCase):
+    def setUp(self):
+        data_file_name = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                      'data/validation.yml'))
+        with open(data_file_name) as validation_data:
+            self.test_data = yaml.load(validation_data)
+        self.schema = Schema(self.test_data['simple_map']['schema'])
+
+    def test_json_lines(self):
+        stream = io.StringIO('{"person": {"name": "Peter", "age": 28}}\n'
+                             '\n'
+                             '{"person": {"name": "Peter", "age": "nine"}}\n'
+                             '{"person": \n')
+        records = list(iter_json_lines(stream))
+        self.assertEqual([record.line for record in records], [1, 3, 4])
+        self.assertEqual(records[0].doc, {'person': {'name': 'Peter', 'age': 28}})
+        self.assertIsNone(records[1].error)
+        self.assertEqual(records[2].raw, '{"person": \n')
+        self.assertTrue(records[2].error.msg.startswith('Invalid JSON'))
+
+    def test_yaml_documents(self):
+        stream = io.StringIO('person:\n'
+                             '    name: Peter\n'
+                             '    age: 28\n'
+                             '---\n'
+                             'person:\n'
+                             '    name: Paul\n')
+        records = list(iter_yaml_documents(stream))
+        self.assertEqual([record.line for record in records], [1, 5])
+        self.assertEqual(records[1].doc, {'person': {'name': 'Paul'}})
+
+    def test_iter_valid(self):
+        valid = self.test_data['simple_map']['data']
+        invalid = self.test_data['map_item_wrong_type']['data']
+        errors = []
+        docs = self.schema.iter_valid(iter([valid, invalid, valid]),
+                                      lambda index, doc, error: errors.append((index, error)))
+        self.assertEqual(list(docs), [valid, valid])
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0][0], 1)
+        self.assertEqual(errors[0][1].path, 'person.age')
+        self.assertEqual(errors[0][1].msg, 'Expected type: int')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,7 @@ import yaml
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
+from descriptor import SamplingPolicy, ValidationContext   # pylint: disable=import-error, wrong-import-position
 from error import ValidationError   # pylint: disable=no-name-in-module, wrong-import-position
 from schema import Schema           # pylint: disable=import-error, wrong-import-position
 
@@ -176,6 +177,221 @@ class TestValidation(unittest.TestCase):
         self.assertEqual(context.exception.msg, 'Too many list items: max=2')
         self.assertEqual(context.exception.path, 'sequence')
 
+    def test_validate_all_first_error(self):
+        for test_case_name in self.test_data:
+            schema = Schema(self.test_data[test_case_name]['schema'])
+            data = self.test_data[test_case_name]['data']
+            errors = schema.validate_all(data)
+            try:
+                schema.validate(data)
+                self.assertEqual(errors, [])
+            except ValidationError as error:
+                self.assertEqual(errors[0].msg, error.msg)
+                self.assertEqual(errors[0].path, error.path)
+
+    def test_validate_all_collects_errors(self):
+        test_case_name = 'simple_map'
+        schema = Schema(self.test_data[test_case_name]['schema'])
+        data = {'person': {'name': 5, 'eye_color': 'blue'}, 'other': None}
+        errors = schema.validate_all(data)
+        self.assertEqual([(error.path, error.msg) for error in errors],
+                         [('person.name', 'Expected type: string'),
+                          ('person', 'Unexpected item: "eye_color"'),
+                          ('person', 'Missing required item: "age"'),
+                          ('', 'Unexpected item: "other"')])
+
+    def test_validate_all_list_errors(self):
+        test_case_name = 'list_too_many'
+        schema = Schema(self.test_data[test_case_name]['schema'])
+        data = {'sequence': [{'int': 1}, {'int': 'two'}, {'int': 3}, {'int': 'four'}]}
+        errors = schema.validate_all(data)
+        self.assertEqual([(error.path, error.msg) for error in errors],
+                         [('sequence.items[1]', 'Expected type: int'),
+                          ('sequence', 'Too many list items: max=2'),
+                          ('sequence.items[3]', 'Expected type: int')])
+
+    def test_validate_all_list_item_is_not_a_map(self):
+        schema = Schema(self.test_data['simple_list']['schema'])
+        data = {'sequence': [5, {'int': 'two'}, None, 'int']}
+        errors = schema.validate_all(data)
+        self.assertEqual([(error.path, error.msg) for error in errors],
+                         [('sequence.items[0]', 'Expected type: map'),
+                          ('sequence.items[1]', 'Expected type: int'),
+                          ('sequence.items[2]', 'Expected type: map'),
+                          ('sequence.items[3]', 'Expected type: map')])
+
+    def test_validate_all_max_errors(self):
+        test_case_name = 'simple_map'
+        schema = Schema(self.test_data[test_case_name]['schema'])
+        data = {'person': {'name': 5, 'eye_color': 'blue'}, 'other': None}
+        errors = schema.validate_all(data, max_errors=2)
+        self.assertEqual(len(errors), 2)
+        self.assertEqual(errors[1].msg, 'Unexpected item: "eye_color"')
+
+    def test_validate_all_lazy_path(self):
+        test_case_name = 'map_item_wrong_type'
+        schema = Schema(self.test_data[test_case_name]['schema'])
+        errors = schema.validate_all(self.test_data[test_case_name]['data'])
+        self.assertNotIsInstance(errors[0].raw_path, str)
+        self.assertEqual(errors[0].path, 'person.age')
+        self.assertEqual(str(errors[0]), 'ValidationError - Path: person.age - Expected type: int')
+
+    def alias_bomb(self, depth, leaf_data=0):
+        lines = ['n0: &n0 {{data: {0}}}'.format(leaf_data)]
+        for level in range(1, depth + 1):
+            lines.append('n{0}: &n{0} {{data: {0}, left: *n{1}, right: *n{1}}}'.format(level,
+                                                                                   level - 1))
+        lines.append('tree: *n{0}'.format(depth))
+        doc = yaml.safe_load('\n'.join(lines))
+        return {'tree': doc['tree']}
+
+    def test_context_shared_subtrees(self):
+        schema = Schema.from_file(os.path.join(os.path.dirname(__file__),
+                                               '../examples/tree/tree_schema.yml'), use_cache=False)
+        context = ValidationContext()
+        self.assertTrue(schema.validate(self.alias_bomb(60), context=context))
+        self.assertEqual(context.nodes, 60 * 3 + 3)
+        with self.assertRaises(ValidationError) as error:
+            schema.validate(self.alias_bomb(60, 'x'), context=ValidationContext())
+        self.assertEqual(error.exception.path, 'tree' + '.left' * 60 + '.data')
+        self.assertEqual(error.exception.msg, 'Expected type: int')
+
+    def test_context_max_nodes(self):
+        schema = Schema.from_file(os.path.join(os.path.dirname(__file__),
+                                               '../examples/tree/tree_schema.yml'), use_cache=False)
+        doc = {'tree': {'data': 1, 'left': {'data': 2, 'left': {'data': 3}}}}
+        self.assertTrue(schema.validate(doc, context=ValidationContext(max_nodes=7)))
+        with self.assertRaises(ValidationError) as error:
+            schema.validate(doc, context=ValidationContext(max_nodes=6))
+        self.assertEqual(error.exception.path, 'tree.left.left')
+        self.assertEqual(error.exception.msg, 'Too many nodes: max=6')
+        with self.assertRaises(ValueError):
+            ValidationContext(max_nodes=0)
+        with self.assertRaises(ValueError):
+            schema.validate(doc, engine='iterative', context=ValidationContext())
+
+    def test_context_per_type(self):
+        schema = Schema({'a': {'type': 'map', 'items': [{'x': {'type': 'int'}}]},
+                         'b': {'type': 'map', 'items': [{'x': {'type': 'string'}}]}})
+        shared = {'x': 1}
+        with self.assertRaises(ValidationError) as error:
+            schema.validate({'a': shared, 'b': shared}, context=ValidationContext())
+        self.assertEqual(error.exception.path, 'b.x')
+
+
+    def test_sampling_policy(self):
+        self.assertEqual(list(SamplingPolicy(first=3).indices(10)), [0, 1, 2])
+        self.assertEqual(list(SamplingPolicy(first=3).indices(2)), [0, 1])
+        self.assertEqual(list(SamplingPolicy(every=4).indices(10)), [0, 4, 8])
+        indices = list(SamplingPolicy(fraction=0.25, seed=3).indices(100))
+        self.assertEqual(len(indices), 25)
+        self.assertEqual(indices, sorted(set(indices)))
+        self.assertEqual(indices, list(SamplingPolicy(fraction=0.25, seed=3).indices(100)))
+        for kwargs in ({}, {'first': 1, 'every': 2}, {'every': 0}, {'fraction': 1.5},
+                       {'first': -1}):
+            with self.assertRaises(ValueError):
+                SamplingPolicy(**kwargs)
+
+    def test_validate_sampled(self):
+        schema = Schema({'sequence': {'type': 'list', 'min': 2, 'max': 10,
+                                      'item_types': ['int']},
+                         'other': {'type': 'list', 'required': False, 'item_types': ['string']}})
+        doc = {'sequence': [{'int': i} for i in range(10)], 'other': [{'string': 'x'}]}
+        doc['sequence'][5] = {'int': 'x'}
+        self.assertEqual(schema.validate_sampled(doc, SamplingPolicy(first=4)),
+                         {'sequence': (4, 10), 'other': (1, 1)})
+        self.assertEqual(schema.validate_sampled(doc, {'sequence': SamplingPolicy(every=2)}),
+                         {'sequence': (5, 10)})
+        with self.assertRaises(ValidationError) as error:
+            schema.validate_sampled(doc, SamplingPolicy(every=5))
+        self.assertEqual(error.exception.path, 'sequence.items[5]')
+        doc['sequence'].append({'int': 10})
+        with self.assertRaises(ValidationError) as error:
+            schema.validate_sampled(doc, SamplingPolicy(first=1))
+        self.assertEqual(error.exception.msg, 'Too many list items: max=10')
+        with self.assertRaises(ValidationError) as error:
+            schema.validate_sampled({'sequence': [{'int': 1}]}, SamplingPolicy(first=0))
+        self.assertEqual(error.exception.msg, 'Too few list items: min=2')
+        with self.assertRaises(ValueError):
+            schema.validate_sampled(doc, {'int': SamplingPolicy(first=1)})
+
+
+    def test_check_structure_is_sound(self):
+        for test_case_name, test_case in self.test_data.items():
+            if not isinstance(test_case, dict) or 'data' not in test_case:
+                continue
+            with self.subTest(test_case_name):
+                schema = Schema(test_case['schema'])
+                try:
+                    schema.validate(test_case['data'])
+                except ValidationError as error:
+                    expected = error.msg
+                else:
+                    expected = None
+                try:
+                    schema.check_structure(test_case['data'])
+                except ValidationError as error:
+                    self.assertEqual(error.msg, expected)
+
+    def test_check_structure(self):
+        schema = Schema({'sequence': {'type': 'list', 'max': 3, 'item_types': ['point']},
+                         'point': {'type': 'map', 'required': False,
+                                   'items': [{'x': {'type': 'int'}}, {'y': {'type': 'int'}}]}})
+        doc = {'sequence': [{'point': {'x': 'a', 'y': 1}}, {'point': {'x': 1}}]}
+        self.assertTrue(schema.check_structure(doc, max_depth=2))
+        with self.assertRaises(ValidationError) as error:
+            schema.check_structure(doc)
+        self.assertEqual((error.exception.path, error.exception.msg),
+                         ('sequence.items[1]', 'Missing required item: "y"'))
+        with self.assertRaises(ValidationError) as error:
+            schema.validate(doc, structure_depth=3)
+        self.assertEqual(error.exception.path, 'sequence.items[1]')
+        with self.assertRaises(ValidationError) as error:
+            schema.validate(doc)
+        self.assertEqual(error.exception.path, 'sequence.items[0].x')
+        doc['sequence'] = [{'point': {'x': 1, 'y': 1}}] * 4
+        self.assertTrue(schema.check_structure(doc, max_depth=1))
+        with self.assertRaises(ValidationError) as error:
+            schema.check_structure(doc, max_depth=2)
+        self.assertEqual(error.exception.msg, 'Too many list items: max=3')
+        with self.assertRaises(ValidationError) as error:
+            schema.check_structure({'sequence': [], 'line': 1}, max_depth=1)
+        self.assertEqual(error.exception.msg, 'Unexpected item: "line"')
+        with self.assertRaises(ValueError):
+            schema.check_structure(doc, max_depth=0)
+
+    def test_check_structure_list_item_is_not_a_map(self):
+        schema = Schema(self.test_data['simple_list']['schema'])
+        for item in (5, None, 'int', ['int'], [{'int': 1}]):
+            doc = {'sequence': [{'int': 1}, item]}
+            with self.subTest(item=item):
+                with self.assertRaises(ValidationError) as expected:
+                    schema.validate(doc)
+                with self.assertRaises(ValidationError) as error:
+                    schema.check_structure(doc)
+                self.assertEqual(error.exception.path, expected.exception.path)
+                self.assertEqual(error.exception.msg, expected.exception.msg)
+                self.assertEqual(error.exception.path, 'sequence.items[1]')
+
+
+    def test_is_valid(self):
+        for test_case_name, test_case in self.test_data.items():
+            if not isinstance(test_case, dict) or 'data' not in test_case:
+                continue
+            with self.subTest(test_case_name):
+                schema = Schema(test_case['schema'])
+                try:
+                    expected = schema.schema.validate(test_case['data'], [])
+                except ValidationError:
+                    expected = False
+                self.assertIs(schema.is_valid(test_case['data']), expected)
+
+    def test_is_valid_list_item_is_not_a_map(self):
+        schema = Schema(self.test_data['simple_list']['schema'])
+        for item in (5, None, 'int', ['int'], [{'int': 1}]):
+            with self.subTest(item=item):
+                self.assertFalse(schema.is_valid({'sequence': [{'int': 1}, item]}))
+
 
 if __name__ == '__main__':
     unittest.main()